@@ -0,0 +1,65 @@
+"""Benchmark: constraint activity, slack and violation
+
+Values are loaded into a program with many variables
+(as opt() does after solving, with no solver involved).
+The activity (A x - B) of all constraints is one sparse product,
+compared with evaluating the function of each constraint.
+
+Run as:
+
+    python benchmarks/bench_activity.py [variables]
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+from numpy import allclose
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_gurobi import program  # noqa: E402
+
+logging.getLogger("gana").setLevel(logging.WARNING)
+
+
+def main():
+    variables = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    p = program(variables)
+
+    X = [float(n % 13) for n, v in enumerate(p.variables) if v.cons_by]
+
+    start = time.perf_counter()
+    p._load_values((X, 0.0))
+    load = time.perf_counter() - start
+
+    # A and B are kept while the constraints do not change
+    start = time.perf_counter()
+    p._load_values((X, 0.0))
+    reload = time.perf_counter() - start
+
+    start = time.perf_counter()
+    p.slack()
+    p.binding()
+    violations = p.max_violation()
+    arrays = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for c in p.constraint_sets:
+        c.function.solution(n_sol=0)
+    functions = time.perf_counter() - start
+
+    assert allclose([c.function.X[0] for c in p.cons()], p.activity())
+
+    print(f"{len(p.variables)} variables, {len(p.cons())} constraints")
+    print(f"          load values (with activity): {load:.3f} s")
+    print(f"               again, with A and B kept: {reload:.3f} s")
+    print(f"slack, binding, max violation by category: {arrays:.3f} s")
+    print(f"   evaluating each constraint function: {functions:.3f} s")
+    print(f"max violation: {violations}")
+
+
+if __name__ == "__main__":
+    main()
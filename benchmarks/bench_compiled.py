@@ -0,0 +1,64 @@
+"""Benchmark: saving a compiled program and loading it
+
+A program is declared, saved (Prg.save()) and loaded (Prg.load()),
+the loaded program is then written as MPS and built as a gurobipy model
+without declaring anything again.
+
+Run as:
+
+    python benchmarks/bench_compiled.py [rows]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_gurobi import program  # noqa: E402
+
+from gana import Prg  # noqa: E402
+
+logging.getLogger("gana").setLevel(logging.WARNING)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    start = time.perf_counter()
+    p = program(rows)
+    declare = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        path = p.save(os.path.join(tmp, "bench"))
+        save = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = Prg.load(path)
+        load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded.gurobi()
+        model = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded.mps(os.path.join(tmp, "loaded"))
+        mps = time.perf_counter() - start
+
+        size = os.path.getsize(path) / 2**20
+
+    print(f"{loaded}")
+    print(f"           declare: {declare:.3f} s")
+    print(f"              save: {save:.3f} s ({size:.1f} MiB)")
+    print(f"              load: {load:.3f} s")
+    print(f"gurobipy (loaded): {model:.3f} s")
+    print(f"     mps (loaded): {mps:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark: evaluating multiparametric solutions
+
+The multiparametric program of tests/mpsol_test.py is solved,
+then evaluated at random theta points one at a time (eval())
+and all at once (eval_batch()).
+
+Run as:
+
+    python benchmarks/bench_eval.py [points]
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+from numpy.random import default_rng
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from gana import I, Prg, T, V, inf  # noqa: E402
+
+logging.getLogger("gana").setLevel(logging.WARNING)
+
+
+def program() -> Prg:
+    """Two plants supplying two markets with uncertain demands"""
+    p = Prg("mplp")
+    p.i = I(size=4)
+    p.j = I(size=2)
+    p.x = V(p.i)
+    p.t = T(p.j, _=[(0, 1000), (0, 1000)])
+    p.c0 = p.x[0] + p.x[1] <= 350
+    p.c1 = p.x[2] + p.x[3] <= 600
+    p.c2 = p.x[0] + p.x[2] >= p.t[0]
+    p.c3 = p.x[1] + p.x[3] >= p.t[1]
+    p.f = inf(178 * p.x[0] + 187 * p.x[1] + 187 * p.x[2] + 151 * p.x[3])
+    return p
+
+
+def main():
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    p = program()
+    p.solve()
+    thetas = default_rng(0).uniform(0, 1000, (points, 2))
+
+    start = time.perf_counter()
+    _, region = p.eval_batch(thetas)
+    batch = time.perf_counter() - start
+    print(f"eval_batch(): {batch:.3f} s for {points} points")
+
+    # eval() fails outside the regions, a sample is timed
+    sample = thetas[region >= 0][:2000]
+    start = time.perf_counter()
+    for theta in sample:
+        p.eval(*theta)
+    one = (time.perf_counter() - start) / len(sample)
+    print(f"      eval(): {one * points:.3f} s for {points} points (from {len(sample)})")
+
+    print(f"speedup: {one * points / batch:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
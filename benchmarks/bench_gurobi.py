@@ -0,0 +1,58 @@
+"""Benchmark: building the gurobipy model
+
+Compares writing and reading back the .mps file (using='mps')
+against feeding the coefficients to gurobipy directly (using='matrix')
+on a program with 10^5 constraints.
+
+Run as:
+
+    python benchmarks/bench_gurobi.py [rows]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from gana import I, P, Prg, V, inf, sigma  # noqa: E402
+
+logging.getLogger("gana").setLevel(logging.WARNING)
+
+
+def program(rows: int) -> Prg:
+    """Two variables and a demand at each index,
+    and a capacity on their difference"""
+    p = Prg("bench")
+    p.i = I(size=rows // 2)
+    p.x = V(p.i)
+    p.y = V(p.i)
+    p.d = P(p.i, _=[float(n % 7) for n in range(rows // 2)])
+    p.demand = p.x(p.i) + p.y(p.i) >= p.d(p.i)
+    p.capacity = p.x(p.i) - p.y(p.i) <= 10
+    p.cost = inf(sigma(p.x, p.i))
+    return p
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    p = program(rows)
+
+    # the .mps file is written in the working directory
+    os.chdir(tempfile.mkdtemp())
+
+    times = {}
+    for using in ["mps", "matrix"]:
+        start = time.perf_counter()
+        m = p.gurobi(using=using)
+        times[using] = time.perf_counter() - start
+        print(f"{using:>7}: {times[using]:.3f} s ({m.NumConstrs} rows, {m.NumVars} columns)")
+
+    print(f"speedup: {times['mps'] / times['matrix']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
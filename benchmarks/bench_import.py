@@ -0,0 +1,60 @@
+"""Benchmark: import gana
+
+Wall time of a fresh interpreter running import gana (best of 5),
+and the cumulative import time of gana and of the heaviest imports (python -X importtime).
+
+Run as:
+
+    python benchmarks/bench_import.py
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC = str(Path(__file__).parents[1] / "src")
+
+
+def run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": SRC},
+        check=True,
+    )
+
+
+def main():
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        run("-c", "import gana")
+        best = min(best, time.perf_counter() - start)
+    bare = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        run("-c", "pass")
+        bare = min(bare, time.perf_counter() - start)
+
+    times = []
+    gana = 0
+    for line in run("-X", "importtime", "-c", "import gana").stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, module = line.split("|")
+            times.append((int(cumulative), module.strip()))
+            if module.strip() == "gana":
+                gana = int(cumulative)
+
+    print(f"python -c 'import gana': {best:.3f} s ({bare:.3f} s for python -c 'pass')")
+    # ~0.3 s, ~1.3 s when the backends were imported
+    print(f"import gana (cumulative, -X importtime): {gana / 1e6:.3f} s")
+    print("heaviest imports (cumulative):")
+    for cumulative, module in sorted(times, reverse=True)[:8]:
+        print(f"  {cumulative / 1e6:.3f} s  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark: memory per element
+
+Measures (tracemalloc) the bytes taken per element
+of index (I), variable (V), function (F) and constraint (C) sets.
+
+Run as:
+
+    python benchmarks/bench_memory.py
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from gana import I, Prg, V  # noqa: E402
+
+N = 100_000
+
+
+def measure(p: Prg, declare) -> float:
+    """Bytes taken by a declaration on p"""
+    tracemalloc.start()
+    declare(p)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def main():
+    p = Prg()
+
+    def indices(p: Prg):
+        p.i = I(size=N)
+
+    def variables(p: Prg):
+        p.x = V(p.i)
+        p.y = V(p.i)
+
+    def constraints(p: Prg):
+        # N functions for the sum, N functions with the rhs
+        # and N constraints
+        p.c = p.x(p.i) + p.y(p.i) <= 1
+
+    print(f"{'element':>12} {'bytes/element':>14}")
+    print(f"{'I':>12} {measure(p, indices) / N:>14.1f}")
+    print(f"{'V':>12} {measure(p, variables) / (2 * N):>14.1f}")
+    print(f"{'F + C':>12} {measure(p, constraints) / N:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
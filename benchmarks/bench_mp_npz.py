@@ -0,0 +1,107 @@
+"""Benchmark: saving and loading explicit multiparametric solutions
+
+A solution with Voronoi cells as critical regions (see bench_regions.py)
+is pickled (the ppopt solution) and saved as .npz (Regions.save()),
+then loaded and used to evaluate a point.
+
+Run as:
+
+    python benchmarks/bench_mp_npz.py [regions] [thetas]
+"""
+
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from numpy import hstack, vstack
+from numpy.random import default_rng
+from ppopt.critical_region import CriticalRegion
+from ppopt.solution import Solution as MPSolution
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_regions import voronoi  # noqa: E402
+from gana.block.regions import Regions  # noqa: E402
+
+logging.getLogger("gana").setLevel(logging.WARNING)
+
+
+def best(run, repeat: int = 5) -> float:
+    """Fastest of a few runs"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    thetas = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    rng = default_rng(1)
+
+    E, f, A_t, b_t = voronoi(n, thetas)
+    A = rng.uniform(-1, 1, (n, 50, thetas))
+    b = rng.uniform(-1, 1, (n, 50))
+    lo, hi = Regions.boxes(E, f, A_t, b_t, tol=1e-5)
+    regions = Regions(
+        E=vstack(E),
+        f=hstack(f),
+        starts=hstack([[0], [len(_f) for _f in f[:-1]]]).cumsum(),
+        A=A,
+        b=b,
+        lo=lo,
+        hi=hi,
+    )
+    solution = MPSolution(
+        None,
+        [
+            CriticalRegion(A[r], b[r], None, None, E[r], f[r].reshape(-1, 1), [])
+            for r in range(n)
+        ],
+    )
+    theta = rng.uniform(0, 1, thetas)
+
+    folder = tempfile.mkdtemp()
+    print(f"{n} regions, {thetas} thetas, {len(regions.f)} facets")
+    print(f"{'':>22} {'size':>9} {'load + locate':>14}")
+
+    path = os.path.join(folder, "solution.pkl")
+    with open(path, "wb") as file:
+        pickle.dump(solution, file)
+
+    def unpickle():
+        with open(path, "rb") as file:
+            pickle.load(file).evaluate(theta.reshape(-1, 1))
+
+    print(
+        f"{'pickle (ppopt)':>22} {os.path.getsize(path) / 2**20:>7.2f}MB"
+        f" {best(unpickle) * 1000:>11.1f}ms"
+    )
+
+    for name, kwargs, mmap in [
+        ("npz", {}, False),
+        ("npz, memory-mapped", {}, True),
+        ("npz float32, mm", {"float32": True}, True),
+        ("npz compressed", {"compress": True}, True),
+    ]:
+        path = regions.save(os.path.join(folder, name.replace(" ", "")), **kwargs)
+
+        def load():
+            loaded = Regions.load(path, mmap=mmap)  # pylint: disable=cell-var-from-loop
+            loaded.evaluate(theta, loaded.locate(theta))
+
+        print(
+            f"{name:>22} {os.path.getsize(path) / 2**20:>7.2f}MB"
+            f" {best(load) * 1000:>11.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
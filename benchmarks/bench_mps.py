@@ -0,0 +1,45 @@
+"""Benchmark: writing the MPS file
+
+Writes the program of bench_gurobi.py (10^5 constraints)
+as fixed MPS, free MPS and gzipped fixed MPS.
+
+Run as:
+
+    python benchmarks/bench_mps.py [rows]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_gurobi import program  # noqa: E402
+
+logging.getLogger("gana").setLevel(logging.WARNING)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    p = program(rows)
+
+    os.chdir(tempfile.mkdtemp())
+
+    for name, kwargs in [
+        ("fixed.mps", {}),
+        ("free.mps", {"free": True}),
+        ("fixed.mps.gz", {}),
+    ]:
+        start = time.perf_counter()
+        path = p.mps(name, **kwargs)
+        t = time.perf_counter() - start
+        size = os.path.getsize(path) / 2**20
+        print(f"{name:>13}: {t:.3f} s ({size:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
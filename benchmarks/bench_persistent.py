@@ -0,0 +1,54 @@
+"""Benchmark: rolling what-if solves
+
+Replaces a constraint set with a new capacity and solves again,
+rebuilding the gurobipy model each time (opt())
+against updating a persistent model (opt(persistent=True)).
+
+Run as:
+
+    python benchmarks/bench_persistent.py [rows] [solves]
+
+rows defaults to 1800 (within the size limit of the restricted gurobi license).
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+import gurobipy as gp
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_gurobi import program  # noqa: E402
+
+logging.getLogger("gana").setLevel(logging.WARNING)
+
+
+def what_if(rows: int, solves: int, persistent: bool) -> float:
+    """Time taken by opt(), declaring the constraints is left out"""
+    p = program(rows)
+    t = 0.0
+    for n in range(solves):
+        p.capacity = p.x(p.i) - p.y(p.i) <= 10 + n
+        start = time.perf_counter()
+        p.opt(persistent=persistent)
+        t += time.perf_counter() - start
+    return t
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1800
+    solves = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    gp.setParam("OutputFlag", 0)
+
+    t_rebuild = what_if(rows, solves, persistent=False)
+    t_persistent = what_if(rows, solves, persistent=True)
+    print(f"   rebuild: {t_rebuild:.3f} s ({solves} solves)")
+    print(f"persistent: {t_persistent:.3f} s ({solves} solves)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark: locating theta points in critical regions
+
+The theta space (a unit box) is split into Voronoi cells of random seeds,
+each cell is a critical region.
+Points are located by scanning the regions (ppopt, Solution.get_region)
+and through the index (Regions.locate, Regions.locate_batch).
+
+Run as:
+
+    python benchmarks/bench_regions.py [thetas] [points]
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+from numpy import eye, hstack, vstack, zeros
+from numpy.random import default_rng
+from ppopt.critical_region import CriticalRegion
+from ppopt.solution import Solution as MPSolution
+from scipy.spatial import Delaunay
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from gana.block.regions import Regions  # noqa: E402
+
+logging.getLogger("gana").setLevel(logging.WARNING)
+
+
+def voronoi(regions: int, thetas: int, seed: int = 0):
+    """Facets (E, f) of the Voronoi cells of random seeds in the unit box"""
+    rng = default_rng(seed)
+    seeds = rng.uniform(0, 1, (regions, thetas))
+    indptr, indices = Delaunay(seeds).vertex_neighbor_vertices
+    # the unit box
+    A_t = vstack([eye(thetas), -eye(thetas)])
+    b_t = hstack([zeros(thetas) + 1, zeros(thetas)])
+    E, f = [], []
+    for r in range(regions):
+        nb = seeds[indices[indptr[r] : indptr[r + 1]]]
+        E.append(vstack([nb - seeds[r], A_t]))
+        f.append(hstack([((nb**2).sum(1) - (seeds[r] ** 2).sum()) / 2, b_t]))
+    return E, f, A_t, b_t
+
+
+def main():
+    thetas = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    points = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    rng = default_rng(1)
+
+    print(f"{'regions':>8} {'build':>9} {'scan':>10} {'index':>10} {'batch':>10}")
+    for n in [10, 100, 1_000, 5_000]:
+        E, f, A_t, b_t = voronoi(n, thetas)
+        A = rng.uniform(-1, 1, (n, 3, thetas))
+        b = rng.uniform(-1, 1, (n, 3))
+
+        start = time.perf_counter()
+        lo, hi = Regions.boxes(E, f, A_t, b_t, tol=1e-5)
+        index = Regions(
+            E=vstack(E),
+            f=hstack(f),
+            starts=hstack([[0], [len(_f) for _f in f[:-1]]]).cumsum(),
+            A=A,
+            b=b,
+            lo=lo,
+            hi=hi,
+        )
+        build = time.perf_counter() - start
+
+        solution = MPSolution(
+            None,
+            [
+                CriticalRegion(A[r], b[r], None, None, E[r], f[r].reshape(-1, 1), [])
+                for r in range(n)
+            ],
+        )
+
+        sample = rng.uniform(0, 1, (1_000, thetas))
+        start = time.perf_counter()
+        scanned = [solution.get_region(t.reshape(-1, 1)) for t in sample]
+        scan = (time.perf_counter() - start) / len(sample)
+
+        start = time.perf_counter()
+        located = [index.locate(t) for t in sample]
+        single = (time.perf_counter() - start) / len(sample)
+        assert all(solution.critical_regions[r] is cr for r, cr in zip(located, scanned))
+
+        batch_points = rng.uniform(0, 1, (points, thetas))
+        start = time.perf_counter()
+        index.locate_batch(batch_points)
+        batch = (time.perf_counter() - start) / points
+
+        print(
+            f"{n:>8} {build:>8.2f}s {scan * 1e6:>8.1f}us {single * 1e6:>8.1f}us {batch * 1e6:>8.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
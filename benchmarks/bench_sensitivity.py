@@ -0,0 +1,62 @@
+"""Benchmark: duals, reduced costs and sensitivity ranges
+
+An LP is solved (opt() reads Pi, Slack, SARHSLow, SARHSUp, RC, SAObjLow and SAObjUp
+off the model, one call for each attribute),
+then the same attributes are read element by element (x.RC for each column, etc.).
+
+Run as:
+
+    python benchmarks/bench_sensitivity.py [rows]
+
+The default is within the size limit of the restricted gurobi license.
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+import gurobipy as gp
+from numpy import allclose
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_gurobi import program  # noqa: E402
+
+logging.getLogger("gana").setLevel(logging.WARNING)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    gp.setParam("OutputFlag", 0)
+
+    p = program(rows)
+    p.opt()
+    m = p.formulation
+
+    start = time.perf_counter()
+    p._load_sensitivity(m, list(zip(p.colvars(), m.getVars())))
+    bulk = time.perf_counter() - start
+
+    start = time.perf_counter()
+    constrs, variables = m.getConstrs(), m.getVars()
+    duals = {
+        attr: [getattr(r, attr) for r in constrs]
+        for attr in ["Pi", "Slack", "SARHSLow", "SARHSUp"]
+    }
+    for attr in ["RC", "SAObjLow", "SAObjUp"]:
+        [getattr(x, attr) for x in variables]
+    elements = time.perf_counter() - start
+
+    assert allclose(p.sensitivity[0]["Pi"][: len(constrs)], duals["Pi"])
+    assert allclose(p.demand.dual(), duals["Pi"][: len(p.demand._)])
+
+    print(f"{len(variables)} columns, {len(constrs)} rows")
+    print(f"     one call per attribute: {bulk:.4f} s")
+    print(f"element by element (x.RC): {elements:.4f} s")
+
+
+if __name__ == "__main__":
+    main()
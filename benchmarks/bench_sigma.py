@@ -0,0 +1,49 @@
+"""Benchmark: summing a variable set over hours
+
+Declares a variable set over units and the hours of a year (8760),
+and sums it over the hours, i.e. one function per unit.
+The summations (rows) are made when asked for, their time is reported apart.
+
+Run as:
+
+    python benchmarks/bench_sigma.py [units]
+
+units defaults to 500 (4.38 x 10^6 variables).
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from gana import I, Prg, V, sigma  # noqa: E402
+
+
+def main():
+    units = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    p = Prg()
+    p.u = I(size=units)
+    p.h = I(size=8760)
+
+    start = time.perf_counter()
+    p.x = V(p.u, p.h)
+    t_declare = time.perf_counter() - start
+
+    start = time.perf_counter()
+    f = sigma(p.x, p.h)
+    t_sigma = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = list(f)
+    t_rows = time.perf_counter() - start
+
+    print(f"variables: {len(p.x)}, functions: {len(rows)}")
+    print(f"declare: {t_declare:.3f} s")
+    print(f"sigma:   {t_sigma:.3f} s")
+    print(f"rows:    {t_rows:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Benchmark: making the Solution object
+
+Values are loaded into a program with many variables
+(as opt() does after solving, with no solver involved),
+then the Solution object is made (Prg._birth_solution())
+and a variable set is looked up in it.
+
+Run as:
+
+    python benchmarks/bench_solution.py [variables]
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_gurobi import program  # noqa: E402
+
+logging.getLogger("gana").setLevel(logging.WARNING)
+
+
+def main():
+    variables = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    p = program(variables)
+
+    X = [float(n % 13) for n, v in enumerate(p.variables) if v.cons_by]
+
+    start = time.perf_counter()
+    p._load_values((X, 0.0))
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    p._birth_solution()
+    birth = time.perf_counter() - start
+
+    start = time.perf_counter()
+    values = p.solution(p.x)["values"]
+    lookup = time.perf_counter() - start
+    assert list(values) == X[: len(values)]
+
+    print(f"{len(p.variables)} variables")
+    print(f"   load values: {load:.3f} s")
+    print(f"make Solution: {birth:.3f} s")
+    print(f"  solution(x): {lookup:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
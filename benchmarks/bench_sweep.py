@@ -0,0 +1,65 @@
+"""Benchmark: parameter sweeps
+
+A program (see bench_gurobi.py) is solved for a number of demand scenarios,
+one at a time (declare the demand again, opt())
+and through .sweep() with 1 and more worker processes.
+
+Run as:
+
+    python benchmarks/bench_sweep.py [scenarios] [workers] [rows]
+
+The default size is within the limit of the restricted gurobi license.
+"""
+
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+import gurobipy as gp
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_gurobi import program  # noqa: E402
+
+logging.getLogger("gana").setLevel(logging.WARNING)
+
+
+def declare(p, scale: float):
+    """Demand scaled"""
+    p.demand = p.x(p.i) + p.y(p.i) >= scale * p.d(p.i)
+
+
+def main():
+    scenarios = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    rows = int(sys.argv[3]) if len(sys.argv) > 3 else 1_000
+
+    gp.setParam("OutputFlag", 0)
+
+    p = program(rows)
+    scales = [1 + n / scenarios for n in range(scenarios)]
+
+    start = time.perf_counter()
+    objectives = []
+    for scale in scales:
+        declare(p, scale)
+        p.opt()
+        objectives.append(p.obj())
+    times = {"opt()": time.perf_counter() - start}
+
+    for w in sorted({1, workers}):
+        start = time.perf_counter()
+        sweep = p.sweep(scales, declare, workers=w)
+        times[f"sweep, {w} workers"] = time.perf_counter() - start
+        assert not sweep.errors
+        assert all(abs(a - b) < 1e-6 for a, b in zip(sweep.objectives, objectives))
+
+    for name, t in times.items():
+        print(f"{name:>18}: {t:.3f} s ({t / scenarios * 1000:.1f} ms per scenario)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark: declaration cost against program size
+
+Declares unordered index sets with up to 100k members
+and many small sets on a program.
+With constant time name lookups, the time per member (or per set)
+should stay flat as the program grows, i.e. scaling is linear.
+
+Run as:
+
+    python benchmarks/bench_symbols.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from gana import I, Prg, V  # noqa: E402
+
+
+def declare_members(n: int) -> float:
+    """Declare an index set with n members, returns wall time"""
+    p = Prg()
+    members = [f"m{i}" for i in range(n)]
+    start = time.perf_counter()
+    p.i = I(*members)
+    return time.perf_counter() - start
+
+
+def declare_sets(n: int) -> float:
+    """Declare n index sets with a variable set each, returns wall time"""
+    p = Prg()
+    start = time.perf_counter()
+    for k in range(n):
+        setattr(p, f"i{k}", I(size=2))
+        setattr(p, f"v{k}", V(getattr(p, f"i{k}")))
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'members':>10} {'time [s]':>10} {'per member [us]':>16}")
+    for n in [12_500, 25_000, 50_000, 100_000]:
+        t = declare_members(n)
+        print(f"{n:>10} {t:>10.3f} {t / n * 1e6:>16.2f}")
+
+    print()
+    print(f"{'sets':>10} {'time [s]':>10} {'per set [us]':>16}")
+    for n in [1_000, 2_000, 4_000, 8_000]:
+        t = declare_sets(n)
+        print(f"{n:>10} {t:>10.3f} {t / n * 1e6:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Benchmark: memory and time to birth variables
+
+Declares variable sets of up to 10^6 variables,
+reports the time taken and the memory (tracemalloc) per variable.
+
+Run as:
+
+    python benchmarks/bench_variables.py
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from gana import I, Prg, V  # noqa: E402
+
+
+def declare(n: int) -> tuple[float, float]:
+    """Declare a variable set with n variables,
+    returns wall time and bytes per variable"""
+    p = Prg()
+    p.i = I(size=n // 100)
+    p.j = I(size=100)
+    tracemalloc.start()
+    start = time.perf_counter()
+    p.x = V(p.i, p.j)
+    t = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return t, current / n
+
+
+def main():
+    print(f"{'variables':>10} {'time [s]':>10} {'bytes/variable':>15}")
+    for n in [10_000, 100_000, 1_000_000]:
+        t, b = declare(n)
+        print(f"{n:>10} {t:>10.3f} {b:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
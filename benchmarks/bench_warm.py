@@ -0,0 +1,64 @@
+"""Benchmark: warm starting MIP re-solves
+
+An integer covering program (random data) is solved,
+then one requirement is changed slightly and it is solved again,
+cold (opt()) and warm started from the first solution (opt(warm_start='last')).
+
+Run as:
+
+    python benchmarks/bench_warm.py [items] [requirements]
+
+The defaults are within the size limit of the restricted gurobi license.
+"""
+
+import logging
+import random
+import sys
+from pathlib import Path
+
+import gurobipy as gp
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from gana import I, P, Prg, V, inf  # noqa: E402
+
+logging.getLogger("gana").setLevel(logging.WARNING)
+
+
+def program(items: int, requirements: int) -> Prg:
+    """min cost.x, s.t. a_k.x >= b_k, x integer"""
+    rng = random.Random(0)
+    p = Prg("cover")
+    p.i = I(size=items)
+    p.x = V(p.i, itg=True)
+    p.cost = P(p.i, _=[rng.randint(10, 40) for _ in range(items)])
+    for k in range(requirements):
+        setattr(p, f"a{k}", P(p.i, _=[rng.randint(0, 9) for _ in range(items)]))
+        a = getattr(p, f"a{k}")
+        setattr(p, f"r{k}", sum(a(i) * p.x(i) for i in p.i) >= rng.randint(50, 150))
+    p.o = inf(sum(p.cost(i) * p.x(i) for i in p.i))
+    return p
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    requirements = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+
+    gp.setParam("OutputFlag", 0)
+
+    p = program(items, requirements)
+    p.opt()
+
+    # a slightly larger requirement
+    p.r0 = sum(p.a0(i) * p.x(i) for i in p.i) >= p.r0._[0].B + 5
+
+    for name, kwargs in [("cold", {}), ("warm", {"warm_start": "last"})]:
+        # solve from the first solution each time
+        p.sol_types["MIP"] = p.sol_types["MIP"][:1]
+        p.opt(**kwargs)
+        m = p.formulation
+        print(f"{name}: {m.Runtime:.3f} s, {m.Work:.3f} work units, objective {m.ObjVal}")
+
+
+if __name__ == "__main__":
+    main()
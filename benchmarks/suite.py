@@ -0,0 +1,325 @@
+"""Benchmark suite: building and exporting programs at scale
+
+Synthetic programs are declared through the public API (see build()):
+multiscale index sets (periods within years), sigma, balances over
+stepped periods (t - 1), binary and integer variable sets and a theta.
+
+Each scale runs in a process of its own, and each phase is timed on its own:
+
+- declare: declaring the sets on the program (Prg.__setattr__)
+- functions: making the constraint and objective expressions (F, C, O)
+- mps: Prg.mps()
+- ppopt: Prg.ppopt(), only up to --ppopt-max variables,
+  most of it is the constraint processing of ppopt (quadratic in the rows)
+- gurobi: Prg.gurobi() (the model is built, not solved)
+- solution: loading values as opt() does and Prg._birth_solution()
+
+The peak memory (max RSS) of the process is read after each phase.
+Results are written as JSON along with a plot of the scaling curves (scaling.png),
+and compared with earlier results (--compare) to show regressions.
+
+Run as:
+
+    python benchmarks/suite.py [--scales 3e2 1e3 1e4 1e5 1e6] [--out suite] [--compare suite/results.json]
+
+10^5 variables peak at ~0.8 GiB, 10^6 need ~8 GiB.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from gana import I, P, Prg, T, V, inf, sigma  # noqa: E402
+
+logging.getLogger("gana").setLevel(logging.WARNING)
+
+PHASES = ["declare", "functions", "mps", "ppopt", "gurobi", "solution"]
+
+
+def periods_for(variables: int, years: int = 2) -> int:
+    """Number of periods for a program with about this many variables, see build(),
+    the periods are spread evenly over the years"""
+    return max(years, (variables - 28) // (8 * years) * years)
+
+
+def build(periods: int, years: int = 2) -> tuple[Prg, dict[str, float]]:
+    """
+    A planning program: capacity is decided by year,
+    production, inventory and sales by period (8 * periods + 28 variables)
+
+    :param periods: number of periods, spread over the years
+    :type periods: int
+    :param years: number of years. Defaults to 2.
+    :type years: int, optional
+
+    :returns: the program and the time taken declaring and making functions
+    :rtype: tuple[Prg, dict[str, float]]
+    """
+    times = {"declare": 0.0, "functions": 0.0}
+    p = Prg("suite")
+
+    def let(name: str, make, functions: bool = False):
+        # make the set, then set it on the program
+        start = time.perf_counter()
+        _set = make()
+        made = time.perf_counter()
+        setattr(p, name, _set)
+        times["functions" if functions else "declare"] += made - start
+        times["declare"] += time.perf_counter() - made
+
+    # index sets at two scales
+    let("y", lambda: I(size=years))
+    let("t", lambda: I(size=periods))
+    let("pwr", lambda: I("pv", "gen"))
+    let("hth", lambda: I("boiler", "hp"))
+    let("k", lambda: p.pwr | p.hth)
+    let("r", lambda: I("power", "heat"))
+    let("h", lambda: I(size=1))
+
+    let("d", lambda: P(p.r, p.t, _=[float(n % 24) for n in range(2 * periods)]))
+    let("th", lambda: T(p.h, _=[(10, 100)]))
+
+    # capacity by year, mixed integer
+    let("cap", lambda: V(p.k, p.y))
+    let("build", lambda: V(p.k, p.y, bnr=True))
+    let("units", lambda: V(p.k, p.y, itg=True))
+    # operation by period
+    let("prod", lambda: V(p.k, p.t))
+    let("inv", lambda: V(p.r, p.t))
+    let("sell", lambda: V(p.r, p.t))
+    let("opex", lambda: V(p.k))
+
+    # periods are mapped onto the years
+    let("c_cap", lambda: p.prod(p.k, p.t) <= p.cap(p.k, p.y), True)
+    let("c_build", lambda: p.cap(p.k, p.y) <= 1000 * p.build(p.k, p.y), True)
+    let("c_units", lambda: p.cap(p.k, p.y) <= 50 * p.units(p.k, p.y), True)
+    # balances with inventory carried over from the previous period
+    let(
+        "c_power",
+        lambda: p.prod(p.pv, p.t)
+        + p.prod(p.gen, p.t)
+        + p.inv(p.power, p.t - 1)
+        - p.inv(p.power, p.t)
+        - p.sell(p.power, p.t)
+        == 0,
+        True,
+    )
+    let(
+        "c_heat",
+        lambda: p.prod(p.boiler, p.t)
+        + p.prod(p.hp, p.t)
+        + p.inv(p.heat, p.t - 1)
+        - p.inv(p.heat, p.t)
+        - p.sell(p.heat, p.t)
+        == 0,
+        True,
+    )
+    let("c_demand", lambda: p.sell(p.r, p.t) >= p.d(p.r, p.t), True)
+    let("c_opex", lambda: p.opex(p.k) == sigma(p.prod(p.k, p.t), p.t), True)
+    let("c_theta", lambda: p.cap[0] + p.cap[1] >= p.th[0], True)
+    let("o", lambda: inf(sigma(p.opex) + sigma(p.cap)), True)
+
+    return p, times
+
+
+def peak() -> float:
+    """Peak memory (max RSS) of the process so far, MiB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(variables: int, ppopt_max: int = 300) -> dict:
+    """
+    Times each phase for a program of about this many variables
+
+    :param variables: number of variables
+    :type variables: int
+    :param ppopt_max: largest program to make the ppopt formulation for. Defaults to 300.
+    :type ppopt_max: int, optional
+
+    :returns: sizes, time (s) and peak memory (MiB) after each phase, None if skipped
+    :rtype: dict
+    """
+    logging.getLogger("gana").setLevel(logging.WARNING)
+
+    times: dict[str, float | None] = {}
+    memory: dict[str, float | None] = {}
+
+    p, built = build(periods_for(variables))
+    times.update(built)
+    memory["declare"] = memory["functions"] = peak()
+
+    def timed(phase: str, func):
+        start = time.perf_counter()
+        func()
+        times[phase] = time.perf_counter() - start
+        memory[phase] = peak()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        timed("mps", lambda: p.mps(os.path.join(tmp, "suite")))
+
+    if p.n_variables <= ppopt_max:
+        timed("ppopt", p.ppopt)
+    else:
+        times["ppopt"] = memory["ppopt"] = None
+
+    timed("gurobi", p.gurobi)
+
+    def solution():
+        X = [float(n % 13) for n, v in enumerate(p.variables) if v.cons_by]
+        p._load_values((X, 0.0))
+        p._birth_solution()
+
+    timed("solution", solution)
+
+    return {
+        "variables": p.n_variables,
+        "constraints": p.n_constraints,
+        "time": times,
+        "peak_mib": memory,
+    }
+
+
+def plot(results: list[dict], path: str):
+    """Time and peak memory of each phase against the number of variables (log-log)"""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from matplotlib import pyplot as plt
+
+    fig, (ax_time, ax_memory) = plt.subplots(1, 2, figsize=(12, 5))
+    for phase in PHASES:
+        points = [
+            (r["variables"], r["time"][phase])
+            for r in results
+            if r["time"].get(phase) is not None
+        ]
+        if points:
+            ax_time.plot(*zip(*points), marker="o", label=phase)
+    ax_memory.plot(
+        [r["variables"] for r in results],
+        [max(m for m in r["peak_mib"].values() if m is not None) for r in results],
+        marker="o",
+    )
+
+    for ax, ylabel in [(ax_time, "time (s)"), (ax_memory, "peak memory (MiB)")]:
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel("variables")
+        ax.set_ylabel(ylabel)
+        ax.grid(alpha=0.3, which="both")
+    ax_time.legend()
+
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def compare(
+    results: list[dict], baseline: list[dict], tolerance: float, floor: float = 0.05
+) -> bool:
+    """
+    Prints the time of each phase against a baseline
+
+    :param results: results of this run
+    :type results: list[dict]
+    :param baseline: earlier results
+    :type baseline: list[dict]
+    :param tolerance: slowdown allowed, 0.25 is 25 %
+    :type tolerance: float
+    :param floor: phases quicker than this (s) are too noisy to compare. Defaults to 0.05.
+    :type floor: float, optional
+
+    :returns: whether any phase is slower than allowed
+    :rtype: bool
+    """
+    earlier = {r["variables"]: r for r in baseline}
+    regressed = False
+    print(f"\n{'variables':>10} {'phase':>10} {'baseline':>10} {'now':>10} {'ratio':>7}")
+    for r in results:
+        if r["variables"] not in earlier:
+            continue
+        for phase in PHASES:
+            before = earlier[r["variables"]]["time"].get(phase)
+            now = r["time"].get(phase)
+            if not before or now is None or max(before, now) < floor:
+                continue
+            ratio = now / before
+            flag = ""
+            if ratio > 1 + tolerance:
+                flag = " slower"
+                regressed = True
+            print(
+                f"{r['variables']:>10} {phase:>10} {before:>10.3f} {now:>10.3f} {ratio:>7.2f}{flag}"
+            )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        type=float,
+        default=[3e2, 1e3, 1e4, 1e5, 1e6],
+        help="numbers of variables",
+    )
+    parser.add_argument("--out", default="suite", help="directory for the results")
+    parser.add_argument("--compare", help="results (JSON) of an earlier run")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="slowdown allowed by --compare"
+    )
+    parser.add_argument(
+        "--ppopt-max",
+        type=int,
+        default=300,
+        help="largest program (variables) to run ppopt() on",
+    )
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+
+    results = []
+    for scale in args.scales:
+        # a fresh process for each scale, the peak memory is its own
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=1,
+        ) as pool:
+            result = pool.submit(run, int(scale), args.ppopt_max).result()
+        results.append(result)
+
+        cells = "  ".join(
+            f"{phase} {t:.3f}" if t is not None else f"{phase} -"
+            for phase, t in result["time"].items()
+        )
+        print(
+            f"{result['variables']:>9} variables  {cells}"
+            f"  peak {max(m for m in result['peak_mib'].values() if m is not None):.0f} MiB"
+        )
+
+    path = os.path.join(args.out, "results.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+    plot(results, os.path.join(args.out, "scaling.png"))
+    print(f"results in {path}, curves in {os.path.join(args.out, 'scaling.png')}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""Compiled Program"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from numpy import array as nparray
+from numpy import asarray as npasarray
+from numpy import cumsum as npcumsum
+from numpy import frombuffer as npfrombuffer
+from numpy import full as npfull
+from numpy import nan as npnan
+from numpy import ndarray
+from numpy import savez as npsavez
+from numpy import savez_compressed as npsavez_compressed
+from scipy.sparse import csr_matrix
+
+from ..utils.npz import load as npzload
+
+if TYPE_CHECKING:
+    from gurobipy import Model as GPModel
+
+    from .program import Prg
+
+logger = logging.getLogger("gana")
+
+
+def pack(names: list[str]) -> ndarray:
+    """
+    Names as one array of bytes, separated by newlines
+
+    :param names: names
+    :type names: list[str]
+
+    :returns: utf-8 bytes
+    :rtype: ndarray
+    """
+    return npfrombuffer("\n".join(names).encode(), dtype="uint8")
+
+
+def unpack(packed: ndarray, n: int) -> list[str]:
+    """
+    Names packed with pack()
+
+    :param packed: utf-8 bytes
+    :type packed: ndarray
+    :param n: number of names
+    :type n: int
+
+    :returns: names
+    :rtype: list[str]
+    """
+    if not n:
+        return []
+    return npasarray(packed).tobytes().decode().split("\n")
+
+
+class Compiled:
+    """
+    A program as arrays: what is needed to write (MPS) and solve it,
+    made by Prg.save() and loaded by Prg.load()
+
+    No sets (I, V, P, T, F, C, O) are made,
+    loading takes about as long as reading the file.
+    Sets are kept by name (index_members, variable_sizes)
+    and solutions by number (col_values, objective_values).
+
+    :param name: name of the program
+    :type name: str
+    :param form: matrix form, see Prg.matrix_form()
+    :type form: dict[str, ndarray | csr_matrix | list[str]]
+    :param F: theta coefficients of the rows (n_rows x n_thetas)
+    :type F: csr_matrix
+    :param thetas: names of the thetas
+    :type thetas: list[str]
+    :param theta_bounds: lower and upper bound of each theta (n_thetas x 2)
+    :type theta_bounds: ndarray
+    :param index_members: members of each index set
+    :type index_members: dict[str, list[str]]
+    :param variable_sizes: size of each variable set
+    :type variable_sizes: dict[str, int]
+    :param col_sets: variable set (number) of each column, -1 if not known
+    :type col_sets: ndarray
+    :param col_pos: position of each column in its variable set
+    :type col_pos: ndarray
+    """
+
+    def __init__(
+        self,
+        name: str,
+        form: dict[str, ndarray | csr_matrix | list[str]],
+        F: csr_matrix,
+        thetas: list[str],
+        theta_bounds: ndarray,
+        index_members: dict[str, list[str]],
+        variable_sizes: dict[str, int],
+        col_sets: ndarray,
+        col_pos: ndarray,
+    ):
+        self.name = name
+        self.form = form
+        self.F = F
+        self.thetas = thetas
+        self.theta_bounds = theta_bounds
+        self.index_members = index_members
+        self.variable_sizes = variable_sizes
+        self.col_sets = col_sets
+        self.col_pos = col_pos
+
+        # values of the columns and objective value by solution number
+        self.col_values: dict[int, ndarray] = {}
+        self.objective_values: dict[int, float] = {}
+        self.n_solutions: int = 0
+
+    @classmethod
+    def from_program(cls, program: Prg) -> Compiled:
+        """
+        Compiles a declared program
+
+        :param program: program
+        :type program: Prg
+
+        :returns: the program as arrays
+        :rtype: Compiled
+        """
+        form = program.matrix_form()
+        n_rows = len(form["rows"])
+
+        if program.n_thetas:
+            F = program.sparse("F")[:n_rows]
+        else:
+            F = csr_matrix((n_rows, 0))
+
+        # where the columns are in the variable sets
+        sets = {id(v): k for k, v in enumerate(program.variable_sets)}
+        variables = program.colvars()
+
+        return cls(
+            name=program.name,
+            form=form,
+            F=F,
+            thetas=[str(t) for t in program.thetas],
+            theta_bounds=nparray(
+                [[t.lb, t.ub] for t in program.thetas], dtype=float
+            ).reshape(-1, 2),
+            index_members={
+                i.name: [str(e) for e in i._] for i in program.index_sets
+            },
+            variable_sizes={v.name: len(v._) for v in program.variable_sets},
+            col_sets=nparray(
+                [sets.get(id(v.parent), -1) for v in variables], dtype=int
+            ),
+            col_pos=nparray(
+                [-1 if v.pos is None else v.pos for v in variables], dtype=int
+            ),
+        )
+
+    def save(self, path: str | Path, compress: bool = False) -> str:
+        """
+        Saves the program as an .npz archive
+
+        A and F are kept as their csr arrays (data, indices, indptr),
+        names are packed as bytes (see pack()).
+
+        :param path: path to the archive, .npz is added if missing
+        :type path: str | Path
+        :param compress: compress the archive, compressed arrays are not memory-mapped on loading. Defaults to False.
+        :type compress: bool, optional
+
+        :returns: path to the archive
+        :rtype: str
+        """
+        path = str(path)
+        if not path.endswith(".npz"):
+            path += ".npz"
+
+        form = self.form
+        index_names = list(self.index_members)
+        members = [m for i in index_names for m in self.index_members[i]]
+
+        arrays = {
+            "version": nparray(1),
+            "name": pack([self.name]),
+            "A_data": form["A"].data,
+            "A_indices": form["A"].indices,
+            "A_indptr": form["A"].indptr,
+            "B": npasarray(form["B"], dtype=float),
+            "sense": npasarray(form["sense"], dtype="<U1"),
+            "C": npasarray(form["C"], dtype=float),
+            "lb": npasarray(form["lb"], dtype=float),
+            "ub": npasarray(form["ub"], dtype=float),
+            "vtype": npasarray(form["vtype"], dtype="<U1"),
+            # rows, columns
+            "shape": nparray(form["A"].shape, dtype="int64"),
+            "rows": pack(list(form["rows"])),
+            "cols": pack(list(form["cols"])),
+            "objective": pack([form["objective"]] if form["objective"] else []),
+            "F_data": self.F.data,
+            "F_indices": self.F.indices,
+            "F_indptr": self.F.indptr,
+            "thetas": pack(self.thetas),
+            "n_thetas": nparray(len(self.thetas)),
+            "theta_bounds": npasarray(self.theta_bounds, dtype=float),
+            "index_sets": pack(index_names),
+            "index_sizes": nparray(
+                [len(self.index_members[i]) for i in index_names], dtype="int64"
+            ),
+            "members": pack(members),
+            "variable_sets": pack(list(self.variable_sizes)),
+            "variable_sizes": nparray(
+                list(self.variable_sizes.values()), dtype="int64"
+            ),
+            "col_sets": self.col_sets,
+            "col_pos": self.col_pos,
+        }
+
+        (npsavez_compressed if compress else npsavez)(path, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = True) -> Compiled:
+        """
+        Loads a program saved with .save()
+
+        :param path: path to the archive
+        :type path: str | Path
+        :param mmap: memory-map the arrays (read only). Defaults to True.
+        :type mmap: bool, optional
+
+        :returns: the program as arrays
+        :rtype: Compiled
+        """
+        arrays = npzload(path, mmap=mmap)
+
+        n_rows, n_cols = arrays["shape"].tolist()
+        n_thetas = int(arrays["n_thetas"])
+        objective = unpack(arrays["objective"], 1 if len(arrays["objective"]) else 0)
+
+        form = {
+            "A": csr_matrix(
+                (arrays["A_data"], arrays["A_indices"], arrays["A_indptr"]),
+                shape=(n_rows, n_cols),
+            ),
+            "B": arrays["B"],
+            "sense": arrays["sense"],
+            "C": arrays["C"],
+            "lb": arrays["lb"],
+            "ub": arrays["ub"],
+            "vtype": arrays["vtype"],
+            "rows": unpack(arrays["rows"], n_rows),
+            "cols": unpack(arrays["cols"], n_cols),
+            "objective": objective[0] if objective else None,
+        }
+
+        index_sizes = arrays["index_sizes"].tolist()
+        index_names = unpack(arrays["index_sets"], len(index_sizes))
+        members = unpack(arrays["members"], sum(index_sizes))
+        ends = npcumsum(index_sizes, dtype=int).tolist()
+
+        variable_sizes = arrays["variable_sizes"].tolist()
+
+        return cls(
+            name=unpack(arrays["name"], 1)[0],
+            form=form,
+            F=csr_matrix(
+                (arrays["F_data"], arrays["F_indices"], arrays["F_indptr"]),
+                shape=(n_rows, n_thetas),
+            ),
+            thetas=unpack(arrays["thetas"], n_thetas),
+            theta_bounds=arrays["theta_bounds"],
+            index_members={
+                i: members[end - size : end]
+                for i, size, end in zip(index_names, index_sizes, ends)
+            },
+            variable_sizes=dict(
+                zip(
+                    unpack(arrays["variable_sets"], len(variable_sizes)),
+                    variable_sizes,
+                )
+            ),
+            col_sets=arrays["col_sets"],
+            col_pos=arrays["col_pos"],
+        )
+
+    def matrix_form(self) -> dict[str, ndarray | csr_matrix | list[str]]:
+        """The program as arrays, as fed to gurobipy, see Prg.matrix_form()"""
+        return dict(self.form)
+
+    def gurobi(self) -> GPModel:
+        """Gurobi Model"""
+        from .program import Prg
+
+        return Prg.gurobi_model(self.form, self.name)
+
+    def mps(self, name: str = None, free: bool = False, float_format: str = "") -> str:
+        """
+        MPS File, see Prg.mps()
+
+        :param name: File name, .mps is added if not given (before .gz or .bz2). Defaults to the name of the program.
+        :type name: str, optional
+        :param free: Free MPS, fields are separated by a single space. Defaults to False.
+        :type free: bool, optional
+        :param float_format: Format spec for the coefficients and RHS, e.g. '.12g'. Defaults to '' (str).
+        :type float_format: str, optional
+
+        :returns: Path to the file
+        :rtype: str
+        """
+        from .program import Prg
+
+        return Prg.write_mps(
+            self.form,
+            Prg.mps_path(name or self.name),
+            name=self.name,
+            free=free,
+            float_format=float_format,
+        )
+
+    def opt(self) -> Compiled | bool:
+        """
+        Solves the program using gurobi,
+        the values of the columns are kept in .col_values
+        and the objective value in .objective_values
+
+        :returns: self, False if no solution was found
+        :rtype: Compiled | bool
+        """
+        from gurobipy import GRB
+
+        m = self.gurobi()
+        m.optimize()
+
+        if m.SolCount == 0 or m.Status not in [GRB.OPTIMAL, GRB.SUBOPTIMAL]:
+            logger.warning("🛑 No solution found. Check the model 🛑")
+            return False
+
+        self.col_values[self.n_solutions] = nparray(m.getAttr("X", m.getVars()))
+        self.objective_values[self.n_solutions] = m.ObjVal
+        self.n_solutions += 1
+        return self
+
+    def __call__(self, variable_set: str, n_sol: int | None = None) -> ndarray:
+        """
+        Values of the variables of a variable set,
+        nan for variables that are not columns (do not feature anywhere)
+
+        :param variable_set: name of the variable set
+        :type variable_set: str
+        :param n_sol: solution number. Defaults to the last solution.
+        :type n_sol: int | None, optional
+
+        :returns: value of each variable in the set
+        :rtype: ndarray
+
+        :raises ValueError: If there is no such variable set or solution
+        """
+        if variable_set not in self.variable_sizes:
+            raise ValueError(f"{self.name}: no variable set {variable_set}")
+        if n_sol is None:
+            n_sol = self.n_solutions - 1
+        if n_sol not in self.col_values:
+            raise ValueError(f"{self.name}: no solution {n_sol}, use .opt()")
+
+        k = list(self.variable_sizes).index(variable_set)
+        cols = npasarray(self.col_sets) == k
+
+        values = npfull(self.variable_sizes[variable_set], npnan)
+        values[npasarray(self.col_pos)[cols]] = self.col_values[n_sol][cols]
+        return values
+
+    def __repr__(self):
+        return f"{self.name} ({len(self.form['rows'])} rows, {len(self.form['cols'])} columns)"
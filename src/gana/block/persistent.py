@@ -0,0 +1,227 @@
+"""Persistent Solver Model"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from gurobipy import GRB
+from gurobipy import Constr as GPConstr
+from gurobipy import LinExpr as GPLinExpr
+from gurobipy import Model as GPModel
+from gurobipy import Var as GPVar
+
+if TYPE_CHECKING:
+    from ..sets.constraint import C
+    from ..sets.objective import O
+    from ..sets.variable import V
+    from .program import Prg
+
+
+class Persistent:
+    """
+    A gurobipy model kept alive across solves of a program
+
+    The model is built once (see Prg.gurobi()).
+    Before each solve, only what has changed in the program is pushed to it:
+
+    - constraints added since: new rows
+    - constraints replaced since (Prg.replace_constraint): changed coefficients, RHS and sense,
+      found by comparing with the constraints they replaced
+    - variables featuring for the first time: new columns with their bounds and type
+    - a new objective: changed objective coefficients
+    - parameters overwritten (Prg.mutate_parameter): the constraints and objectives made with them
+      are declared again (Prg.refresh), and pushed as replaced constraints and a new objective
+
+    Rows are kept by the slot of the constraint in Prg.constraints,
+    which does not change when a constraint set is replaced.
+
+    :param program: program to keep the model for
+    :type program: Prg
+    """
+
+    def __init__(self, program: Prg):
+        self.program = program
+
+        # columns and rows are read off the model as built
+        self.model: GPModel = program.gurobi()
+
+        # variable number (n) to column
+        self.cols: dict[int, GPVar] = {
+            v.n: x for v, x in zip(program.colvars(), self.model.getVars())
+        }
+
+        # slot in .constraints to row
+        # nonnegativity constraints do not have rows (they are bounds)
+        slots = {id(c): k for k, c in enumerate(program.constraints)}
+        self.rows: list[GPConstr | None] = [None] * len(program.constraints)
+        for c, r in zip(
+            program.leqcons() + program.eqcons(), self.model.getConstrs()
+        ):
+            self.rows[slots[id(c)]] = r
+
+        # the objective that the model minimizes
+        self.objective: O | None = (
+            program.objectives[-1] if program.objectives else None
+        )
+
+        # replacements made before the model was built are in it
+        program._replaced.clear()
+
+        # number of updates pushed
+        self.n_updates: int = 0
+
+    def column(self, v: V) -> GPVar:
+        """
+        Column of a variable, made if the variable is new to the model
+
+        :param v: variable
+        :type v: V
+
+        :returns: column in the model
+        :rtype: GPVar
+        """
+        try:
+            return self.cols[v.n]
+        except KeyError:
+            x = self.model.addVar(
+                lb=0.0 if v.nn else -GRB.INFINITY,
+                ub=1.0 if v.bnr else GRB.INFINITY,
+                vtype=GRB.BINARY if v.bnr else GRB.INTEGER if v.itg else GRB.CONTINUOUS,
+                name=v.mps(),
+            )
+            self.cols[v.n] = x
+            return x
+
+    def coefficients(self, constraint: C) -> dict[int, float]:
+        """
+        Coefficients of a constraint by variable number (n),
+        repeated variables are summed
+
+        :param constraint: constraint
+        :type constraint: C
+
+        :returns: coefficient of each variable
+        :rtype: dict[int, float]
+        """
+        row: dict[int, float] = {}
+        for v, a in zip(constraint.variables, constraint.A):
+            if v is not None:
+                if v.n not in self.cols:
+                    self.column(v)
+                row[v.n] = row.get(v.n, 0.0) + float(a)
+        return row
+
+    def add_row(self, constraint: C) -> GPConstr:
+        """
+        Adds a row for a constraint
+
+        :param constraint: constraint
+        :type constraint: C
+
+        :returns: row in the model
+        :rtype: GPConstr
+        """
+        row = self.coefficients(constraint)
+        return self.model.addLConstr(
+            GPLinExpr(list(row.values()), [self.cols[n] for n in row]),
+            GRB.LESS_EQUAL if constraint.leq else GRB.EQUAL,
+            float(constraint.B or 0),
+            name=constraint.mps(),
+        )
+
+    def update_rows(self, replaced: list[tuple[int, C]]):
+        """
+        Pushes the changes of replaced constraints,
+        only coefficients, RHS and senses that differ are changed
+
+        :param replaced: slot in Prg.constraints and the constraint that was there (as in the model)
+        :type replaced: list[tuple[int, C]]
+        """
+        # RHS and senses are set together
+        rhs_rows, rhs = [], []
+        sense_rows, senses = [], []
+
+        for slot, constraint_ex in replaced:
+            constraint = self.program.constraints[slot]
+            r = self.rows[slot]
+
+            if constraint.nn:
+                # nonnegativity is a bound
+                if r is not None:
+                    self.model.remove(r)
+                    self.rows[slot] = None
+                continue
+
+            if r is None:
+                self.rows[slot] = self.add_row(constraint)
+                continue
+
+            if not (
+                constraint.P == constraint_ex.P
+                and list(constraint.A) == list(constraint_ex.A)
+            ):
+                row_ex = self.coefficients(constraint_ex)
+                row = self.coefficients(constraint)
+                for n in row_ex.keys() | row.keys():
+                    a = row.get(n, 0.0)
+                    if row_ex.get(n, 0.0) != a:
+                        self.model.chgCoeff(r, self.cols[n], a)
+
+            if (constraint.B or 0) != (constraint_ex.B or 0):
+                rhs_rows.append(r)
+                rhs.append(float(constraint.B or 0))
+
+            if constraint.leq != constraint_ex.leq:
+                sense_rows.append(r)
+                senses.append(GRB.LESS_EQUAL if constraint.leq else GRB.EQUAL)
+
+        if rhs_rows:
+            self.model.setAttr("RHS", rhs_rows, rhs)
+        if sense_rows:
+            self.model.setAttr("Sense", sense_rows, senses)
+
+    def update_objective(self):
+        """Pushes the objective coefficients if the objective has changed"""
+        objective = self.program.objectives[-1] if self.program.objectives else None
+
+        if objective is self.objective:
+            return
+
+        # clear the objective coefficients of the earlier objective
+        cols = list(self.cols.values())
+        self.model.setAttr("Obj", cols, [0.0] * len(cols))
+
+        if objective is not None:
+            # as in Prg.gurobi()
+            function = objective.function[0]
+            variables = {v.n: v for v in function.variables if v is not None}
+            _matrix = function.matrix
+            self.model.setAttr(
+                "Obj",
+                [self.column(variables[n]) for n in _matrix],
+                [float(a) for a in _matrix.values()],
+            )
+
+        self.objective = objective
+
+    def update(self):
+        """Pushes what has changed in the program since the last update"""
+        program = self.program
+
+        # replaced constraint sets
+        # if replaced more than once, the first one is in the model
+        replaced: dict[int, C] = {}
+        for slot, constraint_ex in program._replaced:
+            replaced.setdefault(slot, constraint_ex)
+        self.update_rows(sorted(replaced.items(), key=lambda x: x[0]))
+        program._replaced.clear()
+
+        # constraints added since
+        for slot in range(len(self.rows), len(program.constraints)):
+            constraint = program.constraints[slot]
+            self.rows.append(None if constraint.nn else self.add_row(constraint))
+
+        self.update_objective()
+
+        self.model.update()
+        self.n_updates += 1
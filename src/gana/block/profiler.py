@@ -0,0 +1,236 @@
+"""Build Profiler"""
+
+from __future__ import annotations
+
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+from typing import Any, Iterator, Literal, Self
+
+from ..sets.constraint import C
+from ..sets.function import F as Func
+from ..sets.objective import O
+
+
+@dataclass
+class Declaration:
+    """
+    What declaring a set on the program (p.name = ...) took
+
+    :param name: name of the set
+    :type name: str
+    :param kind: I, V, P, T, F, C or O
+    :type kind: str
+    :param time: wall time (s) since the declaration before, making the set included
+    :type time: float
+    :param declare: wall time (s) spent adding the set to the program
+    :type declare: float
+    :param objects: objects made, by kind (I, V, P, T, F, C, O)
+    :type objects: dict[str, int]
+    :param rows: constraints (rows) added
+    :type rows: int
+    :param nonzeros: variable coefficients (nonzeros) in the rows added
+    :type nonzeros: int
+    :param memory: memory (bytes) allocated and kept since the declaration before, None if not traced
+    :type memory: int | None
+    :param peak: peak memory (bytes) above that at the declaration before, None if not traced
+    :type peak: int | None
+    """
+
+    name: str
+    kind: str
+    time: float
+    declare: float
+    objects: dict[str, int] = field(default_factory=dict)
+    rows: int = 0
+    nonzeros: int = 0
+    memory: int | None = None
+    peak: int | None = None
+
+
+def made(value: Any) -> tuple[dict[str, int], int, int]:
+    """
+    Objects, rows and nonzeros of a declared set
+
+    :param value: index, variable, parameter, theta, function, constraint or objective set
+    :type value: Any
+
+    :returns: objects by kind, rows, nonzeros
+    :rtype: tuple[dict[str, int], int, int]
+    """
+    if isinstance(value, C):
+        rows = len(value._)
+        nonzeros = sum(
+            sum(1 for x in c.P if x is not None) for c in value._ if c.P is not None
+        )
+        return {"C": rows, "F": len(value.function._)}, rows, nonzeros
+    if isinstance(value, O):
+        return {"O": 1}, 0, 0
+    if isinstance(value, Func):
+        return {"F": len(value._)}, 0, 0
+    # elements (_I) are counted as their sets
+    return {type(value).__name__.strip("_"): len(value._)}, 0, 0
+
+
+class Profiler:
+    """
+    Records what each declaration on the program takes, see Prg.profile()
+
+    The time of a declaration runs from the end of the one before,
+    so that making the set (p.x(p.i) <= ...) is counted along with adding it.
+    Memory is traced with tracemalloc, which slows building down several times.
+
+    :param memory: trace memory. Defaults to True.
+    :type memory: bool, optional
+
+    :ivar declarations: declarations, in order
+    :vartype declarations: list[Declaration]
+    """
+
+    def __init__(self, memory: bool = True):
+        self.declarations: list[Declaration] = []
+        self.memory = memory
+        self.on = True
+        # declarations open
+        self._depth = 0
+        # tracemalloc was started here, stop it with the profiler
+        self._tracemalloc = memory and not tracemalloc.is_tracing()
+        if self._tracemalloc:
+            tracemalloc.start()
+        self._mark()
+
+    def _mark(self):
+        """Marks the end of a declaration"""
+        if self.memory:
+            tracemalloc.reset_peak()
+            self._memory = tracemalloc.get_traced_memory()[0]
+        self._last = perf_counter_ns()
+
+    @contextmanager
+    def record(self, name: str, value: Any) -> Iterator[None]:
+        """
+        Records the declaration made within
+
+        :param name: name of the set
+        :type name: str
+        :param value: the set declared
+        :type value: Any
+        """
+        if self._depth:
+            # sets declared while declaring another (e.g. index elements)
+            # are counted with it
+            yield
+            return
+
+        start = perf_counter_ns()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+        end = perf_counter_ns()
+
+        memory = peak = None
+        if self.memory:
+            current, _peak = tracemalloc.get_traced_memory()
+            memory, peak = current - self._memory, _peak - self._memory
+
+        objects, rows, nonzeros = made(value)
+        self.declarations.append(
+            Declaration(
+                name=name,
+                kind=type(value).__name__.strip("_"),
+                time=(end - self._last) / 1e9,
+                declare=(end - start) / 1e9,
+                objects=objects,
+                rows=rows,
+                nonzeros=nonzeros,
+                memory=memory,
+                peak=peak,
+            )
+        )
+        self._mark()
+
+    def stop(self) -> Self:
+        """Stops profiling, the declarations are kept"""
+        if self.on and self._tracemalloc:
+            tracemalloc.stop()
+        self.on = False
+        return self
+
+    def ranked(
+        self,
+        by: Literal[
+            "time", "declare", "memory", "peak", "rows", "nonzeros", "objects"
+        ] = "time",
+    ) -> list[Declaration]:
+        """
+        Declarations, costliest first
+
+        :param by: time, declare, memory, peak, rows, nonzeros or objects. Defaults to 'time'.
+        :type by: str, optional
+
+        :returns: declarations
+        :rtype: list[Declaration]
+
+        :raises ValueError: If by is not recognized, or memory was not traced
+        """
+        if by == "objects":
+            return sorted(
+                self.declarations, key=lambda d: sum(d.objects.values()), reverse=True
+            )
+        if by not in ["time", "declare", "memory", "peak", "rows", "nonzeros"]:
+            raise ValueError(
+                f"by {by} not in time, declare, memory, peak, rows, nonzeros, objects"
+            )
+        if by in ["memory", "peak"] and not self.memory:
+            raise ValueError("memory was not traced, use .profile(memory=True)")
+        return sorted(self.declarations, key=lambda d: getattr(d, by), reverse=True)
+
+    def report(self, top: int | None = 10, by: str = "time") -> str:
+        """
+        Table of the costliest declarations
+
+        :param top: number of declarations, None for all. Defaults to 10.
+        :type top: int | None, optional
+        :param by: see .ranked(). Defaults to 'time'.
+        :type by: str, optional
+
+        :returns: the table
+        :rtype: str
+        """
+        declarations = self.ranked(by)[:top]
+
+        def mib(n: int | None) -> str:
+            return "-" if n is None else f"{n / 2**20:.1f}"
+
+        total = sum(d.time for d in self.declarations)
+        width = max([len(d.name) for d in declarations] + [4])
+        lines = [
+            f"{'set':<{width}} {'kind':>4} {'time (s)':>10} {'%':>6} {'declare (s)':>11} "
+            f"{'rows':>9} {'nonzeros':>10} {'MiB':>8} {'peak MiB':>9}  objects"
+        ]
+        for d in declarations:
+            share = 100 * d.time / total if total else 0.0
+            objects = " ".join(f"{k}={n}" for k, n in d.objects.items())
+            lines.append(
+                f"{d.name:<{width}} {d.kind:>4} {d.time:>10.4f} {share:>6.1f} {d.declare:>11.4f} "
+                f"{d.rows:>9} {d.nonzeros:>10} {mib(d.memory):>8} {mib(d.peak):>9}  {objects}"
+            )
+        lines.append(
+            f"{len(self.declarations)} declarations, {total:.4f} s, "
+            f"{sum(d.rows for d in self.declarations)} rows, "
+            f"{sum(d.nonzeros for d in self.declarations)} nonzeros"
+        )
+        return "\n".join(lines)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.stop()
+        return False
+
+    def __repr__(self):
+        return f"Profiler ({len(self.declarations)} declarations)"
@@ -1,38 +1,71 @@
 """Program"""
 
+from __future__ import annotations
+
 import json
 import logging
 import pickle
 import warnings
+from array import array
+from bz2 import open as bz2open
+from contextlib import nullcontext
 from dataclasses import dataclass, field
+from gzip import open as gzopen
+from itertools import islice
 from pathlib import Path
-from typing import Literal
+from typing import TYPE_CHECKING, Any, Callable, Literal, Self
 
-from gurobipy import Model as GPModel
-from gurobipy import read as gpread
-from IPython.display import Markdown, display
-# from numpy import round as npround
-# from numpy import abs as npabs
+from numpy import abs as npabs
 from numpy import array as nparray
+from numpy import asarray as npasarray
+from numpy import concatenate as npconcatenate
+from numpy import frombuffer as npfrombuffer
+from numpy import fromiter as npfromiter
+from numpy import full as npfull
+from numpy import inf as npinf
+from numpy import int64 as npint64
+from numpy import isin as npisin
+from numpy import maximum as npmaximum
+from numpy import nan as npnan
+from numpy import ndarray
+from numpy import round as npround
+from numpy import vstack as npvstack
 from numpy import zeros as npzeros
-from pandas import DataFrame
-from ppopt.mp_solvers.solve_mpqp import mpqp_algorithm, solve_mpqp
-from ppopt.mplp_program import MPLP_Program
-from ppopt.plot import parametric_plot
-from ppopt.solution import Solution as MPSolution
+from scipy.sparse import bmat as spbmat
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse import vstack as spvstack
 
 from ..operators.composition import inf, sup
 from ..sets.cases import Elem, ICase, PCase
+from ..sets._element import Chain, Elements
 from ..sets.constraint import C
 from ..sets.function import F as Func
-from ..sets.index import I
+from ..sets.index import I, _I
 from ..sets.objective import O
 from ..sets.parameter import P
 from ..sets.theta import T
 from ..sets.variable import V
+from ..utils import tracing
 from ..utils.decorators import timer
+from ..utils.display import Markdown, display
+from ..utils.registry import Names
+from ..utils.sizes import footprint
+from .compiled import Compiled
+from .profiler import Profiler
+from .regions import Regions
 from .solution import Solution
 
+# solvers (gurobipy, ppopt), pandas and plotting are imported when used
+if TYPE_CHECKING:
+    from gurobipy import Model as GPModel
+    from gurobipy import Var as GPVar
+    from pandas import DataFrame
+    from ppopt.mplp_program import MPLP_Program
+    from ppopt.solution import Solution as MPSolution
+
+    from .persistent import Persistent
+    from .sweep import Sweep
+
 logger = logging.getLogger("gana")
 logger.setLevel(logging.INFO)
 
@@ -95,7 +128,8 @@ class Prg:
 
         # variable (V)
         self.variable_sets: list[V] = []
-        self.variables: list[V] = []
+        # variables are made when asked for, see V.birth_variables()
+        self.variables: Chain = Chain()
 
         # parameter (P)
         self.parameter_sets: list[P] = []  # parameter sets
@@ -103,7 +137,7 @@ class Prg:
 
         # parametric variable (T)
         self.theta_sets: list[T] = []
-        self.thetas: list[T] = []
+        self.thetas: Chain = Chain()
 
         # function (F)
         self.function_sets: list[Func] = []
@@ -123,16 +157,19 @@ class Prg:
         self.objectives: list[O] = []
 
         # ---names --------
-        self.names: list[str] = []  # element names
-
-        self.names_index_sets: list[str] = []  # index sets
-        self.names_indices: list[str] = []  # elements
-        self.names_variable_sets: list[str] = []  # variable sets
-        self.names_parameter_sets: list[str] = []  # parameter sets
-        self.names_theta_sets: list[str] = []  # parametric variable sets
-        self.names_function_sets: list[str] = []  # function sets
-        self.names_constraint_sets: list[str] = []  # constraints
-        self.names_objectives: list[str] = []  # objectives
+        # these are lists with a set kept alongside
+        # so that membership checks (made on every declaration)
+        # do not scale with the size of the program
+        self.names: Names = Names()  # element names
+
+        self.names_index_sets: Names = Names()  # index sets
+        self.names_indices: Names = Names()  # elements
+        self.names_variable_sets: Names = Names()  # variable sets
+        self.names_parameter_sets: Names = Names()  # parameter sets
+        self.names_theta_sets: Names = Names()  # parametric variable sets
+        self.names_function_sets: Names = Names()  # function sets
+        self.names_constraint_sets: Names = Names()  # constraints
+        self.names_objectives: Names = Names()  # objectives
 
         # ---counts --------
 
@@ -166,7 +203,7 @@ class Prg:
         self.optimized = False
 
         # the solution object
-        self.solutions: dict[int, Solution | MPSolution] = {}
+        self.solutions: dict[int, Solution | MPSolution | Sweep | Regions] = {}
 
         # number of solutions
         self.n_solutions: int = 0
@@ -174,6 +211,44 @@ class Prg:
         # solution matrix
         self.X: dict[int, list[float | int]] = {}
 
+        # ---partitions --------
+        # constraints and variables by type, in order of declaration
+        # kept up to date as sets are added, mutated or replaced
+        # so that .leqcons(), .nnvars(), etc. do not scan the program
+        self._parts: dict[str, list[C] | Chain] = {
+            **{k: [] for k in ["leqcons", "eqcons", "nncons"]},
+            **{
+                k: Chain()
+                for k in [
+                    "nnvars",
+                    "bnrvars",
+                    "itgvars",
+                    "nonbnritgvars",
+                    "cntbnrvars",
+                    "cntvars",
+                ]
+            },
+        }
+        # where the constraints of each set (by number) start
+        # in .constraints and in the partitions they are in
+        # and how many slots they take
+        self._cons_at: dict[int, dict[str, int]] = {}
+        # .cons() (leq + eq + nn) is put together once
+        self._cons: list[C] | None = None
+        # constraints have been numbered as in .cons()
+        self._renumbered: bool = False
+        # A and B over .cons(), kept while .cons() is the same list
+        self._activity_form: tuple[list[C], csr_matrix, ndarray] | None = None
+
+        # gurobipy model kept alive across solves, see .persistent()
+        self._persistent: Persistent | None = None
+        # slots in .constraints replaced since the persistent model was updated
+        # and the constraints that were there
+        self._replaced: list[tuple[int, C]] = []
+
+        # records what each declaration takes, see .profile()
+        self.profiler: Profiler | None = None
+
         # formulations available
         self.formulations: dict[int, GPModel | MPLP_Program] = {}
 
@@ -186,8 +261,18 @@ class Prg:
         # number of evaluations by solution number
         self.n_evaluation: dict[int, int] = {}
 
+        # point location index over the critical regions by solution number
+        self.regions: dict[int, Regions] = {}
+
         # solution types
-        self.sol_types: dict[str, list[int]] = {"MIP": [], "mp": []}
+        self.sol_types: dict[str, list[int]] = {"MIP": [], "mp": [], "sweep": []}
+
+        # activity (A x - B) of each constraint in .cons() by solution number
+        self.activities: dict[int, ndarray] = {}
+
+        # duals, reduced costs and sensitivity ranges of LP solves by solution number
+        # see ._load_sensitivity()
+        self.sensitivity: dict[int, dict[str, ndarray]] = {}
 
     @property
     def solution(self) -> Solution | MPSolution:
@@ -265,10 +350,8 @@ class Prg:
                 # these should not be set again
                 _new_elm = False
             else:
-                element = I()
                 # set the name
-                element.name = member
-                element._hash = hash(member)
+                element = _I(member, ordered=None)
                 # this is the nth element (0 indexed)
                 element.n = self.n_index_elements
                 # update the number of elements
@@ -318,6 +401,7 @@ class Prg:
         # update the list of variables
         self.variables.extend(variable._)
         self.n_variables += len(variable._)
+        self.partition_variables(variable._)
 
     def mutate_variable(self, variable_ex: V, variable_new: V):
         """
@@ -334,6 +418,7 @@ class Prg:
 
         # the positions need to be pushed ahead
         pos_start = len(variable_ex)
+        ordinals = variable_ex.ordinals
         # note: if a variable already exists in the existing variable set
         # then, it is not added.
         # thus the position (and hence name) depends on the existing variables
@@ -381,8 +466,12 @@ class Prg:
                 variable_ex.index = {*variable_ex.index, var_new_idx}
             else:
                 variable_ex.index = {var_ex_idx, var_new_idx}
+            variable_ex._ordinals = npconcatenate(
+                [ordinals, [v.n for v in var_add]]
+            ).astype(int)
             self.n_variables += n
             self.variables.extend(var_add)
+            self.partition_variables(var_add)
 
     def add_parameter(self, name: str, parameter: P):
         """
@@ -415,6 +504,9 @@ class Prg:
         :type parameter_new: P
         """
         n = 0  # count of parameters added to set
+        # positions of the parameters, made if any are overwritten
+        positions: dict | None = None
+        overwritten = False
         for idx, p in parameter_new.map.items():
 
             if idx is None:
@@ -426,12 +518,22 @@ class Prg:
                 warnings.warn(
                     f"The value{parameter_ex.map[idx]} is being overwritten by {p} at index {idx}"
                 )
+                if positions is None:
+                    positions = {k: i for i, k in enumerate(parameter_ex.map)}
+                parameter_ex.map[idx] = p
+                parameter_ex._[positions[idx]] = p
+                overwritten = True
+                continue
 
             # set the position of the new parameter
             parameter_ex.map[idx] = p
             parameter_ex._.append(p)
             n += 1
 
+        if overwritten:
+            # constraints and objectives were made with the old values
+            self.refresh(parameter_ex)
+
         if n > 0:
             parameter_ex.n_splices += 1
             # update the existing parameter index
@@ -441,6 +543,41 @@ class Prg:
             else:
                 parameter_ex.index = {parameter_ex.index, parameter_new.index}
 
+    def refresh(self, parameter: P):
+        """
+        Declares the constraint sets and objectives made with a parameter set again,
+        with the values that the parameter set has now (see F.refresh()).
+        Called when parameters are overwritten (see .mutate_parameter()).
+
+        Replaced constraints and objectives are pushed to the persistent model
+        on the next solve (see .persistent())
+
+        :param parameter: parameter set whose values have changed
+        :type parameter: P
+        """
+        # the function sets made from the parameter set are known by identity
+        # the rest are not walked through
+        for constraint in list(self.constraint_sets):
+            if not constraint.function.uses(parameter):
+                continue
+            function = constraint.function.refresh(parameter)
+            if function is not constraint.function:
+                # see .replace_constraint()
+                setattr(
+                    self,
+                    constraint.pname,
+                    C(function, leq=constraint.leq, category=constraint.category),
+                )
+
+        for objective in list(self.objectives):
+            # objectives of variable elements keep the first element of the function set
+            function = objective.function.parent or objective.function
+            if not isinstance(function, Func) or not function.uses(parameter):
+                continue
+            function_new = function.refresh(parameter)
+            if function_new is not function:
+                self.replace_objective(objective, O(function_new))
+
     def add_theta(self, name: str, theta: T):
         """
         Adds new theta set to program
@@ -686,21 +823,112 @@ class Prg:
         # update the list of constraints
         self.constraint_sets.append(constraint)
 
-        constraint.update_variables()
+        self.commit_constraints([constraint])
 
-        # update the list of constraints
-        self.constraints.extend(constraint._)
-        for n, c in enumerate(constraint._):
+    def commit_constraints(self, constraints: list[C]):
+        """
+        Numbers the constraints in the constraint sets,
+        informs the variables and registers the thetas
+
+        :param constraints: constraint sets (already added) to commit
+        :type constraints: list[C]
+        """
+        # all the constraints in the sets, in order of declaration
+        _constraints = [c for constraint in constraints for c in constraint._]
+
+        for n, c in enumerate(_constraints, start=self.n_constraints):
             # this is the nth constraint declared
-            c.n = self.n_constraints + n
+            c.n = n
+
+        # update the partitions
+        # each set takes a block in .constraints and its partitions
+        for constraint in constraints:
+            self._cons_at[constraint.n] = {
+                "constraints": len(self.constraints),
+                "size": len(constraint._),
+                **{k: len(self._parts[k]) for k in self.kinds(constraint)},
+            }
+            self.constraints.extend(constraint._)
+            for k in self.kinds(constraint):
+                self._parts[k].extend(constraint._)
+        self._cons = None
+        self._renumbered = False
 
         # update the number of constraints
-        self.n_constraints += len(constraint._)
+        self.n_constraints += len(_constraints)
+
+        # collect the constraints each variable is in
+        # then update cons_by once per variable
+        cons_by: dict[V, list[C]] = {}
+        for c in _constraints:
+            for v in c.variables:
+                if v is not None:
+                    cons_by.setdefault(v, []).append(c)
+
+        for v, _cons in cons_by.items():
+            for pos, c in enumerate(_cons, start=len(v.cons_by)):
+                c.cons_by_pos[v] = pos
+            v.cons_by.extend(_cons)
+
+        for constraint in constraints:
+            if constraint.function.rhs_thetas:
+                # if the constraint has thetas in them
+                # then update the thetas in the function
+                self.update_theta(constraint)
+
+    def profile(self, memory: bool = True) -> Profiler:
+        """
+        Records what each declaration (p.name = ...) takes from here on:
+        wall time, objects made, rows and nonzeros added, memory allocated.
+        See .build_report() for the costliest ones.
+
+        Usage:
+
+            p.profile()
+            p.c1 = p.x(p.i) <= 5
+            ...
+            print(p.build_report())
+
+        or, to stop profiling after:
+
+            with p.profile():
+                p.c1 = p.x(p.i) <= 5
+
+        :param memory: trace memory (tracemalloc), building is slower then. Defaults to True.
+        :type memory: bool, optional
 
-        if constraint.function.rhs_thetas:
-            # if the constraint has thetas in them
-            # then update the thetas in the function
-            self.update_theta(constraint)
+        :returns: the profiler, .stop() to stop profiling
+        :rtype: Profiler
+        """
+        if self.profiler is not None:
+            self.profiler.stop()
+        self.profiler = Profiler(memory=memory)
+        return self.profiler
+
+    def build_report(
+        self,
+        top: int | None = 10,
+        by: Literal[
+            "time", "declare", "memory", "peak", "rows", "nonzeros", "objects"
+        ] = "time",
+    ) -> str:
+        """
+        The costliest declarations since .profile()
+
+        :param top: number of declarations, None for all. Defaults to 10.
+        :type top: int | None, optional
+        :param by: time (since the declaration before, making the set included),
+            declare (adding the set), memory, peak, rows, nonzeros or objects. Defaults to 'time'.
+        :type by: str, optional
+
+        :returns: table of the declarations, costliest first
+        :rtype: str
+
+        :raises ValueError: If the program was not profiled
+        """
+        if self.profiler is None:
+            raise ValueError(f"{self.name}: not profiled, use .profile() before declaring")
+        return self.profiler.report(top=top, by=by)
 
     def replace_constraint(self, constraint_ex: C, constraint_new: C):
         """
@@ -725,13 +953,33 @@ class Prg:
 
         # replace the constraint in the program
         # let new constraint take n of the old constraint
-        for cons_new, cons_ex in zip(constraint_new._, constraint_ex._):
+        # n is changed by .renumber(), use where the set starts
+        at = self._cons_at.pop(constraint_ex.n)
+        for pos, (cons_new, cons_ex) in enumerate(
+            zip(constraint_new._, constraint_ex._), start=at["constraints"]
+        ):
 
             # self.constraints[self.constraints.index(cons_ex)] = cons_new
-            self.constraints[cons_ex.n] = cons_new
+            self.constraints[pos] = cons_new
 
             cons_new.n = cons_ex.n
 
+        self._cons_at[constraint_new.n] = at
+        if self._persistent is not None:
+            # rows to update in the persistent model
+            self._replaced.extend(
+                enumerate(constraint_ex._[: len(constraint_new._)], start=at["constraints"])
+            )
+        kinds = self.kinds(constraint_new)
+        if kinds == self.kinds(constraint_ex) and len(constraint_new._) == at["size"]:
+            # same slots in the same partitions
+            for k in kinds:
+                self._parts[k][at[k] : at[k] + at["size"]] = constraint_new._
+        else:
+            self.partition_constraints()
+        self._cons = None
+        self._renumbered = False
+
         for cons_ex, cons_new in zip(constraint_ex._, constraint_new._):
             cons_new.cons_by_pos = cons_ex.cons_by_pos
             for v in cons_ex.variables:
@@ -760,8 +1008,67 @@ class Prg:
         self.function_sets.append(objective.function)
         objective.update_variables()
 
+    def replace_objective(self, objective_ex: O, objective_new: O):
+        """
+        Replaces an existing objective in the program
+
+        :param objective_ex: existing objective
+        :type objective_ex: O
+        :param objective_new: new objective to replace the existing one
+        :type objective_new: O
+        """
+        # take the old objectives number and pname
+        objective_new.n = objective_ex.n
+        objective_new.pname = objective_ex.pname
+        self.objectives[objective_ex.n] = objective_new
+        # functions make constraints when compared (==), find the function by identity
+        at = next(
+            n for n, f in enumerate(self.function_sets) if f is objective_ex.function
+        )
+        self.function_sets[at] = objective_new.function
+
+        for v in objective_ex.variables:
+            if objective_ex in v.min_by:
+                v.min_by.remove(objective_ex)
+        objective_new.update_variables()
+
+        # objectives are not named in the program, find where the existing one is set
+        for name, value in list(vars(self).items()):
+            if value is objective_ex:
+                super().__setattr__(name, objective_new)
+
     def __setattr__(self, name, value) -> None:
 
+        if isinstance(value, (I, V, P, T, Func, C, O)):
+            profiling = self.profiler is not None and self.profiler.on
+            if profiling or tracing.tracer is not None:
+                # each set declared is a span, objects are the elements made
+                with (
+                    self.profiler.record(name, value) if profiling else nullcontext(),
+                    tracing.span(f"{name} ({type(value).__name__})", "build") as _span,
+                ):
+                    self._declare(name, value)
+                    _span.count(
+                        objects=(
+                            len(value._)
+                            if isinstance(value._, (list, Elements))
+                            else 1
+                        )
+                    )
+                return
+
+        self._declare(name, value)
+
+    def _declare(self, name: str, value: Any):
+        """
+        Adds (or mutates) a set on the program, see .__setattr__()
+
+        :param name: name of the set
+        :type name: str
+        :param value: index, variable, parameter, theta, function, constraint or objective set (or anything)
+        :type value: Any
+        """
+
         _mutation = False  # skip setting set
 
         if isinstance(value, I):
@@ -810,8 +1117,9 @@ class Prg:
                 if not value.ordered:
                     # update the exisiting index set with the new elements
                     _members = []
+                    _members_ex = set(index_ex.members)
                     for member in value.members:
-                        if member not in index_ex.members:
+                        if member not in _members_ex:
                             # if the member is not already in the index set
                             _members.append(member)
 
@@ -936,70 +1244,254 @@ class Prg:
         """less than or equal constraint sets"""
         return [x for x in self.constraint_sets if x.leq and not x.nn]
 
+    @staticmethod
+    def kinds(obj: C | V) -> tuple[str, ...]:
+        """
+        Partitions a constraint (set) or variable (set) belongs to
+
+        :param obj: constraint or variable
+        :type obj: C | V
+
+        :returns: names of the partitions, e.g. ('leqcons',)
+        :rtype: tuple[str, ...]
+        """
+        if isinstance(obj, C):
+            if obj.leq:
+                return ("nncons",) if obj.nn else ("leqcons",)
+            return ("eqcons", "nncons") if obj.nn else ("eqcons",)
+
+        kinds = []
+        if obj.nn:
+            kinds.append("nnvars")
+        if obj.bnr:
+            kinds.append("bnrvars")
+        if obj.itg:
+            kinds.append("itgvars")
+        if obj.itg and not obj.bnr:
+            kinds.append("nonbnritgvars")
+        else:
+            kinds.append("cntbnrvars")
+        if not obj.bnr and not obj.itg:
+            kinds.append("cntvars")
+        return tuple(kinds)
+
+    def partition_variables(self, variables: list[V] | Elements):
+        """
+        Adds variables to the partitions
+
+        :param variables: variables (added to .variables)
+        :type variables: list[V] | Elements
+        """
+        if isinstance(variables, Elements):
+            # all variables of a set, the flags are set wide
+            # so the variables need not be made
+            for k in self.kinds(variables.parent):
+                self._parts[k].extend(variables)
+            return
+
+        for v in variables:
+            for k in self.kinds(v):
+                self._parts[k].append(v)
+
+    def partition_constraints(self):
+        """Partitions the constraints again, if replaced by a different type"""
+        for k in ["leqcons", "eqcons", "nncons"]:
+            self._parts[k] = []
+
+        for at in sorted(self._cons_at.values(), key=lambda x: x["constraints"]):
+            constraints = self.constraints[
+                at["constraints"] : at["constraints"] + at["size"]
+            ]
+            for k in ["leqcons", "eqcons", "nncons"]:
+                at.pop(k, None)
+            for k in self.kinds(constraints[0]) if constraints else ():
+                at[k] = len(self._parts[k])
+                self._parts[k].extend(constraints)
+
+    # the partitions are kept by the program, do not mutate them
+
     def nncons(self, n: bool = False) -> list[int | C]:
         """non-negativity constraints"""
         if n:
-            return [x.n for x in self.constraints if x.nn]
-        return [x for x in self.constraints if x.nn]
+            return [x.n for x in self._parts["nncons"]]
+        return self._parts["nncons"]
 
     def eqcons(self, n: bool = False) -> list[int | C]:
         """equality constraints"""
         if n:
-            return [x.n for x in self.constraints if not x.leq]
-        return [x for x in self.constraints if not x.leq]
+            return [x.n for x in self._parts["eqcons"]]
+        return self._parts["eqcons"]
 
     def leqcons(self, n: bool = False) -> list[int | C]:
         """less than or equal constraints"""
         if n:
-            return [x.n for x in self.constraints if x.leq and not x.nn]
-        return [x for x in self.constraints if x.leq and not x.nn]
+            return [x.n for x in self._parts["leqcons"]]
+        return self._parts["leqcons"]
 
     def cons(self, n: bool = False) -> list[int | C]:
         """constraints"""
-        return self.leqcons(n) + self.eqcons(n) + self.nncons(n)
+        if self._cons is None:
+            self._cons = self.leqcons() + self.eqcons() + self.nncons()
+        if n:
+            return [x.n for x in self._cons]
+        return self._cons
 
     def nnvars(self, n: bool = False) -> list[int | V]:
         """non-negative variables"""
         if n:
-            return [x.n for x in self.variables if x.nn]
-        return [x for x in self.variables if x.nn]
+            return [x.n for x in self._parts["nnvars"]]
+        return self._parts["nnvars"]
 
     def bnrvars(self, n: bool = False) -> list[int | V]:
         """binary variables"""
         if n:
-            return [x.n for x in self.variables if x.bnr]
-        return [x for x in self.variables if x.bnr]
+            return [x.n for x in self._parts["bnrvars"]]
+        return self._parts["bnrvars"]
 
     def itgvars(self, n: bool = False) -> list[int | V]:
         """integer variables"""
         if n:
-            return [x.n for x in self.variables if x.itg]
-        return [x for x in self.variables if x.itg]
+            return [x.n for x in self._parts["itgvars"]]
+        return self._parts["itgvars"]
 
     def nonbnritgvars(self, n: bool = False) -> list[int | V]:
         """non-binary and integer variables"""
         if n:
-            return [x.n for x in self.variables if x.itg and not x.bnr]
-        return [x for x in self.variables if x.itg and not x.bnr]
+            return [x.n for x in self._parts["nonbnritgvars"]]
+        return self._parts["nonbnritgvars"]
 
     def cntbnrvars(self, n: bool = False) -> list[int | V]:
         """continuous and binary variables
         integer variables are excluded
         """
         if n:
-            return [x.n for x in self.variables if not x.itg or x.bnr]
-        return [x for x in self.variables if not x.itg or x.bnr]
+            return [x.n for x in self._parts["cntbnrvars"]]
+        return self._parts["cntbnrvars"]
 
     def cntvars(self, n: bool = False) -> list[int | V]:
         """continuous variables"""
         if n:
-            return [x.n for x in self.variables if not x.bnr and not x.itg]
-        return [x for x in self.variables if not x.bnr and not x.itg]
+            return [x.n for x in self._parts["cntvars"]]
+        return self._parts["cntvars"]
+
+    def colvars(self, n: bool = False) -> list[int | V]:
+        """variables written as columns (MPS, gurobi)
+        continuous and binary, then integer
+        variables that do not feature anywhere are left out
+        """
+        # variables in a constraint or objective have been made
+        _vars = [
+            x
+            for k in ["cntbnrvars", "nonbnritgvars"]
+            for x in self._parts[k].made()
+            if x.cons_by or x.min_by
+        ]
+        if n:
+            return [x.n for x in _vars]
+        return _vars
 
     def renumber(self):
         """Renumbers the constraints, just to be sure"""
+        if self._renumbered:
+            # nothing has changed since
+            return
         for n, c in enumerate(self.cons()):
             c.n = n
+        self._renumbered = True
+
+    def stats(self, memory: bool = True, sample: int | None = 1000) -> dict[str, Any]:
+        """
+        Size of the program, before writing or solving it
+
+        Counted off the constraints and variables, no matrix is made.
+        Rows are .cons() (as in .sparse('A')), .mps() and .gurobi() leave out nn rows.
+        Columns are .colvars(), variables that feature somewhere.
+
+        :param memory: measure the memory held by each family of sets (see utils.sizes.footprint()),
+            a pass over the objects held by the sets, ~1 s at 2*10^4 variables. Defaults to True.
+        :type memory: bool, optional
+        :param sample: elements sized in each set (evenly spread), the rest are taken to be alike,
+            None to size all. Defaults to 1000.
+        :type sample: int | None, optional
+
+        :returns: rows (leq, eq, nn), columns (continuous, binary, integer),
+            variables, nonzeros, density, thetas,
+            ppopt_bytes (the dense matrices .ppopt() makes),
+            memory (bytes held by I, V, P, T, F, C, O sets and their elements, None if not measured)
+        :rtype: dict[str, Any]
+        """
+        cons = self.cons()
+        rows = {
+            "leq": len(self.leqcons()),
+            "eq": len(self.eqcons()),
+            "nn": len(self.nncons()),
+            "total": len(cons),
+        }
+
+        columns = {"continuous": 0, "binary": 0, "integer": 0}
+        for v in self.colvars():
+            columns["binary" if v.bnr else "integer" if v.itg else "continuous"] += 1
+        columns["total"] = sum(columns.values())
+
+        nonzeros = sum(sum(1 for x in c.P if x is not None) for c in cons)
+        n_rows, n_vars, n_thetas = len(cons), self.n_variables, self.n_thetas
+
+        # A and NN, b, c, A_t, b_t, F and H, see .ppopt()
+        ppopt = (
+            (n_rows + n_vars) * (n_vars + 1 + n_thetas)
+            + n_vars * (1 + n_thetas)
+            + 2 * n_thetas * (n_thetas + 1)
+        )
+
+        _memory = None
+        if memory:
+            # sets are sized in full, the elements of each set are sampled
+            # each family is sized without following into the others
+            # (or the program), objects shared by families are counted once
+            families: dict[str, tuple[list, list[list]]] = {
+                "I": (self.index_sets, [self.indices]),
+                # only the variables and thetas made so far
+                "V": (
+                    self.variable_sets,
+                    [
+                        v._.made() if isinstance(v._, Elements) else v._
+                        for v in self.variable_sets
+                    ],
+                ),
+                "P": (self.parameter_sets, []),
+                "T": (self.theta_sets, [self.thetas.made()]),
+                "F": (self.function_sets, [f._ for f in self.function_sets]),
+                # with their functions
+                "C": (
+                    self.constraint_sets + [c.function for c in self.constraint_sets],
+                    [c._ + [x.function for x in c._] for c in self.constraint_sets],
+                ),
+                "O": (self.objectives + [o.function for o in self.objectives], []),
+            }
+            stop = {id(self)}
+            for sets, groups in families.values():
+                stop.update(map(id, sets))
+                for elements in groups:
+                    stop.update(map(id, elements))
+            seen: set[int] = set()
+
+            _memory = {
+                k: footprint(sets, seen, stop=stop)
+                + sum(footprint(elements, seen, sample, stop=stop) for elements in groups)
+                for k, (sets, groups) in families.items()
+            }
+            _memory["total"] = sum(_memory.values())
+
+        return {
+            "rows": rows,
+            "columns": columns,
+            "variables": n_vars,
+            "nonzeros": nonzeros,
+            "density": nonzeros / (n_rows * n_vars) if n_rows and n_vars else 0.0,
+            "thetas": n_thetas,
+            "ppopt_bytes": 8 * ppopt,
+            "memory": _memory,
+        }
 
     # --------------------------------------------------
     #               Matrices
@@ -1007,7 +1499,186 @@ class Prg:
 
     # DONOT call these for large programs
     # Going to run into memory issues
-    # TODO: make sparse matrix options
+    # use .sparse() instead
+
+    @tracing.traced("build")
+    def sparse(
+        self,
+        matrix: Literal["A", "B", "C", "F", "G", "H", "NN"] = "A",
+        format: Literal["csr", "coo", "dense"] = "csr",
+    ) -> csr_matrix | coo_matrix | ndarray:
+        """
+        Matrix of the program in sparse (or dense) format
+
+        Built straight from the blocks of positions and coefficients (A)
+        of each constraint set, no dense intermediate is made.
+        F is built from the positions (Z) and coefficients (F) of each constraint.
+        Repeated entries (same variable twice in a constraint) are summed.
+
+        :param matrix: A, F (rows are .cons()), G (leq), H (eq), NN, B (column) or C (row, of the last objective). Defaults to 'A'.
+        :type matrix: Literal['A', 'B', 'C', 'F', 'G', 'H', 'NN'], optional
+        :param format: csr, coo or dense (numpy array). Defaults to 'csr'.
+        :type format: Literal['csr', 'coo', 'dense'], optional
+
+        :returns: The matrix
+        :rtype: csr_matrix | coo_matrix | ndarray
+
+        :raises ValueError: If matrix or format is not recognized
+        """
+        if format not in ["csr", "coo", "dense"]:
+            raise ValueError(f"{self.name}: format {format} not in csr, coo, dense")
+
+        # rows, columns and values of the entries, in pieces
+        rows: list[ndarray] = []
+        cols: list[ndarray] = []
+        data: list[ndarray] = []
+
+        if matrix in ["A", "G", "H"]:
+            if matrix == "G":
+                kinds = ["leqcons"]
+            elif matrix == "H":
+                kinds = ["eqcons"]
+            else:
+                # .cons() is leqcons + eqcons + nncons
+                kinds = ["leqcons", "eqcons", "nncons"]
+
+            # first row of each partition
+            starts, _n = {}, 0
+            for k in kinds:
+                starts[k] = _n
+                _n += len(self._parts[k])
+            shape = (_n, self.n_variables)
+
+            # each set takes a block in the partitions
+            for at in self._cons_at.values():
+                for k in kinds:
+                    if k not in at:
+                        continue
+                    _rows, _cols, _data = self._block(
+                        self._parts[k][at[k] : at[k] + at["size"]]
+                    )
+                    rows.append(_rows + starts[k] + at[k])
+                    cols.append(_cols)
+                    data.append(_data)
+
+        elif matrix == "F":
+            constraints = self.cons()
+            shape = (len(constraints), self.n_thetas)
+            _rows, _cols, _data = array("q"), array("q"), array("d")
+            for n, c in enumerate(constraints):
+                for z, f in zip(c.Z, c.F):
+                    if z is not None:
+                        _rows.append(n)
+                        _cols.append(z)
+                        _data.append(f)
+            rows.append(npfrombuffer(_rows, dtype=npint64))
+            cols.append(npfrombuffer(_cols, dtype=npint64))
+            data.append(npfrombuffer(_data, dtype=float))
+
+        elif matrix == "NN":
+            shape = (self.n_variables, self.n_variables)
+            # the variables need not be made, the ordinals will do
+            _nn = npisin(
+                self.variables.ordinals, self._parts["nnvars"].ordinals
+            ).nonzero()[0]
+            rows.append(_nn)
+            cols.append(_nn)
+            data.append(npfull(len(_nn), -1.0))
+
+        elif matrix == "B":
+            constraints = self.cons()
+            shape = (len(constraints), 1)
+            _B = nparray([c.B or 0 for c in constraints], dtype=float)
+            _rows = _B.nonzero()[0]
+            rows.append(_rows)
+            cols.append(npzeros(len(_rows), dtype=npint64))
+            data.append(_B[_rows])
+
+        elif matrix == "C":
+            shape = (1, self.n_variables)
+            if self.objectives:
+                # the objective minimized, as in .matrix_form()
+                obj = self.objectives[-1]
+                rows.append(npzeros(len(obj.P), dtype=npint64))
+                cols.append(nparray(obj.P, dtype=npint64))
+                data.append(nparray(obj.C, dtype=float))
+
+        else:
+            raise ValueError(
+                f"{self.name}: matrix {matrix} not in A, B, C, F, G, H, NN"
+            )
+
+        if data:
+            rows, cols, data = (
+                npconcatenate(rows),
+                npconcatenate(cols),
+                npconcatenate(data),
+            )
+        else:
+            rows, cols, data = (
+                npzeros(0, dtype=npint64),
+                npzeros(0, dtype=npint64),
+                npzeros(0),
+            )
+
+        _matrix = coo_matrix((data, (rows, cols)), shape=shape)
+        tracing.count(rows=shape[0], nonzeros=len(data))
+
+        if format == "coo":
+            _matrix.sum_duplicates()
+            return _matrix
+
+        if format == "dense":
+            return _matrix.toarray()
+
+        return _matrix.tocsr()
+
+    @staticmethod
+    def _block(constraints: list[C]) -> tuple[ndarray, ndarray, ndarray]:
+        """
+        Entries of the variable coefficients of constraints (of a set)
+
+        Taken from the blocks (rows x terms) of the function of the set,
+        a row per constraint, skipped variables (position -1) are dropped.
+        If the constraints do not have the same set, or the set has no blocks,
+        each constraint is read instead.
+
+        :param constraints: constraints, as held by the program
+        :type constraints: list[C]
+
+        :returns: rows (from 0), columns and values
+        :rtype: tuple[ndarray, ndarray, ndarray]
+        """
+        parent = constraints[0].parent if constraints else None
+        A = getattr(getattr(parent, "function", None), "A", None)
+        positions = getattr(getattr(parent, "function", None), "positions", None)
+        # the row of each constraint in the blocks, None if not of the set
+        at = [c.pos if c.parent is parent else None for c in constraints]
+
+        if (
+            isinstance(A, ndarray)
+            and isinstance(positions, ndarray)
+            and A.ndim == 2
+            and A.shape == positions.shape
+            and None not in at
+            and max(at) < len(A)
+        ):
+            A, positions = A[at], positions[at]
+            rows, terms = (positions >= 0).nonzero()
+            return rows, positions[rows, terms].astype(npint64), A[rows, terms]
+
+        rows, cols, data = array("q"), array("q"), array("d")
+        for n, c in enumerate(constraints):
+            for x, a in zip(c.P, c.A):
+                if x is not None:
+                    rows.append(n)
+                    cols.append(x)
+                    data.append(a)
+        return (
+            npfrombuffer(rows, dtype=npint64),
+            npfrombuffer(cols, dtype=npint64),
+            npfrombuffer(data, dtype=float),
+        )
 
     @property
     def B(self) -> list[float]:
@@ -1017,30 +1688,12 @@ class Prg:
     @property
     def A(self) -> list[list[float]]:
         """Matrix of Variable coefficients"""
-        constraints = self.cons()
-        _A = []
-        for _ in constraints:
-            row = [0] * len(self.variables)
-            _A.append(row)
-
-        for n, c in enumerate(constraints):
-            for x, a in zip(c.P, c.A):
-                _A[n][x] = a
-        return _A
+        return self.sparse("A", format="dense").tolist()
 
     @property
     def F(self) -> list[list[float]]:
         """Matrix of Parameteric Variable coefficients"""
-        constraints = self.cons()
-        _F = []
-        for _ in constraints:
-            row = [0] * len(self.thetas)
-            _F.append(row)
-
-        for n, c in enumerate(constraints):
-            for z, f in zip(c.Z, c.F):
-                _F[n][z] = f
-        return _F
+        return self.sparse("F", format="dense").tolist()
 
     @property
     def C(self) -> list[float]:  # noqa: C0103
@@ -1052,15 +1705,8 @@ class Prg:
         if not self.objectives:
             return []
 
-        if len(self.objectives) == 1:
-            # only one objective has been set
-            obj = self.objectives[0]
-
-            _C = [0] * len(self.variables)  # initialize with zeros
-            for n, v in enumerate(obj.variables):
-                _C[obj.P[n]] = obj.C[n]
-
-        return _C
+        # the last objective, as in .sparse('C')
+        return self.sparse("C", format="dense")[0].tolist()
 
     @property
     def P(self) -> list[list[int]]:  # noqa: C0103
@@ -1138,14 +1784,7 @@ class Prg:
                 3.73 \cdot \mathbf{v}_0 - 2 \cdot \theta_1 + 21 \leq 0
 
         """
-        _G = [[0] * len(self.variables) for _ in range(len(self.leqcons()))]
-
-        for n, c in enumerate(self.leqcons()):
-            for x, a in zip(c.P, c.A):
-                if x is not None:
-                    _G[n][x] = a
-
-        return _G
+        return self.sparse("G", format="dense").tolist()
 
     @property
     def H(self) -> list[list[float]]:
@@ -1154,12 +1793,7 @@ class Prg:
 
         h = 0
         """
-        _H = [[0] * len(self.variables) for _ in range(len(self.eqcons()))]
-        for n, c in enumerate(self.eqcons()):
-            for x, a in zip(c.P, c.A):
-                if x is not None:
-                    _H[n][x] = a
-        return _H
+        return self.sparse("H", format="dense").tolist()
 
     @property
     def NN(self) -> list[list[float]]:
@@ -1167,7 +1801,7 @@ class Prg:
         _NN = [[0] * len(self.variables) for _ in range(len(self.variables))]
 
         for n, v in enumerate(self.variables):
-            if v in self.nnvars():
+            if v.nn:
                 _NN[n][n] = -1
         return _NN
 
@@ -1209,6 +1843,32 @@ class Prg:
 
         return CrB_
 
+    @staticmethod
+    def sparse_df(
+        matrix: csr_matrix | coo_matrix, columns: list[str], index: list[str]
+    ) -> DataFrame:
+        """
+        Create a DataFrame with sparse columns from a sparse matrix.
+
+        DataFrame.sparse.from_spmatrix fills float columns with nan,
+        the fill value is set to 0 once for the whole frame.
+
+        :param matrix: Sparse matrix
+        :type matrix: csr_matrix | coo_matrix
+        :param columns: Column names
+        :type columns: list[str]
+        :param index: Row names
+        :type index: list[str]
+
+        :return: DataFrame with sparse columns
+        :rtype: DataFrame
+        """
+        from pandas import DataFrame
+
+        return DataFrame.sparse.from_spmatrix(
+            matrix, index=index, columns=columns
+        ).fillna(0.0)
+
     def make_A_df(self, longname: bool = False) -> DataFrame:
         """
         Create a DataFrame from the A matrix.
@@ -1220,13 +1880,13 @@ class Prg:
         :rtype: DataFrame
         """
         if longname:
-            return DataFrame(
-                self.A,
+            return self.sparse_df(
+                self.sparse("A"),
                 columns=[v.longname for v in self.variables],
                 index=[c.longname for c in self.cons()],
             )
-        return DataFrame(
-            self.A,
+        return self.sparse_df(
+            self.sparse("A"),
             columns=[v.name for v in self.variables],
             index=[c.name for c in self.cons()],
         )
@@ -1247,6 +1907,8 @@ class Prg:
         else:
             index = [c.name for c in self.cons()]
 
+        from pandas import DataFrame
+
         return DataFrame(self.B, columns=["RHS"], index=index)
 
     def make_C_df(self, longname: bool = False) -> DataFrame:
@@ -1256,7 +1918,7 @@ class Prg:
         :param longname: Whether to use long names for variables. Defaults to False.
         :type longname: bool
 
-        :return: Single row DataFrame with the objective coefficients.
+        :return: Single row DataFrame with the coefficients of the last objective.
         :rtype: DataFrame
         """
 
@@ -1264,7 +1926,12 @@ class Prg:
             columns = [v.longname for v in self.variables]
         else:
             columns = [v.name for v in self.variables]
-        return DataFrame([self.C], columns=columns, index=["Minimize"])
+        from pandas import DataFrame
+
+        # the objective of .sparse('C'), zeros if none is set
+        return DataFrame(
+            self.sparse("C", format="dense"), columns=columns, index=["Minimize"]
+        )
 
     def make_df(self, longname: bool = False) -> DataFrame:
         """
@@ -1287,14 +1954,17 @@ class Prg:
             columns = [v.name for v in self.variables] + ["RHS"]
             index = ["Minimize"] + [c.name for c in self.cons()]
             columns = [v.name for v in self.variables] + ["RHS"]
-        data = []
-        for n, d in enumerate(self.A):
-            d.append(self.B[n])
-            data.append(d)
-
-        data = [self.C + [0]] + data
+        # [C, 0]
+        # [A, B]
+        data = spbmat(
+            [
+                [self.sparse("C"), None],
+                [self.sparse("A"), self.sparse("B")],
+            ],
+            format="csr",
+        )
 
-        return DataFrame(data, columns=columns, index=index)
+        return self.sparse_df(data, columns=columns, index=index)
 
     def make_CrA_df(self, longname: bool = False) -> DataFrame:
         """Creates a DataFrame from the Critical Region A matrix."""
@@ -1306,6 +1976,8 @@ class Prg:
             columns = [t.name for t in self.thetas]
             index = sum([[t.name] * 2 for t in self.thetas], [])
 
+        from pandas import DataFrame
+
         return DataFrame(self.CrA, columns=columns, index=index)
 
     def make_CrB_df(self, longname: bool = False) -> DataFrame:
@@ -1316,6 +1988,8 @@ class Prg:
         else:
             index = sum([[t.name] * 2 for t in self.thetas], [])
 
+        from pandas import DataFrame
+
         return DataFrame(self.CrB, columns=["RHS"], index=index)
 
     def make_F_df(self, longname: bool = False) -> DataFrame:
@@ -1327,166 +2001,216 @@ class Prg:
             columns = [t.name for t in self.thetas]
             index = [c.name for c in self.cons()]
 
-        return DataFrame(self.F, columns=columns, index=index)
+        return self.sparse_df(
+            self.sparse("F"), columns=columns, index=index
+        )
 
     # --------------------------------------------------
     #               Write
     # --------------------------------------------------
-    @timer(logger, kind='generate-mps', with_return=False)
-    def mps(self, name: str = None):
-        """MPS File"""
+    @timer(logger, kind='generate-mps')
+    def mps(self, name: str = None, free: bool = False, float_format: str = "") -> str:
+        """
+        MPS File
 
-        _name = name or self.name
+        Written from the matrix form (see .matrix_form(), .write_mps()),
+        columns are in the order of .colvars().
+        Files ending in .gz or .bz2 are compressed.
 
-        # 1 unit of whitespace
-        ws = " "
-        # renumber the constraints based on order in .cons()
-        # as opposed to order of declaration
-        self.renumber()
+        :param name: File name, .mps is added if not given (before .gz or .bz2). Defaults to the name of the program.
+        :type name: str, optional
+        :param free: Free MPS, fields are separated by a single space. Defaults to False.
+        :type free: bool, optional
+        :param float_format: Format spec for the coefficients and RHS, e.g. '.12g'. Defaults to '' (str).
+        :type float_format: str, optional
 
-        leqcons = self.leqcons()
-        eqcons = self.eqcons()
-        cntvars = self.cntvars()
-        nnvars = self.nnvars()
-        bnrvars = self.bnrvars()
-        cntbnrvars = self.cntbnrvars()
-        nonbnritgvars = self.nonbnritgvars()
+        :returns: Path to the file
+        :rtype: str
+        """
+
+        return self.write_mps(
+            self.matrix_form(),
+            self.mps_path(name or self.name),
+            name=self.name,
+            free=free,
+            float_format=float_format,
+        )
 
-        # _C = self.C
-        # _A = self.A
+    @staticmethod
+    def mps_path(name: str) -> str:
+        """
+        Path of an MPS file, .mps is added if not given,
+        before the compression suffix (prog.gz -> prog.mps.gz)
 
-        # write the MPS file
-        with open(f"{_name}.mps", "w", encoding="utf-8") as f:
+        :param name: file name
+        :type name: str
 
+        :returns: path to the file
+        :rtype: str
+        """
+        stem, compression = name, ""
+        for suffix in [".gz", ".bz2"]:
+            if name.endswith(suffix):
+                stem, compression = name[: -len(suffix)], suffix
+                break
+        if not stem.endswith(".mps"):
+            stem = f"{stem}.mps"
+        return stem + compression
+
+    @staticmethod
+    @tracing.traced("export")
+    def write_mps(
+        form: dict[str, ndarray | csr_matrix | list[str]],
+        path: str,
+        name: str = "",
+        free: bool = False,
+        float_format: str = "",
+    ) -> str:
+        """
+        Writes the matrix form as an MPS file
+
+        Each section is formatted in chunks of lines and written in one go.
+
+        :param form: see .matrix_form()
+        :type form: dict[str, ndarray | csr_matrix | list[str]]
+        :param path: path to the file, .gz or .bz2 are compressed
+        :type path: str
+        :param name: name of the model. Defaults to ''.
+        :type name: str, optional
+        :param free: Free MPS, fields are separated by a single space. Defaults to False.
+        :type free: bool, optional
+        :param float_format: Format spec for the coefficients and RHS, e.g. '.12g'. Defaults to '' (str).
+        :type float_format: str, optional
+
+        :returns: Path to the file
+        :rtype: str
+        """
+
+        # templates for each kind of line
+        # fixed MPS pads names to 10 characters (at least one space)
+        if free:
+            field = "{} "
+        else:
+            field = "{:<9} "
+
+        row = " {}" + (" " if free else "   ") + "{}\n"
+        entry = (" " if free else "    ") + field * 2 + "{:" + float_format + "}\n"
+        bound = " {} BND1" + (" " if free else "    ") + "{}\n"
+        lbound = " {} BND1" + (" " if free else "    ") + field + "0\n"
+        marker = (
+            " MARK0000 'MARKER' '{}'\n"
+            if free
+            else "    MARK0000  'MARKER'                 '{}'\n"
+        )
+
+        cnames = list(form["rows"])
+        vnames = list(form["cols"])
+        vtype = form["vtype"].tolist()
+        n_leq = int((form["sense"] == "<").sum())
+
+        # A as columns
+        A = form["A"].tocsc()
+        indptr, indices, data = A.indptr.tolist(), A.indices.tolist(), A.data.tolist()
+
+        oname = form["objective"]
+        if oname:
+            obj = [float(a) if a else None for a in form["C"].tolist()]
+        else:
+            obj = [None] * len(vnames)
+
+        def columns(start: int, stop: int):
+            # V_NAME    CONSTRAINT_NAME    COEFFICIENT
+            for j in range(start, stop):
+                vname = vnames[j]
+                for k in range(indptr[j], indptr[j + 1]):
+                    yield entry.format(vname, cnames[indices[k]], data[k])
+                if obj[j] is not None:
+                    yield entry.format(vname, oname, obj[j])
+                elif indptr[j] == indptr[j + 1] and (oname or cnames):
+                    # a column needs an entry to exist
+                    yield entry.format(vname, oname or cnames[0], 0.0)
+
+        def write(f, lines, size: int = 2**16):
+            # joins size lines at a time
+            lines = iter(lines)
+            while chunk := list(islice(lines, size)):
+                f.write("".join(chunk))
+
+        if path.endswith(".gz"):
+            _open = gzopen
+        elif path.endswith(".bz2"):
+            _open = bz2open
+        else:
+            _open = open
+
+        # integer (non binary) variables are at the end, see .colvars()
+        n_itg = vtype.count("I")
+        n_cnt = len(vnames) - n_itg
+
+        with _open(path, "wt", encoding="utf-8") as f:
             # header: NAME          MODEL_NAME
-            f.write(f"NAME{ws*10}{self.name.upper()}\n")
+            f.write(f"NAME{' ' * 10}{name.upper()}\n")
 
             # Here the constraint types are defined
             f.write("ROWS\n")
-
-            if self.objectives:
+            if oname:
                 # the objective is: N   OBJECTIVE_NAME
-                f.write(f"{ws}N{ws*3}{self.objectives[-1].mps()}\n")
-
-            for c in leqcons:
-                # less than or equal constraints are: L   CONSTRAINT_NAME
-                f.write(f"{ws}L{ws*3}{c.mps()}\n")
-
-            for c in eqcons:
-                # equality constraints are: E   CONSTRAINT_NAME
-                f.write(f"{ws}E{ws*3}{c.mps()}\n")
+                f.write(row.format("N", oname))
+            # L   CONSTRAINT_NAME for less than or equal
+            # E   CONSTRAINT_NAME for equality
+            write(f, (row.format("L", c) for c in cnames[:n_leq]))
+            write(f, (row.format("E", c) for c in cnames[n_leq:]))
 
             # Here the variables are defined along with their coefficients
             # in each of the constraints that they feature in
-
             f.write("COLUMNS\n")
-            for v in cntbnrvars:
-                # For each variable, we write:
-                # V_NAME    CONSTRAINT_NAME    COEFFICIENT
-                # for all variables, these are ordered
-                # as they are added based on declaration
-                vs = len(v.mps())
-                # for constraints/functions/objectives that they feature in
-                for c in v.cons_by:
-                    # this captures the length of the variable name
-                    # variable names are just Vn where n is order of precedence
-                    vfs = len(c.mps())
-                    f.write(ws * 4)
-                    f.write(v.mps())
-                    f.write(ws * (10 - vs))
-                    f.write(c.mps())
-                    f.write(ws * (10 - vfs))
-                    # C variable coefficients are a vector
-                    f.write(f"{c.matrix[v.n]}")
-                    f.write("\n")
-
-                for o in v.min_by:
-                    # this captures the length of the variable name
-                    # variable names are just Vn where n is order of precedence
-                    vfs = len(o.mps())
-                    f.write(ws * 4)
-                    f.write(v.mps())
-                    f.write(ws * (10 - vs))
-                    f.write(o.mps())
-                    f.write(ws * (10 - vfs))
-                    f.write(f"{o.function[0].matrix[v.n]}")
-                    f.write("\n")
-
-            if nonbnritgvars:
-                f.write(f"{ws*4}MARK0000{ws*2}'MARKER'{ws*17}'INTORG'\n")
-                for v in nonbnritgvars:
-                    vs = len(v.mps())
-                    # for constraints/functions/objectives that they feature in
-                    for c in v.cons_by:
-                        # this captures the length of the variable name
-                        # variable names are just Vn where n is order of precedence
-                        vfs = len(c.mps())
-                        f.write(ws * 4)
-                        f.write(v.mps())
-                        f.write(ws * (10 - vs))
-                        f.write(c.mps())
-                        f.write(ws * (10 - vfs))
-                        # C variable coefficients are a vector
-                        f.write(f"{c.matrix[v.n]}")
-                        f.write("\n")
-
-                    for o in v.min_by:
-                        # this captures the length of the variable name
-                        # variable names are just Vn where n is order of precedence
-                        vfs = len(o.mps())
-                        f.write(ws * 4)
-                        f.write(v.mps())
-                        f.write(ws * (10 - vs))
-                        f.write(o.mps())
-                        f.write(ws * (10 - vfs))
-
-                        f.write(f"{o.function[0].matrix[v.n]}")
-                        f.write("\n")
-
-                f.write(f"{ws*4}MARK0000{ws*2}'MARKER'{ws*17}'INTEND'\n")
+            write(f, columns(0, n_cnt))
+            if n_itg:
+                f.write(marker.format("INTORG"))
+                write(f, columns(n_cnt, len(vnames)))
+                f.write(marker.format("INTEND"))
 
             # This gives the right-hand side of the constraints
+            # RHS    CONSTRAINT_NAME    RHS_VALUE
             f.write("RHS\n")
-            for n, c in enumerate(leqcons + eqcons):
-                # For each constraint, we write:
-                # RHSn    CONSTRAINT_NAME    RHS_VALUE
-                f.write(ws * 4)
-                f.write(f"R{n}")
-                f.write(ws * (10 - len(f"R{n+1}")))
-                f.write(c.mps())
-                f.write(ws * (10 - len(c.mps())))
-                f.write(f"{c.B}")
-                f.write("\n")
+            write(
+                f,
+                (
+                    entry.format("RHS", cname, b)
+                    for cname, b in zip(cnames, form["B"].tolist())
+                ),
+            )
 
             f.write("BOUNDS\n")
-            # for continuous variables that are nonnegative, we write:
-            # LO BND1    VARIABLE_NAME    0
-            for v in nnvars:
-                if v in cntvars:
-                    f.write(f"{ws}LO{ws}BND1{ws*4}{v.mps()}{ws*8}{0}\n")
-
-            # for integer variables that are binary, we write:
-            # BV BND1    VARIABLE_NAME
-            for v in bnrvars:
-                f.write(f"{ws}BV{ws}BND1{ws*5}{v.mps()}\n")
-
-            for v in nonbnritgvars:
-                vs = len(v.mps())
-                if v.nn:
-                    f.write(f"{ws}LI{ws}BOUND{ws*4}{v.mps()}{ws*(10 - vs)}{0}\n")
-                else:
-                    logger.warning(
-                        "⚠ Some solvers need bounds for integer variables provided explicitly ⚠"
-                    )
-                    logger.warning(
-                        "⚠ This can cause issues when providing unbounded integer variables such as %s ⚠",
-                        v,
-                    )
+
+            def bounds():
+                for t, lb, vname in zip(vtype, form["lb"].tolist(), vnames):
+                    if t == "B":
+                        # BV BND1    VARIABLE_NAME
+                        yield bound.format("BV", vname)
+                    elif lb == -npinf:
+                        # FR BND1    VARIABLE_NAME
+                        yield bound.format("FR", vname)
+                    elif t == "I":
+                        # LI BND1    VARIABLE_NAME    0
+                        yield lbound.format("LI", vname)
+                    else:
+                        # LO BND1    VARIABLE_NAME    0
+                        yield lbound.format("LO", vname)
+
+            write(f, bounds())
 
             # CLOSE the MPS file
             f.write("ENDATA")
 
-        return _name
+        tracing.count(rows=len(cnames), columns=len(vnames), nonzeros=len(data))
+
+        if any(t == "I" and lb == -npinf for t, lb in zip(vtype, form["lb"].tolist())):
+            logger.warning(
+                "⚠ Some solvers need bounds for integer variables provided explicitly ⚠"
+            )
+
+        return path
 
     def lp(self):
         """LP File"""
@@ -1498,19 +2222,74 @@ class Prg:
     # --------------------------------------------------
 
     @timer(logger, kind='optimize', with_return=False)
-    def opt(self, using: str = "gurobi"):
-        """Determine the optimal solution to the program"""
+    def opt(
+        self,
+        using: str = "gurobi",
+        persistent: bool = False,
+        warm_start: int | Literal["last"] | None = None,
+    ):
+        """
+        Determine the optimal solution to the program
+
+        :param using: solver. Defaults to 'gurobi'.
+        :type using: str, optional
+        :param persistent: Reuse the model of the last persistent solve,
+            updated with the changes made since (see .persistent()). Defaults to False.
+        :type persistent: bool, optional
+        :param warm_start: Start from the values of an earlier solution (number),
+            or 'last' for the most recent one, see .set_start(). Defaults to None.
+        :type warm_start: int | Literal['last'] | None, optional
+
+        :raises ValueError: If there is no solution warm_start from opt()
+        """
 
         if using == "gurobi":
-            m = self.gurobi()
+            if persistent:
+                m = self.persistent().model
+                cols = self._persistent.cols
+                columns = [(v, cols[v.n]) for v in self.variables if v.n in cols]
+            else:
+                m = self.gurobi()
+                columns = list(zip(self.colvars(), m.getVars()))
 
-            self.formulations[self.n_formulations] = m
-            self.n_formulations += 1
+                self.formulations[self.n_formulations] = m
+                self.n_formulations += 1
+
+            if warm_start == "last":
+                # most recent feasible
+                if self.sol_types["MIP"]:
+                    self.set_start(m, columns, self.sol_types["MIP"][-1])
 
-            m.optimize()
+            elif warm_start is not None:
+                if warm_start not in self.sol_types["MIP"]:
+                    raise ValueError(
+                        f"{self.name}: no solution {warm_start} from opt() to warm start from"
+                    )
+                self.set_start(m, columns, warm_start)
+
+            with tracing.span("gurobipy optimize", "solve") as _span:
+                m.optimize()
+            if tracing.tracer is not None:
+                _span.count(
+                    rows=m.NumConstrs,
+                    columns=m.NumVars,
+                    nonzeros=m.NumNZs,
+                    iterations=int(m.IterCount),
+                )
             try:
+                # columns are continuous and binary, then integer
+                # values are loaded in the order of the variables
+                values = dict(
+                    zip(
+                        (v.n for v, _ in columns),
+                        m.getAttr("X", [x for _, x in columns]),
+                    )
+                )
+                X = [values.get(v.n, 0.0) for v in self.variables.made() if v.cons_by]
 
-                self._load_values(([v.X for v in m.getVars()], m.ObjVal))
+                self._load_values((X, m.ObjVal))
+                if not m.IsMIP:
+                    self._load_sensitivity(m, columns, persistent=persistent)
                 self.optimized = True
                 self._birth_solution()
 
@@ -1521,6 +2300,121 @@ class Prg:
 
                 return False
 
+    @tracing.traced("solution")
+    def _load_sensitivity(
+        self, m: GPModel, columns: list[tuple[V, GPVar]], persistent: bool = False
+    ):
+        """
+        Loads the duals, reduced costs and sensitivity ranges of an LP solve
+
+        Each attribute is read off the model in one call.
+        Constraint attributes (Pi, Slack, SARHSLow, SARHSUp) are aligned with .cons(),
+        variable attributes (RC, SAObjLow, SAObjUp) with .variables,
+        both are nan where there is no row (nonnegativity) or column.
+        The arrays are given to each constraint and variable set (see C.dual(), V.reduced_cost())
+
+        :param m: solved gurobipy model
+        :type m: GPModel
+        :param columns: variables and their columns in the model
+        :type columns: list[tuple[V, GPVar]]
+        :param persistent: the model is the persistent one. Defaults to False.
+        :type persistent: bool, optional
+        """
+        self.renumber()
+
+        # rows are .leqcons() + .eqcons(), the start of .cons()
+        n_rows = len(self.leqcons()) + len(self.eqcons())
+        if persistent:
+            # rows are kept by slot in .constraints
+            slots = {id(c): k for k, c in enumerate(self.constraints)}
+            rows = [
+                self._persistent.rows[slots[id(c)]] for c in self.cons()[:n_rows]
+            ]
+        else:
+            rows = m.getConstrs()
+
+        cols = npfromiter((v.n for v, _ in columns), dtype=int, count=len(columns))
+        _columns = [x for _, x in columns]
+
+        sensitivity: dict[str, ndarray] = {}
+        for attr in ["Pi", "Slack", "SARHSLow", "SARHSUp"]:
+            sensitivity[attr] = npfull(len(self.cons()), npnan)
+            sensitivity[attr][:n_rows] = m.getAttr(attr, rows)
+        for attr in ["RC", "SAObjLow", "SAObjUp"]:
+            sensitivity[attr] = npfull(self.n_variables, npnan)
+            sensitivity[attr][cols] = m.getAttr(attr, _columns)
+
+        self.sensitivity[self.n_solutions] = sensitivity
+        for s in self.constraint_sets + self.variable_sets:
+            s.sensitivity[self.n_solutions] = sensitivity
+
+    @staticmethod
+    def set_start(m: GPModel, columns: list[tuple[V, GPVar]], n_sol: int):
+        """
+        Sets the values of the variables in a solution as the start of a gurobipy model,
+        MIP start (Start) for MIPs and primal start (PStart) for LPs.
+        Variables without a value in the solution (e.g. added through mutation since)
+        are left undefined.
+
+        :param m: gurobipy model
+        :type m: GPModel
+        :param columns: variables and their columns in the model
+        :type columns: list[tuple[V, GPVar]]
+        :param n_sol: solution number
+        :type n_sol: int
+        """
+        from gurobipy import GRB
+
+        values = []
+        for v, _ in columns:
+            value = v.X.get(n_sol)
+            values.append(GRB.UNDEFINED if value is None else value)
+
+        m.setAttr(
+            "Start" if m.IsMIP else "PStart", [x for _, x in columns], values
+        )
+
+    def sweep(
+        self,
+        scenarios: list,
+        declare: Callable[[Self, Any], None],
+        workers: int = 1,
+        chunksize: int | None = None,
+    ) -> Sweep:
+        """
+        Solves the program for each scenario of a parameter sweep (see sweep.sweep()),
+        the model is compiled once and only the changed rows are sent to the workers
+
+        :param scenarios: scenarios, anything that declare takes
+        :type scenarios: list
+        :param declare: declares the constraint sets that depend on a scenario again
+        :type declare: Callable[[Self, Any], None]
+        :param workers: number of processes. Defaults to 1.
+        :type workers: int, optional
+        :param chunksize: scenarios sent to a worker at a time. Defaults to None.
+        :type chunksize: int | None, optional
+
+        :returns: objective values and variable values of each scenario
+        :rtype: Sweep
+        """
+        from .sweep import sweep as _sweep
+
+        result = _sweep(self, scenarios, declare, workers=workers, chunksize=chunksize)
+
+        self.solutions[self.n_solutions] = result
+        self.sol_types["sweep"].append(self.n_solutions)
+        self.n_solutions += 1
+
+        if result.errors:
+            logger.warning(
+                "🛑 %d of %d scenarios failed, see .errors 🛑",
+                len(result.errors),
+                len(result),
+            )
+
+        return result
+
+    @tracing.traced("solution")
     def _load_values(
         self, sol_and_obj: tuple[list[float], float] | list[list[float], float]
     ):
@@ -1535,13 +2429,19 @@ class Prg:
 
         self.X[self.n_solutions] = sol
 
-        _variables = [v for v in self.variables if v.cons_by]
+        # variables in a constraint have been made
+        _variables = [v for v in self.variables.made() if v.cons_by]
         for v, val in zip(_variables, self.X[self.n_solutions]):
 
             v.X[self.n_solutions] = val
 
-        for c in self.constraint_sets:
-            c.function.solution(n_sol=self.n_solutions)
+        # activity of all constraints in one product
+        # values of the constraint functions are made on demand (see .function_values())
+        x = npzeros(self.n_variables)
+        x[npfromiter((v.n for v in _variables), dtype=int, count=len(_variables))] = sol
+        A, B = self._activity_matrices()
+        self.activities[self.n_solutions] = A @ x - B
+        tracing.count(variables=len(_variables), rows=A.shape[0])
 
         self.objectives[-1].X = obj
 
@@ -1592,6 +2492,7 @@ class Prg:
         round_off: int = 4,
     ):
         """Solve the multiparametric program"""
+        from ppopt.mp_solvers.solve_mpqp import mpqp_algorithm, solve_mpqp
 
         m = self.ppopt()
         self.formulations[self.n_formulations] = m
@@ -1625,14 +2526,17 @@ class Prg:
             #         _v.eval_funcs.setdefault(self.n_sol, {})[n] = _f
 
             self.solutions[self.n_solutions] = sol
-            self.sol_types["mp"].append(self.n_solutions)
-            self.n_solutions += 1
+
+            # index to locate theta points in the critical regions
+            regions = Regions.from_solution(sol)
+            regions.names = [str(v) for v in self.variables]
+            self._birth_regions(regions)
 
         return sol
 
     def eval(
         self, *theta_vals: float, n_sol: int = 0, roundoff: int = 4
-    ) -> list[float]:
+    ) -> dict[V, float] | None:
         """
         Evaluates the variable value as a function of parametric variables
 
@@ -1643,8 +2547,8 @@ class Prg:
         :param roundoff: round off the evaluated value, defaults to 4
         :type roundoff: int, optional
 
-        :returns: list of values
-        :rtype: list[float]
+        :returns: values of the variables, None if the point is not in any critical region
+        :rtype: dict[V, float] | None
 
         :raises ValueError: if number of theta values provided does not match number of thetas in the problem
         """
@@ -1653,9 +2557,18 @@ class Prg:
                 f"Problem has {self.n_thetas} thetas, provided {len(theta_vals)} values",
             )
 
-        _theta_vals = nparray([[v] for v in theta_vals])
-        sol = self.solutions[n_sol].evaluate(_theta_vals)
-        sol = [round(float(val[0]), roundoff) for val in sol]
+        regions = self.regions[n_sol]
+        _theta_vals = nparray(theta_vals, dtype=float)
+        region = regions.locate(_theta_vals)
+        if region < 0:
+            logger.warning(
+                "⛔ %s is not in any critical region of solution %s ⛔",
+                theta_vals,
+                n_sol,
+            )
+            return None
+        sol = regions.evaluate(_theta_vals, region)
+        sol = [round(float(val), roundoff) for val in sol]
 
         self.evaluation.setdefault(n_sol, {})
         self.n_evaluation.setdefault(n_sol, 0)
@@ -1671,17 +2584,204 @@ class Prg:
 
         return {v: sol[i] for i, v in enumerate(self.variables)}
 
-    def lb(self, function: V | Func):
+    def eval_batch(
+        self,
+        thetas: ndarray,
+        n_sol: int = 0,
+        roundoff: int | None = None,
+        store: bool = False,
+        chunk: int = 2**14,
+    ) -> tuple[ndarray, ndarray]:
+        """
+        Evaluates the variable values at a batch of theta points
+
+        The points are located in the critical regions a chunk at a time,
+        the inequalities (E theta <= f) of all regions are stacked and checked with one matrix product.
+        The points in each region are then evaluated together (x = A theta + b).
+
+        :param thetas: theta points, a row each (n_points x n_thetas)
+        :type thetas: ndarray
+        :param n_sol: solution number. Defaults to 0.
+        :type n_sol: int, optional
+        :param roundoff: round off the evaluated values. Defaults to None.
+        :type roundoff: int | None, optional
+        :param store: also keep the values in .evaluation and in each variable, as .eval() does. Defaults to False.
+        :type store: bool, optional
+        :param chunk: number of points located at a time. Defaults to 2**14.
+        :type chunk: int, optional
+
+        :returns: values of the variables (n_points x n_variables, nan outside the regions)
+            and the critical region of each point (-1 if outside)
+        :rtype: tuple[ndarray, ndarray]
+
+        :raises ValueError: if number of theta values in a point does not match number of thetas in the problem
+        """
+        thetas = npasarray(thetas, dtype=float)
+        if thetas.ndim == 1:
+            thetas = thetas.reshape(-1, self.n_thetas)
+        if thetas.ndim != 2 or thetas.shape[1] != self.n_thetas:
+            raise ValueError(
+                f"Problem has {self.n_thetas} thetas, provided points of shape {thetas.shape}",
+            )
+
+        regions = self.regions[n_sol]
+        region = npfull(thetas.shape[0], -1, dtype=int)
+        for start in range(0, thetas.shape[0], chunk):
+            region[start : start + chunk] = regions.locate_batch(
+                thetas[start : start + chunk]
+            )
+        X = regions.evaluate_batch(thetas, region)
+
+        if roundoff is not None:
+            X = npround(X, roundoff)
+
+        if store:
+            self.evaluation.setdefault(n_sol, {})
+            self.n_evaluation.setdefault(n_sol, 0)
+            for v in self.variables:
+                v.evaluation.setdefault(n_sol, {})
+
+            for theta, x, r in zip(thetas, X, region):
+                if r < 0:
+                    continue
+                theta_vals = tuple(float(t) for t in theta)
+                sol_ = [float(val) for val in x]
+                self.evaluation[n_sol][theta_vals] = sol_
+                for v, val in zip(self.variables, sol_):
+                    v.evaluation[n_sol][theta_vals] = val
+                self.n_evaluation[n_sol] += 1
+
+        return X, region
+
+    def _birth_regions(self, regions: Regions):
+        """
+        Keeps the index over the critical regions of a new multiparametric solution,
+        points are located through it (see .eval() and .eval_batch())
+
+        :param regions: index over the critical regions
+        :type regions: Regions
+        """
+        self.solutions.setdefault(self.n_solutions, regions)
+        self.sol_types["mp"].append(self.n_solutions)
+        self.regions[self.n_solutions] = regions
+        self.n_solutions += 1
+
+    @timer(logger, kind='save')
+    def save_mp_solution(
+        self,
+        path: str,
+        n_sol: int | None = None,
+        float32: bool = False,
+        compress: bool = False,
+    ) -> str:
+        """
+        Saves a multiparametric solution (its index over the critical regions) as an .npz archive,
+        see Regions.save()
+
+        :param path: path to the archive, .npz is added if missing
+        :type path: str
+        :param n_sol: solution number. Defaults to the latest multiparametric solution.
+        :type n_sol: int | None, optional
+        :param float32: keep the region matrices as float32. Defaults to False.
+        :type float32: bool, optional
+        :param compress: compress the archive (it cannot be memory-mapped then). Defaults to False.
+        :type compress: bool, optional
+
+        :returns: path to the archive
+        :rtype: str
+
+        :raises ValueError: If there is no multiparametric solution
+        """
+        if n_sol is None:
+            if not self.sol_types["mp"]:
+                raise ValueError(f"{self.name}: no multiparametric solution to save")
+            n_sol = self.sol_types["mp"][-1]
+
+        if n_sol not in self.regions:
+            raise ValueError(f"{self.name}: solution {n_sol} is not multiparametric")
+
+        return self.regions[n_sol].save(path, float32=float32, compress=compress)
+
+    @timer(logger, kind='load')
+    def load_mp_solution(self, path: str, mmap: bool = True) -> Regions:
+        """
+        Loads a multiparametric solution saved with .save_mp_solution() as a new solution,
+        nothing is solved again. The variables of the program need to be those of the solution.
+
+        The critical regions are only kept as their index (Regions),
+        ppopt Solution features (e.g. plots) need the solution from .solve()
+
+        :param path: path to the archive
+        :type path: str
+        :param mmap: memory-map the arrays (read only). Defaults to True.
+        :type mmap: bool, optional
+
+        :returns: index over the critical regions
+        :rtype: Regions
+
+        :raises ValueError: If the variables or thetas of the program differ from those of the solution
+        """
+        regions = Regions.load(path, mmap=mmap)
+
+        names = [str(v) for v in self.variables]
+        if regions.names and regions.names != names:
+            raise ValueError(
+                f"{self.name}: solution in {path} is for variables {regions.names}, program has {names}"
+            )
+        if regions.A.shape[1:] != (len(self.variables), self.n_thetas):
+            raise ValueError(
+                f"{self.name}: solution in {path} has {regions.A.shape[1]} variables and {regions.A.shape[2]} thetas,"
+                f" program has {len(self.variables)} and {self.n_thetas}"
+            )
+
+        self._birth_regions(regions)
+        return regions
+
+    @timer(logger, kind='save')
+    def save(self, path: str, compress: bool = False) -> str:
+        """
+        Saves the compiled program (see Compiled) as an .npz archive:
+        index sets, variable sets, the matrix form (sparse A, B, C, bounds, types),
+        theta coefficients and bounds, and the names of the rows and columns
+
+        :param path: path to the archive, .npz is added if missing
+        :type path: str
+        :param compress: compress the archive (it cannot be memory-mapped then). Defaults to False.
+        :type compress: bool, optional
+
+        :returns: path to the archive
+        :rtype: str
+        """
+        return Compiled.from_program(self).save(path, compress=compress)
+
+    @staticmethod
+    @timer(logger, kind='load')
+    def load(path: str, mmap: bool = True) -> Compiled:
+        """
+        Loads a program saved with .save(), nothing is declared again.
+        The loaded program can be written (.mps()) and solved (.opt())
+
+        :param path: path to the archive
+        :type path: str
+        :param mmap: memory-map the arrays (read only). Defaults to True.
+        :type mmap: bool, optional
+
+        :returns: the program as arrays
+        :rtype: Compiled
+        """
+        return Compiled.load(path, mmap=mmap)
+
+    def lb(self, function: V | Func, persistent: bool = False):
         """Finds the lower bound of a variable or function"""
         # set the objective to minimizing the variable
         setattr(self, f"min({function})", inf(function))
-        self.opt()
+        self.opt(persistent=persistent)
 
-    def ub(self, function: V | Func):
+    def ub(self, function: V | Func, persistent: bool = False):
         """Finds the upper bound of a variable or function"""
         # set the objective to maximizing the variable
         setattr(self, f"max({function})", sup(function))
-        self.opt()
+        self.opt(persistent=persistent)
 
     def obj(self):
         """Objective Values"""
@@ -1689,9 +2789,116 @@ class Prg:
             return self.objectives[0].X
         return {o: o.X for o in self.objectives}
 
-    # def slack(self):
-    #     """Slack in each constraint"""
-    #     return {c: c._ for c in self.leqcons()}
+    def _activity_matrices(self) -> tuple[csr_matrix, ndarray]:
+        """A and B over .cons(), made again only if the constraints have changed"""
+        constraints = self.cons()
+        if self._activity_form is None or self._activity_form[0] is not constraints:
+            self._activity_form = (
+                constraints,
+                self.sparse("A"),
+                self.sparse("B", format="dense").ravel(),
+            )
+        return self._activity_form[1], self._activity_form[2]
+
+    def activity(self, n_sol: int | None = None) -> ndarray:
+        """
+        Activity (A x - B) of each constraint,
+        in the order of .cons() (leq, eq, nn)
+
+        :param n_sol: solution number. Defaults to the last solution.
+        :type n_sol: int | None, optional
+
+        :returns: value of the function of each constraint
+        :rtype: ndarray
+
+        :raises ValueError: If there is no such solution
+        """
+        if n_sol is None:
+            if not self.activities:
+                raise ValueError(f"{self.name}: Use .opt() to generate solution")
+            n_sol = max(self.activities)
+        if n_sol not in self.activities:
+            raise ValueError(f"{self.name}: no activities for solution {n_sol}")
+        return self.activities[n_sol]
+
+    def slack(self, n_sol: int | None = None) -> ndarray:
+        """
+        Slack (B - A x) in each constraint, in the order of .cons()
+
+        :param n_sol: solution number. Defaults to the last solution.
+        :type n_sol: int | None, optional
+
+        :returns: slack of each constraint
+        :rtype: ndarray
+        """
+        return -self.activity(n_sol)
+
+    def binding(self, n_sol: int | None = None, tol: float = 1e-6) -> ndarray:
+        """
+        Whether each constraint is binding (|A x - B| <= tol), in the order of .cons()
+
+        :param n_sol: solution number. Defaults to the last solution.
+        :type n_sol: int | None, optional
+        :param tol: tolerance. Defaults to 1e-6.
+        :type tol: float, optional
+
+        :returns: binding flag of each constraint
+        :rtype: ndarray
+        """
+        return npabs(self.activity(n_sol)) <= tol
+
+    def violation(self, n_sol: int | None = None) -> ndarray:
+        """
+        Violation of each constraint, in the order of .cons()
+        max(A x - B, 0) for inequalities and |A x - B| for equalities
+
+        :param n_sol: solution number. Defaults to the last solution.
+        :type n_sol: int | None, optional
+
+        :returns: violation of each constraint
+        :rtype: ndarray
+        """
+        activity = self.activity(n_sol)
+        violation = npmaximum(activity, 0.0)
+        # equalities follow the inequalities in .cons()
+        start = len(self.leqcons())
+        end = start + len(self.eqcons())
+        violation[start:end] = npabs(activity[start:end])
+        return violation
+
+    def max_violation(self, n_sol: int | None = None) -> dict[str, float]:
+        """
+        Largest violation of the constraints in each category
+
+        :param n_sol: solution number. Defaults to the last solution.
+        :type n_sol: int | None, optional
+
+        :returns: largest violation by category
+        :rtype: dict[str, float]
+        """
+        violation = self.violation(n_sol)
+        categories = nparray(
+            [
+                c.parent.category if c.parent is not None else c.category
+                for c in self.cons()
+            ]
+        )
+        return {
+            category: float(violation[categories == category].max())
+            for category in dict.fromkeys(categories.tolist())
+        }
+
+    def function_values(self, n_sol: int | None = None):
+        """
+        Sets the values (X) of the constraint functions from the activities
+
+        :param n_sol: solution number. Defaults to the last solution.
+        :type n_sol: int | None, optional
+        """
+        if n_sol is None:
+            n_sol = max(self.activities, default=0)
+        for c, val in zip(self.cons(), self.activity(n_sol).tolist()):
+            c.function.X[n_sol] = val
 
     def output(self, n_sol: int = 0, slack: bool = True, compare=False):
         """Print sol"""
@@ -1712,18 +2919,29 @@ class Prg:
         for v in self.variable_sets:
             v.output(n_sol=n_sol, compare=compare)
 
-        # if slack:
-        #     display(Markdown("<br><br>"))
-        #     display(Markdown(r"## Constraint Slack"))
-        #     for c in self.leqcons():
-        #         c.output(n_sol=n_sol, compare=compare)
+        if slack:
+            for n in self.activities if compare else [n_sol]:
+                if n in self.activities:
+                    self.function_values(n)
+            display(Markdown("<br><br>"))
+            display(Markdown(r"## Constraint Slack"))
+            for c in self.leqcons_sets:
+                c.output(n_sol=n_sol, compare=compare)
 
     @timer(logger, kind='generate-solution', with_return=False)
     def _birth_solution(self):
         """Makes a solution object for the program"""
 
         _solution = Solution(self.name + "_solution_" + str(self.n_solutions))
-        _solution.update(self.variables, n_sol=self.n_solutions)
+        # values as loaded by _load_values, unconstrained variables do not have any
+        values = npfull(len(self.variables), npnan)
+        values[
+            npisin(
+                self.variables.ordinals,
+                [v.n for v in self.variables.made() if v.cons_by],
+            )
+        ] = self.X[self.n_solutions]
+        _solution.update(self.variables, n_sol=self.n_solutions, values=values)
 
         self.solutions[self.n_solutions] = _solution
         self.sol_types["MIP"].append(self.n_solutions)
@@ -1963,6 +3181,12 @@ class Prg:
         if n_sol in self.sol_types["MIP"]:
             self.solutions[n_sol].draw(variable)
         elif n_sol in self.sol_types["mp"]:
+            if isinstance(self.solutions[n_sol], Regions):
+                raise ValueError(
+                    f"Solution {n_sol} was loaded (see .load_mp_solution()), solve() again to plot"
+                )
+            from ppopt.plot import parametric_plot
+
             parametric_plot(self.solutions[n_sol])
         else:
             raise ValueError(f"Solution {n_sol} not found")
@@ -2026,6 +3250,7 @@ class Prg:
     #                    Export
     # -----------------------------------------------------
 
+    @tracing.traced("export")
     def ppopt(self) -> MPLP_Program:
         """Convert the program to a ppopt.MPLP_Program"""
 
@@ -2037,21 +3262,25 @@ class Prg:
         # F is the matrix of theta coefficients (including nn constraints)
         # H are the parameteric objective coefficients
 
-        _A = self.A
-        _NN = self.NN
-        _B = self.B
-        _C = self.C
+        from ppopt.mplp_program import MPLP_Program
+
         _CrA = self.CrA
         _CrB = self.CrB
-        _F = self.F
 
         _mplp = MPLP_Program(
-            A=nparray(_A + _NN),
-            b=nparray([[i] for i in _B] + [[0]] * self.n_variables),
-            c=nparray([[i] for i in _C]),
+            A=spvstack([self.sparse("A"), self.sparse("NN")]).toarray(),
+            b=npvstack(
+                [self.sparse("B", format="dense"), npzeros((self.n_variables, 1))]
+            ),
+            c=self.sparse("C", format="dense").T,
             A_t=nparray(_CrA),
             b_t=nparray([[i] for i in _CrB]),
-            F=nparray(_F + [[0] * self.n_thetas] * self.n_variables),
+            F=npvstack(
+                [
+                    self.sparse("F", format="dense"),
+                    npzeros((self.n_variables, self.n_thetas)),
+                ]
+            ),
             H=npzeros((self.n_variables, self.n_thetas)),
             equality_indices=[c.n for c in self.cons() if c.eq],
         )
@@ -2060,12 +3289,138 @@ class Prg:
 
         return _mplp
 
+    def persistent(self) -> Persistent:
+        """
+        Persistent gurobipy model
+
+        Made (and added to .formulations) on the first call.
+        On later calls, only the changes made to the program since
+        (new or replaced constraints, new variables, a new objective)
+        are pushed to the model.
+
+        :returns: Persistent model, the gurobipy model is .model
+        :rtype: Persistent
+        """
+        if self._persistent is None:
+            from .persistent import Persistent
+
+            self._persistent = Persistent(self)
+            self.formulations[self.n_formulations] = self._persistent.model
+            self.n_formulations += 1
+        else:
+            self._persistent.update()
+        return self._persistent
+
     @timer(logger, kind='generate-gurobi')
-    def gurobi(self) -> GPModel:
-        """Gurobi Model"""
+    def gurobi(self, using: Literal["matrix", "mps"] = "matrix") -> GPModel:
+        """
+        Gurobi Model
+
+        The matrix form is fed to gurobipy (addMVar/addMConstr)
+        straight from the coefficients of the constraints.
+        The mps form writes the .mps file and reads it back.
+        Both have the same rows, columns and names.
+
+        :param using: matrix or mps. Defaults to 'matrix'.
+        :type using: Literal['matrix', 'mps'], optional
+
+        :returns: Gurobi model
+        :rtype: GPModel
+
+        :raises ValueError: If using is not matrix or mps
+        """
+
+        if using == "mps":
+            from gurobipy import read as gpread
+
+            return gpread(self.mps())
+
+        if using != "matrix":
+            raise ValueError(f"{self.name}: using {using} not in matrix, mps")
+
+        return self.gurobi_model(self.matrix_form(), self.name)
+
+    @tracing.traced("export")
+    def matrix_form(self) -> dict[str, ndarray | csr_matrix | list[str]]:
+        """
+        The program as arrays, as fed to gurobipy
+
+        Rows are .leqcons() + .eqcons(), nonnegativity is given as a bound.
+        Columns are .colvars().
+
+        :returns: A (csr), B, sense, C, lb, ub, vtype and the names of rows, columns and objective
+        :rtype: dict[str, ndarray | csr_matrix | list[str]]
+        """
+        self.renumber()
+
+        leqcons = self.leqcons()
+        eqcons = self.eqcons()
+        constraints = leqcons + eqcons
+
+        # columns in the order written to the MPS file
+        variables = self.colvars()
+
+        # rows of .cons() are leq, eq, nn
+        A = self.sparse("A")[: len(constraints)][
+            :, nparray([v.n for v in variables], dtype=int)
+        ]
+
+        if self.objectives:
+            # the last objective set is the one minimized
+            _matrix = self.objectives[-1].function[0].matrix
+            obj = nparray([_matrix.get(v.n, 0.0) for v in variables], dtype=float)
+        else:
+            obj = npzeros(len(variables))
+
+        tracing.count(rows=A.shape[0], columns=A.shape[1], nonzeros=A.nnz)
+
+        return {
+            "A": A,
+            "B": nparray([c.B or 0.0 for c in constraints], dtype=float),
+            "sense": nparray(["<"] * len(leqcons) + ["="] * len(eqcons)),
+            "C": obj,
+            "lb": nparray([0.0 if v.nn else -npinf for v in variables]),
+            "ub": nparray([1.0 if v.bnr else npinf for v in variables]),
+            "vtype": nparray(
+                ["B" if v.bnr else "I" if v.itg else "C" for v in variables]
+            ),
+            "rows": [c.mps() for c in constraints],
+            "cols": [v.mps() for v in variables],
+            "objective": self.objectives[-1].mps() if self.objectives else None,
+        }
+
+    @staticmethod
+    @tracing.traced("export")
+    def gurobi_model(form: dict[str, ndarray | csr_matrix | list[str]], name: str = "") -> GPModel:
+        """
+        Gurobi Model from the matrix form
+
+        :param form: see .matrix_form()
+        :type form: dict[str, ndarray | csr_matrix | list[str]]
+        :param name: name of the model. Defaults to ''.
+        :type name: str, optional
+
+        :returns: Gurobi model
+        :rtype: GPModel
+        """
+        from gurobipy import Model as GPModel
+
+        m = GPModel(name)
+        x = m.addMVar(
+            len(form["cols"]),
+            lb=form["lb"],
+            ub=form["ub"],
+            obj=form["C"],
+            vtype=form["vtype"],
+            name=form["cols"],
+        )
+
+        if form["rows"]:
+            m.addMConstr(form["A"], x, form["sense"], form["B"], name=form["rows"])
 
-        self.mps()
-        return gpread(f"{self}.mps")
+        m.update()
+        tracing.count(rows=m.NumConstrs, columns=m.NumVars, nonzeros=m.NumNZs)
+        return m
 
     # def pyomo(self):
     #     """Pyomo Model"""
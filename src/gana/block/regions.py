@@ -0,0 +1,683 @@
+"""Point Location over Critical Regions"""
+
+from __future__ import annotations
+
+from itertools import product
+from math import ceil, floor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from numpy import abs as npabs
+from numpy import arange as nparange
+from numpy import array as nparray
+from numpy import argsort as npargsort
+from numpy import asarray as npasarray
+from numpy import column_stack as npcolumn_stack
+from numpy import concatenate as npconcatenate
+from numpy import cumsum as npcumsum
+from numpy import diff as npdiff
+from numpy import einsum as npeinsum
+from numpy import floor as npfloor
+from numpy import full as npfull
+from numpy import inf as npinf
+from numpy import isfinite as npisfinite
+from numpy import logical_and as nplogical_and
+from numpy import nan as npnan
+from numpy import ndarray
+from numpy import ravel_multi_index as npravel_multi_index
+from numpy import repeat as nprepeat
+from numpy import round as npround
+from numpy import savez as npsavez
+from numpy import savez_compressed as npsavez_compressed
+from numpy import searchsorted as npsearchsorted
+from numpy import sign as npsign
+from numpy import unique as npunique
+from numpy import vstack as npvstack
+from numpy import where as npwhere
+from numpy import zeros as npzeros
+from scipy.sparse import block_diag as spblock_diag
+from scipy.sparse import csr_matrix
+from scipy.sparse import vstack as spvstack
+
+from ..utils.npz import load as npzload
+
+if TYPE_CHECKING:
+    from ppopt.solution import Solution as MPSolution
+
+
+class Regions:
+    """
+    Index to locate theta points in the critical regions of a multiparametric solution
+
+    Each region (E theta <= f) is bounded by a box, the boxes are binned
+    on a uniform grid over the theta space.
+    A point is only checked (exactly, against the facets) for the regions
+    whose boxes overlap the cell it falls in.
+
+    Within a region, x = A theta + b.
+    Where regions overlap, the one with the lowest objective is taken,
+    otherwise the first region (lowest number) that has the point.
+
+    :param E: facets of the regions, stacked
+    :type E: ndarray
+    :param f: RHS of the facets, stacked
+    :type f: ndarray
+    :param starts: first facet of each region
+    :type starts: ndarray
+    :param A: theta coefficients of x in each region (regions x variables x thetas)
+    :type A: ndarray
+    :param b: constants of x in each region (regions x variables)
+    :type b: ndarray
+    :param lo: lower corner of the box of each region (regions x thetas), see .boxes()
+    :type lo: ndarray
+    :param hi: upper corner of the box of each region (regions x thetas)
+    :type hi: ndarray
+    :param tol: point location tolerance. Defaults to 1e-5.
+    :type tol: float, optional
+    :param overlapping: whether regions overlap. Defaults to False.
+    :type overlapping: bool, optional
+    :param objective: (H, c, Q) of the objective x'Q x/2 + theta'H'x + c'x,
+        needed if regions overlap. Defaults to None.
+    :type objective: tuple[ndarray, ndarray, ndarray | None] | None, optional
+    :param cells: maximum number of cells in the grid. Defaults to 2**20.
+    :type cells: int, optional
+    """
+
+    def __init__(
+        self,
+        E: ndarray,
+        f: ndarray,
+        starts: ndarray,
+        A: ndarray,
+        b: ndarray,
+        lo: ndarray,
+        hi: ndarray,
+        tol: float = 1e-5,
+        overlapping: bool = False,
+        objective: tuple[ndarray, ndarray, ndarray | None] | None = None,
+        cells: int = 2**20,
+    ):
+        self.E = E
+        self.f = f
+        self.starts = starts
+        self.A = A
+        self.b = b
+        self.lo = lo
+        self.hi = hi
+        self.tol = tol
+        self.overlapping = overlapping
+        self.objective = objective
+
+        # names of the variables (columns of x), if known
+        self.names: list[str] = []
+
+        self.grid(cells)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __repr__(self):
+        return f"{len(self)} critical regions"
+
+    @classmethod
+    def from_solution(cls, solution: MPSolution, cells: int = 2**20) -> Regions:
+        """
+        Indexes the critical regions of a ppopt solution
+
+        :param solution: multiparametric solution
+        :type solution: MPSolution
+        :param cells: maximum number of cells in the grid. Defaults to 2**20.
+        :type cells: int, optional
+
+        :returns: index over the critical regions
+        :rtype: Regions
+        """
+        program = solution.program
+        regions = solution.critical_regions
+        m = program.num_t()
+
+        if not regions:
+            return cls(
+                E=npzeros((0, m)),
+                f=npzeros(0),
+                starts=npzeros(0, dtype=int),
+                A=npzeros((0, program.num_x(), m)),
+                b=npzeros((0, program.num_x())),
+                lo=npzeros((0, m)),
+                hi=npzeros((0, m)),
+                tol=solution.point_location_tolerance,
+                overlapping=solution.is_overlapping,
+                cells=cells,
+            )
+
+        E = npvstack([cr.E for cr in regions])
+        f = npvstack([cr.f for cr in regions]).ravel()
+        starts = npcumsum([0] + [cr.E.shape[0] for cr in regions[:-1]])
+
+        # x = A theta + b for all variables (binaries are fixed in MILP regions)
+        n_x = max(
+            (
+                cr.A.shape[0]
+                if cr.y_fixation is None
+                else len(cr.x_indices) + len(cr.y_indices)
+            )
+            for cr in regions
+        )
+        A = npzeros((len(regions), n_x, m))
+        b = npzeros((len(regions), n_x))
+        for n, cr in enumerate(regions):
+            if cr.y_fixation is None:
+                A[n] = cr.A
+                b[n] = cr.b.ravel()
+            else:
+                A[n, cr.x_indices] = cr.A
+                b[n, cr.x_indices] = cr.b.ravel()
+                b[n, cr.y_indices] = npasarray(cr.y_fixation).ravel()
+
+        lo, hi = cls.boxes(
+            [cr.E for cr in regions],
+            [cr.f.ravel() for cr in regions],
+            program.A_t,
+            program.b_t.ravel(),
+            tol=solution.point_location_tolerance,
+        )
+
+        objective = None
+        if solution.is_overlapping:
+            objective = (program.H, program.c.ravel(), getattr(program, "Q", None))
+
+        return cls(
+            E=E,
+            f=f,
+            starts=starts,
+            A=A,
+            b=b,
+            lo=lo,
+            hi=hi,
+            tol=solution.point_location_tolerance,
+            overlapping=solution.is_overlapping,
+            objective=objective,
+            cells=cells,
+        )
+
+    @staticmethod
+    def share(E: ndarray, f: ndarray, decimals: int = 10) -> tuple[ndarray, ndarray]:
+        """
+        Facets shared by regions
+
+        Neighbouring regions share a facet with opposite signs (E theta <= f, -E theta <= -f).
+        Facets are signed so that the first nonzero coefficient is positive,
+        and facets that are the same to a number of decimals are kept once.
+
+        :param E: facets, stacked
+        :type E: ndarray
+        :param f: RHS of the facets, stacked
+        :type f: ndarray
+        :param decimals: decimals to which facets are compared. Defaults to 10.
+        :type decimals: int, optional
+
+        :returns: unique facets with their RHS as the last column,
+            and for each facet its position in them (from 1), negative if flipped
+        :rtype: tuple[ndarray, ndarray]
+        """
+        Ef = npcolumn_stack([E, f])
+        if not len(Ef):
+            return Ef, npzeros(0, dtype=int)
+
+        sign = npsign(Ef[nparange(len(Ef)), (Ef != 0).argmax(axis=1)])
+        sign[sign == 0] = 1
+        Ef = Ef * sign[:, None]
+
+        # + 0.0 makes -0.0 and 0.0 the same
+        _, first, position = npunique(
+            npround(Ef, decimals) + 0.0, axis=0, return_index=True, return_inverse=True
+        )
+        return Ef[first], (position.ravel() + 1) * sign.astype(int)
+
+    def save(self, path: str | Path, float32: bool = False, compress: bool = False) -> str:
+        """
+        Saves the index as an .npz archive
+
+        Regions are stacked (with the first facet of each region in .starts),
+        shared facets are kept once (see .share()),
+        and the grid is saved as is, so that loading does not solve any LPs.
+
+        :param path: path to the archive, .npz is added if missing
+        :type path: str | Path
+        :param float32: keep facets, boxes and x = A theta + b as float32, halves the size. Defaults to False.
+        :type float32: bool, optional
+        :param compress: compress the archive, compressed arrays are not memory-mapped on loading. Defaults to False.
+        :type compress: bool, optional
+
+        :returns: path to the archive
+        :rtype: str
+        """
+        path = str(path)
+        if not path.endswith(".npz"):
+            path += ".npz"
+
+        dtype = "float32" if float32 else "float64"
+        # indices are kept as int32 where they fit
+        index = "int32" if max(len(self.f), len(self.cell_regions)) < 2**31 else "int64"
+
+        facets, refs = self.share(self.E, self.f)
+
+        arrays = {
+            "version": nparray(1),
+            "tol": nparray(self.tol),
+            "overlapping": nparray(self.overlapping),
+            "bounded": nparray(self.bounded),
+            "facets": facets.astype(dtype),
+            "refs": refs.astype(index),
+            "starts": npasarray(self.starts).astype(index),
+            "A": self.A.astype(dtype),
+            "b": self.b.astype(dtype),
+            "lo": self.lo.astype(dtype),
+            "hi": self.hi.astype(dtype),
+            "origin": npasarray(self.origin, dtype=float),
+            "width": npasarray(self.width, dtype=float),
+            "shape": nparray(self.shape, dtype="int64"),
+            "cell_regions": self.cell_regions.astype(index),
+            "cell_starts": self.cell_starts.astype(index),
+            "names": nparray(self.names, dtype=str),
+        }
+        if self.objective is not None:
+            H, c, Q = self.objective
+            arrays["H"], arrays["c"] = H, c
+            if Q is not None:
+                arrays["Q"] = Q
+
+        (npsavez_compressed if compress else npsavez)(path, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = True) -> Regions:
+        """
+        Loads an index saved with .save()
+
+        :param path: path to the archive
+        :type path: str | Path
+        :param mmap: memory-map the arrays (read only). Defaults to True.
+        :type mmap: bool, optional
+
+        :returns: index over the critical regions
+        :rtype: Regions
+        """
+        arrays = npzload(path, mmap=mmap)
+
+        regions = cls.__new__(cls)
+
+        # facets of each region, flipped back
+        refs = npasarray(arrays["refs"])
+        facets = npasarray(arrays["facets"])
+        m = facets.shape[1] - 1
+        Ef = facets[npabs(refs) - 1] * npsign(refs)[:, None]
+        regions.E = Ef[:, :m].reshape(-1, m)
+        regions.f = Ef[:, m].ravel()
+
+        regions.starts = arrays["starts"]
+        regions.A = arrays["A"]
+        regions.b = arrays["b"]
+        regions.lo = arrays["lo"]
+        regions.hi = arrays["hi"]
+        regions.tol = float(arrays["tol"])
+        regions.overlapping = bool(arrays["overlapping"])
+        regions.bounded = bool(arrays["bounded"])
+        regions.objective = None
+        if "H" in arrays:
+            regions.objective = (arrays["H"], arrays["c"], arrays.get("Q"))
+        regions.names = [str(name) for name in arrays["names"]]
+
+        regions.origin = npasarray(arrays["origin"])
+        regions.width = npasarray(arrays["width"])
+        regions.shape = tuple(int(k) for k in arrays["shape"])
+        regions.cell_regions = arrays["cell_regions"]
+        regions.cell_starts = arrays["cell_starts"]
+        regions.stack()
+
+        return regions
+
+    @staticmethod
+    def boxes(
+        E: list[ndarray],
+        f: list[ndarray],
+        A_t: ndarray,
+        b_t: ndarray,
+        tol: float = 0.0,
+    ) -> tuple[ndarray, ndarray]:
+        """
+        Bounding boxes of regions within the theta space (A_t theta <= b_t)
+
+        Points within tolerance of a facet are in a region (E theta - f < tol),
+        so the boxes are of the regions grown by the tolerance (E theta <= f + tol).
+
+        The LPs of all regions are independent, so one (block diagonal) LP
+        is solved for each bound of each theta.
+        If that fails (e.g. an empty region), each region is bounded on its own,
+        and the theta space is taken for regions that cannot be bounded.
+
+        :param E: facets of each region
+        :type E: list[ndarray]
+        :param f: RHS of the facets of each region
+        :type f: list[ndarray]
+        :param A_t: theta space
+        :type A_t: ndarray
+        :param b_t: theta space RHS
+        :type b_t: ndarray
+        :param tol: point location tolerance. Defaults to 0.0.
+        :type tol: float, optional
+
+        :returns: lower and upper corners of the boxes (regions x thetas)
+        :rtype: tuple[ndarray, ndarray]
+        """
+        from scipy.optimize import linprog
+
+        m = A_t.shape[1]
+        n = len(E)
+        f = [_f + tol for _f in f]
+        b_t = b_t + tol
+
+        def bound(A_ub: csr_matrix, b_ub: ndarray, k: int, d: int, sign: float):
+            # min (or max) theta_d over k copies of the theta space
+            c = npzeros(k * m)
+            c[d::m] = sign
+            res = linprog(
+                c, A_ub=A_ub, b_ub=b_ub, bounds=(None, None), method="highs"
+            )
+            if res.status != 0:
+                return None
+            return res.x[d::m]
+
+        def bound_all(A_ub: csr_matrix, b_ub: ndarray, k: int):
+            lo, hi = npzeros((k, m)), npzeros((k, m))
+            for d in range(m):
+                _lo = bound(A_ub, b_ub, k, d, 1.0)
+                _hi = bound(A_ub, b_ub, k, d, -1.0)
+                if _lo is None or _hi is None:
+                    return None
+                lo[:, d], hi[:, d] = _lo, _hi
+            return lo, hi
+
+        # the theta space
+        space = bound_all(csr_matrix(A_t), b_t, 1)
+        if space is None:
+            space = npfull((1, m), -npinf), npfull((1, m), npinf)
+
+        # all regions at once
+        blocks = [spvstack([csr_matrix(e), csr_matrix(A_t)]) for e in E]
+        rhs = npconcatenate([npconcatenate([_f, b_t]) for _f in f])
+        boxes = bound_all(spblock_diag(blocks, format="csr"), rhs, n)
+        if boxes is not None:
+            return boxes
+
+        # region by region
+        lo, hi = npzeros((n, m)), npzeros((n, m))
+        for r, (block, _f) in enumerate(zip(blocks, f)):
+            box = bound_all(block.tocsr(), npconcatenate([_f, b_t]), 1)
+            if box is None:
+                box = space
+            lo[r], hi[r] = box[0][0], box[1][0]
+        return lo, hi
+
+    def grid(self, cells: int = 2**20):
+        """
+        Bins the boxes of the regions on a uniform grid
+
+        The number of cells along each theta is about the m-th root of twice the number of regions.
+
+        :param cells: maximum number of cells. Defaults to 2**20.
+        :type cells: int, optional
+        """
+        n, m = self.lo.shape
+
+        if n == 0:
+            self.origin = npzeros(m)
+            self.width = npzeros(m) + 1.0
+            self.shape = (1,) * m
+            self.cell_starts = npzeros(2, dtype=int)
+            self.cell_regions = npzeros(0, dtype=int)
+            self.bounded = True
+            self.stack()
+            return
+
+        # the boxes are grown a little, for round off
+        margin = 1e-9 * (1.0 + abs(self.lo) + abs(self.hi))
+        lo, hi = self.lo - margin, self.hi + margin
+        # unbounded boxes are clipped to the bounded ones, the outer cells take the rest
+        self.bounded = bool(npisfinite(lo).all() and npisfinite(hi).all())
+        self.origin = npwhere(
+            npisfinite(lo).any(axis=0), npwhere(npisfinite(lo), lo, npinf).min(axis=0), 0.0
+        )
+        top = npwhere(
+            npisfinite(hi).any(axis=0),
+            npwhere(npisfinite(hi), hi, -npinf).max(axis=0),
+            self.origin + 1.0,
+        )
+        lo, hi = lo.clip(self.origin, top), hi.clip(self.origin, top)
+
+        k = max(1, ceil((2 * n) ** (1 / m)))
+        k = max(1, min(k, floor(cells ** (1 / m))))
+        self.shape = (k,) * m
+        self.width = (top - self.origin) / k
+        self.width[self.width <= 0] = 1.0
+
+        # regions by cell, in the order of the regions
+        _cells, _regions = [], []
+        for r in range(n):
+            ranges = [
+                range(first, last + 1)
+                for first, last in zip(self.cell(lo[r]), self.cell(hi[r]))
+            ]
+            ids = [npravel_multi_index(c, self.shape) for c in product(*ranges)]
+            _cells.extend(ids)
+            _regions.extend([r] * len(ids))
+
+        _cells = npasarray(_cells, dtype=int)
+        _regions = npasarray(_regions, dtype=int)
+        order = npargsort(_cells, kind="stable")
+        self.cell_regions = _regions[order]
+        self.cell_starts = npsearchsorted(
+            _cells[order], nparange(k**m + 1), side="left"
+        )
+
+        self.stack()
+
+    def stack(self):
+        """
+        Stacks the facets of the regions in each cell (in the order of .cell_regions),
+        so that a point is checked against all of them with one product
+        """
+        # plain arrays, these may be memory-mapped
+        starts = npasarray(self.starts, dtype=int)
+        cell_regions = npasarray(self.cell_regions, dtype=int)
+        cell_starts = npasarray(self.cell_starts, dtype=int)
+
+        ends = npconcatenate([starts[1:], [len(self.f)]])
+        lengths = (ends - starts)[cell_regions]
+        firsts = npconcatenate([[0], npcumsum(lengths)]).astype(int)
+
+        # facet rows of each region in each cell
+        rows = nprepeat(starts[cell_regions] - firsts[:-1], lengths) + nparange(firsts[-1])
+        self.cell_E = npasarray(self.E)[rows]
+        self.cell_f = npasarray(self.f)[rows]
+
+        # first row of each cell
+        self.cell_rows = firsts[cell_starts]
+        # first row of each region within its cell
+        cell = nprepeat(nparange(len(cell_starts) - 1), npdiff(cell_starts))
+        self.cell_offsets = firsts[:-1] - self.cell_rows[cell]
+
+    def cell(self, theta: ndarray) -> ndarray:
+        """
+        Cell (position along each theta) of points,
+        points outside the grid are put in the outer cells
+
+        :param theta: a point, or points as rows
+        :type theta: ndarray
+
+        :returns: position of the cell along each theta
+        :rtype: ndarray
+        """
+        position = npfloor((npasarray(theta) - self.origin) / self.width).astype(int)
+        return position.clip(0, self.shape[0] - 1)
+
+    def candidates(self, theta: ndarray) -> ndarray:
+        """
+        Regions whose boxes overlap the cell of a point
+
+        :param theta: a point
+        :type theta: ndarray
+
+        :returns: region numbers
+        :rtype: ndarray
+        """
+        c = npravel_multi_index(tuple(self.cell(theta)), self.shape)
+        return self.cell_regions[self.cell_starts[c] : self.cell_starts[c + 1]]
+
+    def evaluate(self, theta: ndarray, region: int) -> ndarray:
+        """
+        x = A theta + b in a region
+
+        :param theta: a point
+        :type theta: ndarray
+        :param region: region number
+        :type region: int
+
+        :returns: values of the variables
+        :rtype: ndarray
+        """
+        return self.A[region] @ theta + self.b[region]
+
+    def objectives(self, theta: ndarray, x: ndarray) -> ndarray:
+        """
+        Objective values (the terms with x) at points
+
+        :param theta: points as rows
+        :type theta: ndarray
+        :param x: values of the variables at the points, as rows
+        :type x: ndarray
+
+        :returns: objective values
+        :rtype: ndarray
+        """
+        H, c, Q = self.objective
+        value = npeinsum("ij,ij->i", theta @ H.T, x) + x @ c
+        if Q is not None:
+            value = value + 0.5 * npeinsum("ij,ij->i", x @ Q, x)
+        return value
+
+    def locate(self, theta: ndarray) -> int:
+        """
+        Region that has a point
+
+        :param theta: a point
+        :type theta: ndarray
+
+        :returns: region number, -1 if the point is in none
+        :rtype: int
+        """
+        theta = npasarray(theta, dtype=float).ravel()
+
+        # outside all boxes
+        if self.bounded and (
+            (theta < self.origin).any()
+            or (theta > self.origin + self.width * self.shape[0]).any()
+        ):
+            return -1
+
+        c = npravel_multi_index(tuple(self.cell(theta)), self.shape)
+        s, e = self.cell_starts[c], self.cell_starts[c + 1]
+        if s == e:
+            return -1
+        candidates = self.cell_regions[s:e]
+        rs, re = self.cell_rows[c], self.cell_rows[c + 1]
+
+        inside = nplogical_and.reduceat(
+            self.cell_E[rs:re] @ theta - self.cell_f[rs:re] < self.tol,
+            self.cell_offsets[s:e],
+        )
+        inside = candidates[inside]
+
+        if not len(inside):
+            return -1
+
+        if self.overlapping and len(inside) > 1:
+            x = self.A[inside] @ theta + self.b[inside]
+            values = self.objectives(npasarray([theta] * len(inside)), x)
+            return int(inside[values.argmin()])
+
+        return int(inside[0])
+
+    def locate_batch(self, thetas: ndarray) -> ndarray:
+        """
+        Regions that have points
+
+        The points are grouped by cell, the points in a cell are checked
+        against the facets of all the candidates with one matrix product
+
+        :param thetas: points as rows
+        :type thetas: ndarray
+
+        :returns: region of each point, -1 if the point is in none
+        :rtype: ndarray
+        """
+        region = npfull(len(thetas), -1, dtype=int)
+        if not len(self) or not len(thetas):
+            return region
+
+        cells = npravel_multi_index(tuple(self.cell(thetas).T), self.shape)
+        order = npargsort(cells, kind="stable")
+        _cells, first = npunique(cells[order], return_index=True)
+        last = npconcatenate([first[1:], [len(order)]])
+
+        for c, s, e in zip(_cells, first, last):
+            candidates = self.cell_regions[self.cell_starts[c] : self.cell_starts[c + 1]]
+            if not len(candidates):
+                continue
+
+            points = order[s:e]
+            _thetas = thetas[points]
+            rs, re = self.cell_rows[c], self.cell_rows[c + 1]
+
+            # points x candidates
+            inside = nplogical_and.reduceat(
+                _thetas @ self.cell_E[rs:re].T - self.cell_f[rs:re] < self.tol,
+                self.cell_offsets[self.cell_starts[c] : self.cell_starts[c + 1]],
+                axis=1,
+            )
+
+            if self.overlapping:
+                values = npfull(inside.shape, npinf)
+                for n, r in enumerate(candidates):
+                    _in = inside[:, n].nonzero()[0]
+                    if len(_in):
+                        x = _thetas[_in] @ self.A[r].T + self.b[r]
+                        values[_in, n] = self.objectives(_thetas[_in], x)
+                _region = candidates[values.argmin(axis=1)]
+            else:
+                # the first region that has the point
+                _region = candidates[inside.argmax(axis=1)]
+
+            _region[~inside.any(axis=1)] = -1
+            region[points] = _region
+
+        return region
+
+    def evaluate_batch(self, thetas: ndarray, region: ndarray) -> ndarray:
+        """
+        x = A theta + b at points, each in its region
+
+        :param thetas: points as rows
+        :type thetas: ndarray
+        :param region: region of each point, -1 if in none
+        :type region: ndarray
+
+        :returns: values of the variables at each point as rows, nan if in no region
+        :rtype: ndarray
+        """
+        X = npfull((len(thetas), self.A.shape[1]), npnan)
+        for r in npunique(region[region >= 0]):
+            rows = (region == r).nonzero()[0]
+            X[rows] = thetas[rows] @ self.A[r].T + self.b[r]
+        return X
+
@@ -1,18 +1,80 @@
 """Solution"""
 
+from collections.abc import Mapping
 from dataclasses import dataclass
-
-from matplotlib import pyplot as plt
-from matplotlib import rc
-
+from typing import Any, Callable, Iterator
+
+from numpy import arange as nparange
+from numpy import array as nparray
+from numpy import asarray as npasarray
+from numpy import concatenate as npconcatenate
+from numpy import fromiter as npfromiter
+from numpy import full as npfull
+from numpy import isnan as npisnan
+from numpy import nan as npnan
+from numpy import ndarray
+from numpy import zeros as npzeros
+
+from ..sets._element import Chain
 from ..sets.index import I
 from ..sets.variable import V
 
 
+class Fields(Mapping):
+    """
+    Fields of a variable (set) in a solution,
+    each made when it is first read
+
+    :param makers: function that makes each field
+    :type makers: dict[str, Callable[[], Any]]
+    """
+
+    def __init__(self, makers: dict[str, Callable[[], Any]]):
+        self._makers = makers
+        self._fields: dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._fields[key]
+        except KeyError:
+            self._fields[key] = self._makers[key]()
+            return self._fields[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._makers)
+
+    def __len__(self) -> int:
+        return len(self._makers)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+def index_of(variable: V) -> dict[str, dict[str, int]]:
+    """
+    Positions of the indices of a variable in the index sets they belong to
+
+    :param variable: variable
+    :type variable: V
+
+    :returns: index name, and the position in each of its parents
+    :rtype: dict[str, dict[str, int]]
+    """
+    return {
+        idx.name: {par.name: pos for par, pos in zip(idx.parent, idx.pos)}
+        for idx in variable.index
+        if isinstance(idx, I)
+    }
+
+
 @dataclass
 class Solution:
     """A State with its variables filled in
 
+    The values are kept in one array, in the order of the variables,
+    and looked up by the ordinals (n) of the variables.
+    LaTeX labels and indices are only made when asked for.
+
     :param name: Name of the solution
     :type name: str
     """
@@ -21,72 +83,166 @@ class Solution:
 
     def __post_init__(self):
 
-        self._: dict[str, dict[str, list]] = {}
+        # variables with values, their ordinals (n) and values
+        # variables are made when asked for
+        self.variables: Chain = Chain()
+        self.ordinals: ndarray = npzeros(0, dtype=int)
+        self.values: ndarray = npzeros(0)
+
+        # position of each ordinal in .values, -1 if not in the solution
+        self._positions: ndarray | None = None
+
+        # fields by variable set name, made when asked for
+        self._sets: dict[str, Fields] | None = None
+
+    def update(
+        self,
+        variables: list[V],
+        n_sol: int = 0,
+        values: list[float] | ndarray | None = None,
+    ):
+        """Add variables to the solution
+
+        :param variables: variables (elements)
+        :type variables: list[V] | Chain
+        :param n_sol: solution number, the values are read off the variables (X) if not given. Defaults to 0.
+        :type n_sol: int, optional
+        :param values: values of the variables, in the same order. Defaults to None.
+        :type values: list[float] | ndarray | None, optional
+        """
+        if isinstance(variables, Chain):
+            # the variables of a program, not made to be read
+            ordinals = variables.ordinals
+        else:
+            variables = list(variables)
+            ordinals = npfromiter(
+                (v.n for v in variables), dtype=int, count=len(variables)
+            )
+
+        if values is None:
+            values = [v.X.get(n_sol, npnan) if v.X else npnan for v in variables]
+
+        self.variables.extend(variables)
+        self.ordinals = npconcatenate([self.ordinals, ordinals])
+        self.values = npconcatenate(
+            [self.values, npasarray(values, dtype=float).ravel()]
+        )
+        self._positions = None
+        self._sets = None
+
+    def positions(self, ordinals: ndarray) -> ndarray:
+        """
+        Positions of variables in .values
+
+        :param ordinals: ordinals (n) of the variables
+        :type ordinals: ndarray
+
+        :returns: positions, -1 for variables not in the solution
+        :rtype: ndarray
+        """
+        if self._positions is None:
+            self._positions = npfull(
+                max(self.ordinals.max(initial=-1), 0) + 1, -1, dtype=int
+            )
+            self._positions[self.ordinals] = nparange(len(self.ordinals))
+
+        ordinals = npasarray(ordinals, dtype=int)
+        found = (ordinals >= 0) & (ordinals < len(self._positions))
+        positions = npfull(ordinals.shape, -1, dtype=int)
+        positions[found] = self._positions[ordinals[found]]
+        return positions
+
+    def value(self, variable: V) -> ndarray | float | None:
+        """
+        Values of a variable set (or value of a variable)
+
+        :param variable: variable set or variable
+        :type variable: V
+
+        :returns: values (nan if not in the solution), None for a variable not in the solution
+        :rtype: ndarray | float | None
+        """
+        if variable.parent:
+            position = self.positions(nparray([variable.n]))[0]
+            return None if position < 0 else float(self.values[position])
+
+        positions = self.positions(variable.ordinals)
+        values = npfull(len(positions), npnan)
+        values[positions >= 0] = self.values[positions[positions >= 0]]
+        return values
 
     def asdict(self):
         """Return the solution as a dictionary"""
         return {v: values["values"] for v, values in self._.items()}
 
-    def update(self, variable_sets: list[V], n_sol: int = 0):
-        """Add variables to the solution"""
-        for v in variable_sets:
-            if v.parent.name not in self._:
-                self._[v.parent.name] = {
-                    "latex": [],
-                    "index_latex": [],
-                    "positions": [],
-                    "n": [],
-                    "values": [],
-                    "index": [],
-                }
-            self._[v.parent.name]["latex"].append(v.latex())
-            self._[v.parent.name]["index_latex"].append(r"$" + v.index_ltx + r"$")
-            self._[v.parent.name]["positions"].append(v.pos)
-            self._[v.parent.name]["n"].append(v.n)
-            if v.X:
-                self._[v.parent.name]["values"].append(v.X[n_sol])
-            else:
-                self._[v.parent.name]["values"].append(None)
-            self._[v.parent.name]["index"].append(
-                {
-                    idx.name: {par.name: pos for par, pos in zip(idx.parent, idx.pos)}
-                    for idx in v.index
-                    if isinstance(idx, I)
-                }
-            )
+    @property
+    def _(self) -> dict[str, Fields]:
+        """Fields by variable set name"""
+        if self._sets is None:
+            members: dict[str, list[int]] = {}
+            for position, v in enumerate(self.variables):
+                members.setdefault(v.parent.name, []).append(position)
+            self._sets = {
+                name: self.fields([self.variables[p] for p in positions], positions)
+                for name, positions in members.items()
+            }
+        return self._sets
 
-    def __call__(self, variable: V):
+    def fields(self, variables: list[V], positions: list[int] | ndarray) -> Fields:
+        """
+        Fields of variables
 
-        if variable.parent:
-            return {
-                "latex": self._[variable.parent.name]["latex"][variable.pos],
-                "index_latex": r"$"
-                + self._[variable.parent.name]["index_latex"][variable.pos]
-                + r"$",
-                "positions": self._[variable.parent.name]["positions"][variable.pos],
-                "n": self._[variable.parent.name]["n"][variable.pos],
-                "values": self._[variable.parent.name]["values"][variable.pos],
-                "index": self._[variable.parent.name]["index"][variable.pos],
+        :param variables: variables
+        :type variables: list[V]
+        :param positions: positions of the variables in .values, -1 if not in the solution
+        :type positions: list[int] | ndarray
+
+        :returns: latex, index_latex, positions, n, values and index of each variable
+        :rtype: Fields
+        """
+        positions = npasarray(positions, dtype=int)
+
+        def values():
+            # None where there is no value
+            _values = npfull(len(positions), npnan)
+            _values[positions >= 0] = self.values[positions[positions >= 0]]
+            _values = _values.astype(object)
+            _values[npisnan(_values.astype(float))] = None
+            return _values.tolist()
+
+        return Fields(
+            {
+                "latex": lambda: [v.latex() for v in variables],
+                "index_latex": lambda: [r"$" + v.index_ltx + r"$" for v in variables],
+                "positions": lambda: [v.pos for v in variables],
+                "n": lambda: [v.n for v in variables],
+                "values": values,
+                "index": lambda: [index_of(v) for v in variables],
             }
+        )
 
-        _return = {
-            "latex": [],
-            "index_latex": [],
-            "positions": [],
-            "n": [],
-            "values": [],
-            "index": [],
-        }
-        for var in variable:
-            _return["latex"].append(self._[var.parent.name]["latex"][var.pos])
-            _return["index_latex"].append(
-                self._[var.parent.name]["index_latex"][var.pos]
+    def __call__(self, variable: V) -> Fields:
+
+        if variable.parent:
+            position = self.positions(nparray([variable.n]))[0]
+
+            def value():
+                if position < 0 or self.values[position] != self.values[position]:
+                    return None
+                return float(self.values[position])
+
+            return Fields(
+                {
+                    "latex": variable.latex,
+                    "index_latex": lambda: r"$" + variable.index_ltx + r"$",
+                    "positions": lambda: variable.pos,
+                    "n": lambda: variable.n,
+                    "values": value,
+                    "index": lambda: index_of(variable),
+                }
             )
-            _return["positions"].append(self._[var.parent.name]["positions"][var.pos])
-            _return["n"].append(self._[var.parent.name]["n"][var.pos])
-            _return["values"].append(self._[var.parent.name]["values"][var.pos])
-            _return["index"].append(self._[var.parent.name]["index"][var.pos])
-        return _return
+
+        return self.fields(list(variable._), self.positions(variable.ordinals))
 
     def draw(
         self,
@@ -145,6 +301,9 @@ class Solution:
 
         hold, free = check_whats_changing()
 
+        # matplotlib is only imported to plot
+        from matplotlib import pyplot as plt
+        from matplotlib import rc
 
         ax = plt.subplots(figsize=fig_size)[1]
 
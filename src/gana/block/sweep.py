@@ -0,0 +1,268 @@
+"""Parameter Sweep"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from math import ceil
+from multiprocessing import get_context
+from typing import TYPE_CHECKING, Any, Callable
+
+from gurobipy import GRB
+from numpy import array as nparray
+from numpy import full as npfull
+from numpy import nan as npnan
+from numpy import ndarray
+from numpy import ones as npones
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse import diags as spdiags
+
+if TYPE_CHECKING:
+    from ..sets.variable import V
+    from .program import Prg
+
+
+# matrix form of the program (see Prg.matrix_form())
+# set once in each worker by the initializer
+_form: dict[str, ndarray | csr_matrix | list[str]] | None = None
+
+
+def _init(form: dict[str, ndarray | csr_matrix | list[str]]):
+    """Keeps the matrix form in the worker"""
+    global _form
+    _form = form
+
+
+def _solve(delta: dict[str, ndarray]) -> tuple[float, ndarray | None, str | None]:
+    """
+    Solves the program with the rows of a scenario changed
+
+    :param delta: rows changed, their coefficients (i, j, data), RHS (B) and sense
+    :type delta: dict[str, ndarray]
+
+    :returns: objective value, values of the columns and error (None if solved)
+    :rtype: tuple[float, ndarray | None, str | None]
+    """
+    from .program import Prg
+
+    try:
+        form = dict(_form)
+        rows = delta["rows"]
+        if len(rows):
+            # drop the rows and add them as in the scenario
+            keep = npones(form["A"].shape[0])
+            keep[rows] = 0.0
+            form["A"] = (
+                spdiags(keep) @ form["A"]
+                + coo_matrix(
+                    (delta["data"], (delta["i"], delta["j"])), shape=form["A"].shape
+                )
+            ).tocsr()
+            form["B"] = form["B"].copy()
+            form["B"][rows] = delta["B"]
+            form["sense"] = form["sense"].copy()
+            form["sense"][rows] = delta["sense"]
+
+        m = Prg.gurobi_model(form)
+        m.Params.OutputFlag = 0
+        m.optimize()
+
+        if m.Status != GRB.OPTIMAL:
+            return npnan, None, f"status {m.Status}"
+
+        return m.ObjVal, nparray(m.getAttr("X", m.getVars())), None
+
+    except Exception as e:  # pylint: disable=broad-except
+        # one failed scenario does not stop the sweep
+        return npnan, None, repr(e)
+
+
+@dataclass
+class Sweep:
+    """
+    Solutions of a parameter sweep
+
+    :param scenarios: the scenarios, in order
+    :type scenarios: list[Any]
+    :param variables: variables, in the order of the columns of X
+    :type variables: list[V]
+    :param objectives: objective value of each scenario, nan if it failed
+    :type objectives: ndarray
+    :param X: values of the variables in each scenario (a row each), nan if it failed
+    :type X: ndarray
+    :param errors: why a scenario failed, by position
+    :type errors: dict[int, str]
+    """
+
+    scenarios: list[Any] = field(default_factory=list)
+    variables: list[V] = field(default_factory=list)
+    objectives: ndarray = None
+    X: ndarray = None
+    errors: dict[int, str] = field(default_factory=dict)
+
+    def __call__(self, variable: V) -> ndarray:
+        """
+        Values of a variable across the scenarios
+
+        :param variable: variable (element)
+        :type variable: V
+
+        :returns: value in each scenario
+        :rtype: ndarray
+        """
+        for n, v in enumerate(self.variables):
+            if v is variable:
+                return self.X[:, n]
+        raise ValueError(f"{variable} is not a column of the sweep")
+
+    def __len__(self):
+        return len(self.scenarios)
+
+
+def sweep(
+    program: Prg,
+    scenarios: list[Any],
+    declare: Callable[[Prg, Any], None],
+    workers: int = 1,
+    chunksize: int | None = None,
+) -> Sweep:
+    """
+    Solves a program for each scenario
+
+    The matrix form of the program is made once and sent once to each worker.
+    For each scenario, declare(program, scenario) declares the constraint sets
+    that depend on it (e.g. with a mutated parameter set) again, and only the rows
+    that differ (coefficients, RHS and sense) are sent to the workers.
+    The constraint sets of the program are put back after the sweep.
+
+    :param program: program to sweep
+    :type program: Prg
+    :param scenarios: scenarios, anything that declare takes
+    :type scenarios: list[Any]
+    :param declare: declares the constraint sets for a scenario
+    :type declare: Callable[[Prg, Any], None]
+    :param workers: number of processes, 1 solves in this process. Defaults to 1.
+    :type workers: int, optional
+    :param chunksize: scenarios sent to a worker at a time. Defaults to spreading them in 4 rounds.
+    :type chunksize: int | None, optional
+
+    :returns: objective values and values of the variables in each scenario
+    :rtype: Sweep
+
+    :raises ValueError: If a scenario adds variables, constraints or objectives
+    """
+    scenarios = list(scenarios)
+
+    form = program.matrix_form()
+    variables = program.colvars()
+
+    # where the constraints and variables are in the matrix form
+    constraints = list(program.constraints)
+    sets = list(program.constraint_sets)
+    rows_of = {id(c): r for r, c in enumerate(program.leqcons() + program.eqcons())}
+    cols_of = {v.n: j for j, v in enumerate(variables)}
+    counts = (program.n_variables, program.n_constraints, len(program.objectives))
+
+    def delta() -> dict[str, ndarray]:
+        # rows that differ from the matrix form
+        rows, i, j, data, B, sense = [], [], [], [], [], []
+        for c, c_ex in zip(program.constraints, constraints):
+            if c is c_ex:
+                continue
+            if c.nn != c_ex.nn:
+                raise ValueError(
+                    f"{program.name}: {c} changes nonnegativity, which is a bound"
+                )
+            if c.nn or (
+                c.P == c_ex.P
+                and list(c.A) == list(c_ex.A)
+                and c.B == c_ex.B
+                and c.leq == c_ex.leq
+            ):
+                continue
+            r = rows_of[id(c_ex)]
+            rows.append(r)
+            for v, a in zip(c.variables, c.A):
+                if v is not None:
+                    if v.n not in cols_of:
+                        raise ValueError(
+                            f"{program.name}: {v} in {c} is not a column of the program"
+                        )
+                    i.append(r)
+                    j.append(cols_of[v.n])
+                    data.append(float(a))
+            B.append(float(c.B or 0))
+            sense.append("<" if c.leq else "=")
+
+        return {
+            "rows": nparray(rows, dtype=int),
+            "i": nparray(i, dtype=int),
+            "j": nparray(j, dtype=int),
+            "data": nparray(data, dtype=float),
+            "B": nparray(B, dtype=float),
+            "sense": nparray(sense, dtype="<U1"),
+        }
+
+    # the deltas are made here, in order
+    # a scenario that fails to declare (or to make its delta) does not stop the sweep
+    deltas: dict[int, dict[str, ndarray]] = {}
+    errors: dict[int, str] = {}
+    try:
+        for n, scenario in enumerate(scenarios):
+            try:
+                declare(program, scenario)
+            except Exception as e:  # pylint: disable=broad-except
+                errors[n] = repr(e)
+
+            # the program itself cannot change, failed scenario or not
+            if (
+                program.n_variables,
+                program.n_constraints,
+                len(program.objectives),
+            ) != counts:
+                raise ValueError(
+                    f"{program.name}: scenarios can only declare existing constraint sets again"
+                )
+
+            if n in errors:
+                continue
+            try:
+                deltas[n] = delta()
+            except Exception as e:  # pylint: disable=broad-except
+                errors[n] = repr(e)
+    finally:
+        # put the constraint sets of the program back
+        for c in sets:
+            if program.constraint_sets[c.n] is not c:
+                setattr(program, c.pname, c)
+
+    if workers > 1:
+        if chunksize is None:
+            chunksize = max(1, ceil(len(deltas) / (4 * workers)))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_init,
+            initargs=(form,),
+        ) as pool:
+            results = list(pool.map(_solve, deltas.values(), chunksize=chunksize))
+    else:
+        _init(form)
+        results = [_solve(d) for d in deltas.values()]
+
+    objectives = npfull(len(scenarios), npnan)
+    X = npfull((len(scenarios), len(variables)), npnan)
+    for n, (obj, x, error) in zip(deltas, results):
+        if error is None:
+            objectives[n] = obj
+            X[n] = x
+        else:
+            errors[n] = error
+
+    return Sweep(
+        scenarios=scenarios,
+        variables=variables,
+        objectives=objectives,
+        X=X,
+        errors=dict(sorted(errors.items())),
+    )
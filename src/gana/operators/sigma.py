@@ -5,8 +5,15 @@ from __future__ import annotations
 # from itertools import islice
 from typing import TYPE_CHECKING
 
+from numpy import arange as nparange
+from numpy import ascontiguousarray as npascontiguousarray
+from numpy import column_stack as npcolumn_stack
+from numpy import moveaxis as npmoveaxis
+from numpy import ones as npones
+
+from ..sets._element import ElementMap, Elements, RowMap
 from ..sets.cases import Elem, FCase
-from ..sets.function import F
+from ..sets.function import F, _F
 
 if TYPE_CHECKING:
     from ..sets.index import I
@@ -28,21 +35,57 @@ def sigma(variable: V, over: I = None, position: int = None) -> F:
     :rtype: F
     """
 
+    def _split(over, position):
+        # positions (in the variable set) of the summed variables,
+        # a row for each element of over, a column for each summation
+        # using index arithmetic on the variable set,
+        # which is ordered as the product of its indices
+        # returns None if the variable set is not a full product of its indices
+        index = variable.index
+        if not isinstance(index, tuple) or index[position] is not over:
+            return None
+
+        _map = variable.map
+        if (
+            not isinstance(_map, ElementMap)
+            or _map._added
+            or _map._replaced
+            or len(variable._) != _map.size
+        ):
+            # mutated variable set
+            return None
+
+        dims = [len(m) for m in _map.members]
+        return npmoveaxis(nparange(_map.size).reshape(dims), position, 0).reshape(
+            dims[position], -1
+        )
+
     def _determine_index(over, position):
+        order = None
         if over:
             length = len(over)
 
             if not position:
                 position = variable.index.index(over)
 
-            # Precompute slices
-            before = variable.index[:position]
-            after = variable.index[position + 1 :]
+            if length != 2:
+                # the positions are not needed for v_0 + v_1, see below
+                order = _split(over, position)
+
+            if order is None:
+                # Precompute slices
+                before = variable.index[:position]
+                after = variable.index[position + 1 :]
+
+                # Build variables
+                _variables = [
+                    variable(*before, _index, *after, make_new=True)
+                    for _index in over
+                ]
 
-            # Build variables
-            _variables = [
-                variable(*before, _index, *after, make_new=True) for _index in over
-            ]
+            else:
+                # made when asked for, see F.member_at
+                _variables = None
 
         else:
             # sum over the entire set
@@ -51,31 +94,51 @@ def sigma(variable: V, over: I = None, position: int = None) -> F:
             position = None
             over = variable.index
 
-        return _variables, over, length, position
+        return _variables, over, length, position, order
 
-    def _birth_parent(variable, _variables, over, position, length):
+    def _birth_parent(variable, _variables, over, position, length, order):
         _f = F()
         _f.case = FCase.SUM
         _f.issumhow = (variable.copy(), over, position)
-        _f.variables = _variables
-        _f.index = tuple(v.index for v in _f.variables)
         _f.one = _f
         _f.one_type = Elem.F
-        _f.give_name()
-
         _f.rhs_thetas = []
-        length_var = len(_variables[0])
-        keys = list(zip(*(v.map for v in _f.variables)))
-        _f.A = [[1] * length for _ in range(length_var)]
-        return _f, length_var, keys
 
-    def _birth_children(f, length_var, keys):
+        if order is None:
+            _f.variables = _variables
+            _f.index = tuple(v.index for v in _f.variables)
+            _f.give_name()
+            length_var = len(_variables[0])
+            _f.A = npones((length_var, length))
+            # ordinals of the summed variables, a column for each
+            _f.positions = npcolumn_stack([v.ordinals for v in _f.variables])
+            return _birth_children(_f, length_var)
+
+        # the summed variable sets and the summations (rows)
+        # are made when asked for, see F.member_at and F.element_at
+        before = variable.index[:position]
+        after = variable.index[position + 1 :]
+        _f._order = order
+        _f.variables = Elements(_f, length, make="member_at")
+        _f.index = tuple((*before, _index, *after) for _index in over)
+        _f.give_name()
+        length_var = order.shape[1]
+        _f.A = npones((length_var, length))
+        # ordinals of the summed variables, a column for each
+        _f.positions = npascontiguousarray(variable.ordinals[order].T)
+        _f.P = _f.positions.tolist()
+        _f._ = Elements(_f, length_var)
+        _f.map = RowMap(_f._, _f.issumhow[0].map, order)
+        return _f
+
+    def _birth_children(f, length_var):
+        keys = list(zip(*(v.map for v in f.variables)))
         for n in range(length_var):
             # make the child functions
-            f_child = F()
+            f_child = _F()
             f_child.variables = [v[n] for v in f.variables]
             f_child.P = [v.n for v in f_child.variables]
-            f_child.A = [1] * length
+            f_child.A = f.A[n]
             key = keys[n]
             f_child.issumhow = (variable[length * n], over, position)
             f_child.parent = f
@@ -93,13 +156,11 @@ def sigma(variable: V, over: I = None, position: int = None) -> F:
             f_child.one_type = Elem.F
         return f
 
-    _variables, over, length, position = _determine_index(over, position)
+    _variables, over, length, position, order = _determine_index(over, position)
 
     if length == 2:
         # short-circuit for length 2
         # just v_0 + v_1
         return _variables[0] + _variables[1]
 
-    f, length_var, keys = _birth_parent(variable, _variables, over, position, length)
-
-    return _birth_children(f, length_var, keys)
+    return _birth_parent(variable, _variables, over, position, length, order)
@@ -2,9 +2,28 @@
 
 from __future__ import annotations
 
+from bisect import bisect_right
+from collections.abc import (
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Sequence,
+)
 from itertools import product
+from math import prod
 from typing import TYPE_CHECKING, Self
 
+from numpy import arange as nparange
+from numpy import array as nparray
+from numpy import column_stack as npcolumn_stack
+from numpy import concatenate as npconcatenate
+from numpy import ndarray
+from numpy import searchsorted as npsearchsorted
+from numpy import unravel_index as npunravel_index
+from numpy import zeros as npzeros
+
 if TYPE_CHECKING:
     from .index import I
     from .variable import V as VType
@@ -70,6 +89,34 @@ class _E:
         # this helps in the index check when calling functions
         self.elements = [self]
 
+    # -----------------------------------------------------
+    #                    Containers
+    # -----------------------------------------------------
+
+    # elements are made when asked for (see Elements),
+    # and only get their containers (lists, dicts) when asked for
+    # maps attribute name to a function that makes it for the element
+    # set by the subclasses
+    _containers: dict = {}
+
+    def __getattr__(self, name: str):
+        # only called if the attribute is not found
+        try:
+            make = type(self)._containers[name]
+        except KeyError as e:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            ) from e
+        try:
+            # index is slotted in the elements, look it up without coming back here
+            object.__getattribute__(self, "index")
+        except AttributeError:
+            # uninitialized, e.g. during unpickling
+            raise AttributeError(name) from None
+        value = make(self)
+        setattr(self, name, value)
+        return value
+
     # -----------------------------------------------------
     #                    Vector
     # -----------------------------------------------------
@@ -104,3 +151,445 @@ class _E:
         # the hashing will be inherited by the subclasses
         cls.__repr__ = _E.__repr__
         cls.__hash__ = _E.__hash__
+
+
+# -----------------------------------------------------
+#                    Lazy elements
+# -----------------------------------------------------
+
+
+class Elements(MutableSequence):
+    """
+    Elements of a set, each made when it is first asked for
+
+    The set makes the element at a position (set.element_at(pos)).
+    Elements that have not been made are held as None,
+    elements of a set are never None
+
+    :param parent: set that makes the elements
+    :type parent: V | T | F
+    :param size: number of elements
+    :type size: int
+    :param make: method of the set that makes an element. Defaults to 'element_at'.
+    :type make: str, optional
+    """
+
+    def __init__(self, parent: _E, size: int, make: str = "element_at"):
+        self.parent = parent
+        self._items: list[_E | None] = [None] * size
+        # elements past this were appended, not made by the set
+        self._made_by_set = size
+        self._make = make
+
+    def _at(self, pos: int) -> _E:
+        item = self._items[pos]
+        if item is None and pos < self._made_by_set:
+            item = self._items[pos] = getattr(self.parent, self._make)(pos)
+        return item
+
+    def made(self) -> list[_E]:
+        """Elements that have been made, in order"""
+        return [i for i in self._items if i is not None]
+
+    def _make_all(self):
+        # positions are about to shift, make everything first
+        self._items = list(self)
+        self._made_by_set = 0
+
+    def __getitem__(self, pos: int | slice) -> _E | list[_E]:
+        if isinstance(pos, slice):
+            return [self._at(p) for p in range(len(self._items))[pos]]
+        return self._at(range(len(self._items))[pos])
+
+    def __setitem__(self, pos: int | slice, value: _E | list[_E]):
+        if isinstance(pos, slice):
+            self._make_all()
+        self._items[pos] = value
+
+    def __delitem__(self, pos: int | slice):
+        self._make_all()
+        del self._items[pos]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[_E]:
+        return (self._at(pos) for pos in range(len(self._items)))
+
+    def insert(self, pos: int, value: _E):
+        if pos < len(self._items):
+            self._make_all()
+        self._items.insert(pos, value)
+
+    def append(self, value: _E):
+        self._items.append(value)
+
+    def copy(self) -> Chain:
+        """Copy, made elements are shared with the set"""
+        chain = Chain()
+        chain.extend(self)
+        return chain
+
+    def __add__(self, other: list) -> list:
+        return list(self) + list(other)
+
+    def __radd__(self, other: list) -> list:
+        return list(other) + list(self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, MutableSequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class ElementMap(MutableMapping):
+    """
+    Index to element mapping of a set, the elements are made when asked for
+
+    The indices are the product of the members of the index sets,
+    the position of an element is worked out from the positions of the members
+    of its index in the index sets (see V.codes)
+
+    :param elements: elements of the set
+    :type elements: Elements
+    :param index: index sets
+    :type index: tuple[I | list[V], ...]
+    """
+
+    def __init__(self, elements: Elements, index: tuple[I | list[VType], ...]):
+        self.elements = elements
+        # members of the index sets, as they were when the set was born
+        self.members: list[list] = [list(i) for i in index]
+        self.lookups: list[dict] = [
+            {m: pos for pos, m in enumerate(members)} for members in self.members
+        ]
+        self.size: int = prod(len(m) for m in self.members) if self.members else 0
+        # indices set through the map that are not in the product (mutation)
+        self._added: dict = {}
+        # indices in the product set through the map
+        self._replaced: dict = {}
+
+    def position(self, index: tuple) -> int:
+        """
+        Position of an index in the product of the index sets
+
+        :param index: index
+        :type index: tuple
+
+        :returns: position
+        :rtype: int
+
+        :raises KeyError: If the index is not in the product
+        """
+        if not isinstance(index, tuple) or len(index) != len(self.lookups):
+            raise KeyError(index)
+        pos = 0
+        for lookup, member in zip(self.lookups, index):
+            pos = pos * len(lookup) + lookup[member]
+        return pos
+
+    def index_at(self, pos: int) -> tuple:
+        """
+        Index at a position in the product of the index sets
+
+        :param pos: position
+        :type pos: int
+
+        :returns: index
+        :rtype: tuple
+        """
+        index = []
+        for members in reversed(self.members):
+            pos, at = divmod(pos, len(members))
+            index.append(members[at])
+        return tuple(reversed(index))
+
+    def codes(self) -> ndarray:
+        """Positions of the members of every index in the index sets"""
+        if not self.size:
+            return npzeros((0, len(self.members)), dtype=int)
+        return npcolumn_stack(
+            npunravel_index(nparange(self.size), [len(m) for m in self.members])
+        )
+
+    def copy(self) -> ElementMap:
+        """Copy, made elements are shared with the set"""
+        _map = ElementMap.__new__(ElementMap)
+        _map.__dict__.update(self.__dict__)
+        _map._added = dict(self._added)
+        _map._replaced = dict(self._replaced)
+        return _map
+
+    def __getitem__(self, index: tuple) -> _E:
+        if index in self._added:
+            return self._added[index]
+        if index in self._replaced:
+            return self._replaced[index]
+        return self.elements[self.position(index)]
+
+    def __setitem__(self, index: tuple, value: _E):
+        try:
+            self.position(index)
+        except KeyError:
+            self._added[index] = value
+        else:
+            self._replaced[index] = value
+
+    def __delitem__(self, index: tuple):
+        raise TypeError("Indices of a set cannot be deleted")
+
+    def __contains__(self, index) -> bool:
+        if index in self._added:
+            return True
+        try:
+            self.position(index)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[tuple]:
+        if self.members:
+            yield from product(*self.members)
+        yield from self._added
+
+    def __len__(self) -> int:
+        return self.size + len(self._added)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class RowMap(Mapping):
+    """
+    Index to function mapping of a summation (see sigma),
+    the functions (rows) are made when asked for
+
+    Each row adds up elements of a set,
+    the index of a row is the indices of those elements
+
+    :param elements: rows of the summation
+    :type elements: Elements
+    :param set_map: index to element mapping of the summed set
+    :type set_map: ElementMap
+    :param order: positions of the summed elements in the set, a column per row
+    :type order: ndarray
+    """
+
+    def __init__(self, elements: Elements, set_map: ElementMap, order: ndarray):
+        self.elements = elements
+        self.set_map = set_map
+        self.order = order
+
+    def row(self, index: tuple) -> int:
+        """
+        Row of an index
+
+        :param index: index
+        :type index: tuple
+
+        :returns: row
+        :rtype: int
+
+        :raises KeyError: If the index is not of a row
+        """
+        try:
+            pos = self.set_map.position(index[0])
+        except (KeyError, TypeError, IndexError):
+            raise KeyError(index) from None
+        # the first summed element of each row is in order
+        row = int(npsearchsorted(self.order[0], pos))
+        if row == self.order.shape[1] or self.index_at(row) != index:
+            raise KeyError(index)
+        return row
+
+    def index_at(self, row: int) -> tuple:
+        """
+        Index of a row
+
+        :param row: row
+        :type row: int
+
+        :returns: index
+        :rtype: tuple
+        """
+        return tuple(self.set_map.index_at(pos) for pos in self.order[:, row].tolist())
+
+    def __getitem__(self, index: tuple) -> _E:
+        return self.elements[self.row(index)]
+
+    def __contains__(self, index) -> bool:
+        try:
+            self.row(index)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[tuple]:
+        indices = list(self.set_map)
+        for row in self.order.T.tolist():
+            yield tuple(indices[pos] for pos in row)
+
+    def __len__(self) -> int:
+        return self.order.shape[1]
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class Chain(MutableSequence):
+    """
+    Elements of several sets, one after the other
+
+    Sets are added as windows (elements, start, stop) on their elements,
+    nothing is made until asked for
+
+    Used for the variables of a program and their partitions
+    """
+
+    def __init__(self):
+        # (elements, start, stop)
+        self._chunks: list[tuple[Sequence[_E], int, int]] = []
+        # where each chunk ends in the chain
+        self._ends: list[int] = []
+
+    def _locate(self, pos: int) -> tuple[Sequence[_E], int]:
+        pos = range(len(self))[pos]
+        at = bisect_right(self._ends, pos)
+        elements, start, _ = self._chunks[at]
+        return elements, start + pos - (self._ends[at - 1] if at else 0)
+
+    def _add(self, elements: Sequence[_E], start: int, stop: int):
+        if stop > start:
+            self._chunks.append((elements, start, stop))
+            self._ends.append(len(self) + stop - start)
+
+    def _flatten(self):
+        # positions are about to shift, put everything in one list
+        items = list(self)
+        self._chunks, self._ends = [], []
+        self._add(items, 0, len(items))
+        return items
+
+    def made(self) -> list[_E]:
+        """Elements that have been made, in order"""
+        made = []
+        for elements, start, stop in self._chunks:
+            if isinstance(elements, Elements):
+                made.extend(i for i in elements._items[start:stop] if i is not None)
+            else:
+                made.extend(elements[start:stop])
+        return made
+
+    @property
+    def ordinals(self) -> ndarray:
+        """Ordinals (n) of the elements, the elements are not made"""
+        ordinals = []
+        for elements, start, stop in self._chunks:
+            if isinstance(elements, Elements):
+                ordinals.append(elements.parent.ordinals[start:stop])
+            else:
+                ordinals.append(
+                    nparray([e.n for e in elements[start:stop]], dtype=int)
+                )
+        if not ordinals:
+            return npzeros(0, dtype=int)
+        return npconcatenate(ordinals)
+
+    def __getitem__(self, pos: int | slice) -> _E | list[_E]:
+        if isinstance(pos, slice):
+            return [self[p] for p in range(len(self))[pos]]
+        if len(self._chunks) == 1:
+            # a copy of the elements of one set
+            elements, start, stop = self._chunks[0]
+            return elements[start + range(stop - start)[pos]]
+        elements, at = self._locate(pos)
+        return elements[at]
+
+    def __setitem__(self, pos: int | slice, value: _E | list[_E]):
+        if isinstance(pos, slice):
+            items = self._flatten()
+            items[pos] = value
+            self._chunks, self._ends = [], []
+            self._add(items, 0, len(items))
+            return
+        elements, at = self._locate(pos)
+        if not isinstance(elements, list):
+            # do not write into the elements of a set
+            items = self._flatten()
+            items[pos] = value
+            return
+        elements[at] = value
+
+    def __delitem__(self, pos: int | slice):
+        items = self._flatten()
+        del items[pos]
+        self._chunks, self._ends = [], []
+        self._add(items, 0, len(items))
+
+    def __len__(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def __iter__(self) -> Iterator[_E]:
+        for elements, start, stop in self._chunks:
+            for pos in range(start, stop):
+                yield elements[pos]
+
+    def insert(self, pos: int, value: _E):
+        if pos >= len(self):
+            self.append(value)
+            return
+        items = self._flatten()
+        items.insert(pos, value)
+        self._chunks, self._ends = [], []
+        self._add(items, 0, len(items))
+
+    def append(self, value: _E):
+        if self._chunks and type(self._chunks[-1][0]) is list:
+            elements, start, stop = self._chunks[-1]
+            if stop == len(elements):
+                # the last chunk is a list of the chain's own
+                elements.append(value)
+                self._chunks[-1] = (elements, start, stop + 1)
+                self._ends[-1] += 1
+                return
+        self._add([value], 0, 1)
+
+    def extend(self, values: Iterable[_E]):
+        if isinstance(values, Elements):
+            self._add(values, 0, len(values))
+        elif isinstance(values, Chain):
+            for elements, start, stop in values._chunks:
+                if isinstance(elements, list):
+                    # lists are owned by the chain they are in
+                    self._add(elements[start:stop], 0, stop - start)
+                else:
+                    self._add(elements, start, stop)
+        else:
+            values = list(values)
+            self._add(values, 0, len(values))
+
+    def clear(self):
+        self._chunks, self._ends = [], []
+
+    def copy(self) -> Chain:
+        """Copy, the elements are shared"""
+        chain = Chain()
+        chain.extend(self)
+        return chain
+
+    def __add__(self, other: list) -> list:
+        return list(self) + list(other)
+
+    def __radd__(self, other: list) -> list:
+        return list(other) + list(self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, MutableSequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
@@ -5,8 +5,10 @@ from __future__ import annotations
 from copy import deepcopy
 from typing import TYPE_CHECKING, Self
 
-from IPython.display import Math, display
+from numpy import array as nparray
+from numpy import ndarray
 
+from ..utils.display import Math, display
 from .cases import FCase
 
 if TYPE_CHECKING:
@@ -122,10 +124,13 @@ class C:
         if self.parent is None:
             # if this is a constraint set, birth constraints
             self._ = [
-                C(function=f, leq=self.leq, parent=self, pos=n, nn=self.nn)
+                _C(function=f, leq=self.leq, parent=self, pos=n, nn=self.nn)
                 for n, f in enumerate(self.function)
                 if f
             ]
+            # duals and sensitivity ranges of LP solves, given by the program
+            # arrays over Prg.cons(), see .dual()
+            self.sensitivity: dict[int, dict[str, ndarray]] = {}
         else:
             # single constraint of a constraint set
             self._ = [self]
@@ -284,8 +289,70 @@ class C:
 
             else:
                 for c in self._:
+                    if n_sol not in c.function.X:
+                        # not set from the activities (see Prg.function_values())
+                        c.function.solution(n_sol)
                     display(Math(c.function.latex() + r"=" + rf"{c.function.X[n_sol]}"))
 
+    def _sensitivity(self, attr: str, n_sol: int | None = None) -> ndarray:
+        """
+        Values of a sensitivity attribute (Pi, Slack, SARHSLow, SARHSUp) for the constraints
+
+        :param attr: attribute
+        :type attr: str
+        :param n_sol: solution number. Defaults to the last LP solution.
+        :type n_sol: int | None, optional
+
+        :returns: value for each constraint in the set
+        :rtype: ndarray
+
+        :raises ValueError: If there are no duals for the solution
+        """
+        if n_sol is None:
+            n_sol = max(self.sensitivity, default=None)
+        if n_sol not in self.sensitivity:
+            raise ValueError(f"{self}: no duals for solution {n_sol}, solve as an LP")
+        return self.sensitivity[n_sol][attr][nparray([c.n for c in self._], dtype=int)]
+
+    def dual(self, n_sol: int | None = None) -> ndarray:
+        """
+        Duals (shadow prices) of the constraints,
+        nan for nonnegativity constraints (bounds)
+
+        :param n_sol: solution number. Defaults to the last LP solution.
+        :type n_sol: int | None, optional
+
+        :returns: dual of each constraint in the set
+        :rtype: ndarray
+        """
+        return self._sensitivity("Pi", n_sol)
+
+    def slack(self, n_sol: int | None = None) -> ndarray:
+        """
+        Slack in the constraints as reported by the solver
+
+        :param n_sol: solution number. Defaults to the last LP solution.
+        :type n_sol: int | None, optional
+
+        :returns: slack of each constraint in the set
+        :rtype: ndarray
+        """
+        return self._sensitivity("Slack", n_sol)
+
+    def rhs_range(self, n_sol: int | None = None) -> tuple[ndarray, ndarray]:
+        """
+        Range of the RHS (B) over which the duals hold
+
+        :param n_sol: solution number. Defaults to the last LP solution.
+        :type n_sol: int | None, optional
+
+        :returns: lower and upper end for each constraint in the set
+        :rtype: tuple[ndarray, ndarray]
+        """
+        return self._sensitivity("SARHSLow", n_sol), self._sensitivity(
+            "SARHSUp", n_sol
+        )
+
     # -----------------------------------------------------
     #                    Operators
     # -----------------------------------------------------
@@ -381,3 +448,30 @@ class C:
         except AttributeError:
             # Fallback for uninitialized state during unpickling
             return id(self)
+
+
+class _C(C):
+    """
+    A constraint, i.e. an element of a constraint set.
+
+    Made by C when birthing constraints, never declared by the user.
+    """
+
+    __slots__ = (
+        "function",
+        "index",
+        "variables",
+        "leq",
+        "map",
+        "struct",
+        "parent",
+        "pos",
+        "nn",
+        "args",
+        "binding",
+        "cons_by_pos",
+        "_",
+        "n",
+        "pname",
+        "category",
+    )
@@ -5,9 +5,15 @@ from __future__ import annotations
 from functools import cached_property
 from itertools import product
 from typing import TYPE_CHECKING, Self
+from warnings import warn
 
-from IPython.display import Math, display
+from numpy import array as nparray
+from numpy import hstack as nphstack
+from numpy import isnan as npisnan
+from numpy import ndarray
+from numpy import repeat as nprepeat
 
+from ..utils.display import Math, display
 from .birth import make_P, make_T
 from .cases import Elem, FCase, PCase
 from .constraint import C
@@ -97,10 +103,16 @@ class F:
     :vartype pname: str
     :ivar elmo: Elements with relation (also a sesame street character)
     :vartype elmo: dict[int, list[P | V | T | str]]
+    :ivar parameter_sets: Parameter sets (by identity) the function set is made from
+    :vartype parameter_sets: tuple[P, ...]
 
     :raises ValueError: If none of `mul`, `add`, `sub`, or `div` is True
     """
 
+    # set when a function set is made from parameter sets, see .refresh()
+    # the functions birthed do not keep them
+    parameter_sets: tuple[P, ...] = ()
+
     def __init__(
         self,
         # ------Elements -----------
@@ -172,7 +184,7 @@ class F:
             self._ = []
             self.n = 0
             self.name, self.pname = "", ""
-            self.A, self.P, self.Y, self.Z, self.B, self.F = ([] for _ in range(6))
+            self.A, self.P, self.Y, self.Z, self.B, self.F = [], [], [], [], [], []
             self.variables = []
 
         elif one is not None or two is not None:
@@ -224,6 +236,7 @@ class F:
 
             # donot birth for birthed functions
             if self.parent is None:
+                self.parameter_sets = self.made_from()
                 # needs the mismatch to generate matrices
                 self.generate_matrices()
                 # matrix is passed on to the birthed functions
@@ -259,7 +272,7 @@ class F:
             self._ = []
             self.n = 0
             self.name, self.pname = "", ""
-            self.A, self.P, self.Y, self.Z, self.B, self.F = ([] for _ in range(6))
+            self.A, self.P, self.Y, self.Z, self.B, self.F = [], [], [], [], [], []
             self.variables = []
 
         self.give_name()
@@ -560,6 +573,10 @@ class F:
         _one_map = list(self._one_map)
         _two_map = list(self._two_map)
 
+        # if there are skipped variables, the coefficients (nan) need to be dropped
+        # else the children take a view of their row
+        _skips = isinstance(self.A, ndarray) and npisnan(self.A).any()
+
         for n in range(n_elements):
 
             one = self._one[n]
@@ -605,7 +622,7 @@ class F:
 
                 index = tuple(index)
 
-                f = F()
+                f = _F()
                 f.parent = self
                 f.index = index
 
@@ -631,7 +648,10 @@ class F:
                 f.update_variables()
                 f.give_name()
                 f.map[one_idx, two_idx] = f
-                f.A = self.A[n]
+                if _skips:
+                    f.A = self.A[n][~npisnan(self.A[n])]
+                else:
+                    f.A = self.A[n]
                 f.B = self.B[n]
 
             # update the map
@@ -661,6 +681,86 @@ class F:
         # make a matrix of positions of the variables
         self.P = [v.n for v in self.variables if v is not None]
 
+    def made_from(self) -> tuple[P, ...]:
+        """
+        Parameter sets (by identity) that the parameters in one and two are made from
+
+        :returns: parameter sets
+        :rtype: tuple[P, ...]
+        """
+        parameter_sets = []
+        for elem, elem_type in [(self.one, self.one_type), (self.two, self.two_type)]:
+            if elem_type == Elem.P:
+                sources = elem.sources
+            elif elem_type == Elem.F:
+                sources = elem.parameter_sets
+            else:
+                continue
+            for source in sources:
+                if all(source is not p for p in parameter_sets):
+                    parameter_sets.append(source)
+        return tuple(parameter_sets)
+
+    def uses(self, parameter: P) -> bool:
+        """
+        Whether the function set is made from a parameter set
+
+        :param parameter: parameter set
+        :type parameter: P
+
+        :returns: True if the parameter set features
+        :rtype: bool
+        """
+        return any(p is parameter for p in self.parameter_sets)
+
+    def refresh(self, parameter: P) -> Self:
+        """
+        Makes the function again with the values that a parameter set has now.
+        The coefficients (A) and RHS (B) are copied from the parameters when a function is made,
+        so they do not change with the parameter set.
+
+        Parameters made from the set and something else (e.g. parameter*2) are not followed,
+        a warning is raised for those.
+
+        :param parameter: parameter set (declared in the program) whose values have changed
+        :type parameter: P
+
+        :returns: new function, self if the parameter set does not feature
+        :rtype: F
+        """
+        if not self.uses(parameter):
+            return self
+
+        def _refresh(elem, elem_type: Elem) -> tuple[P | V | T | Self, bool]:
+            # the element made again, and whether it has changed
+            if elem_type == Elem.P:
+                if elem.source is parameter:
+                    # a call with the whole index gives the set itself
+                    if elem.case == PCase.NEGSET:
+                        return -parameter(*elem.index), True
+                    return parameter(*elem.index), True
+                if any(source is parameter for source in elem.sources):
+                    warn(
+                        f"{elem} is made from {parameter}, declare {self} again to update it"
+                    )
+                return elem, False
+
+            if elem_type == Elem.F and elem.parent is None:
+                # summations (sigma) are made from variables only
+                _elem = elem.refresh(parameter)
+                return _elem, _elem is not elem
+
+            return elem, False
+
+        one, one_changed = _refresh(self.one, self.one_type)
+        two, two_changed = _refresh(self.two, self.two_type)
+
+        if not (one_changed or two_changed):
+            return self
+
+        # one and two are already in the consistent form
+        return F(one=one, two=two, **{**self.args, "consistent": True})
+
     def give_name(self):
         """Gives a name to the function"""
 
@@ -790,31 +890,30 @@ class F:
         #     self.B = [0] * len(self.index)
 
         # else:
-        # update the elements in the function
-        if self.one_type == Elem.F:
-            # two can be F, V, P, or T
+        # A is a block of coefficients (rows x terms)
+        # positions is a block of the ordinals of the variables (rows x terms)
+        # a skipped variable has a nan coefficient and position -1
 
-            self.variables.extend(self.one.variables)
-            # irrespective, we only need to take A here
-            if self.mis > 0:
-                # if there is a mismatch,
-                # positive indicates that two is longer
-                # so scale the A to match
-                self.A = [row[:] for _ in range(self.mis) for row in self.one.A]
-            else:
-                self.A = self.one.A
+        def stretch(block: ndarray, by: int) -> ndarray:
+            # stretches a block to the length of the longer side
+            # every row is repeated, as are the elements (see handle_mismatch)
+            if by > 1:
+                return nprepeat(block, by, axis=0)
+            return block
 
-        elif self.one_type == Elem.V:
+        # update the elements in the function
+        if self.one_type in [Elem.F, Elem.V]:
             # two can be F, V, P, or T
-            self.variables.append(self.one)
-            # irrespective, we only need to take A here
-            if self.mis > 0:
-                # if there is a mismatch,
-                # positive indicates that two is longer
-                # so scale the A to match
-                self.A = [row[:] for _ in range(self.mis) for row in self.one.A]
+            if self.one_type == Elem.F:
+                self.variables.extend(self.one.variables)
             else:
-                self.A = self.one.A
+                self.variables.append(self.one)
+            # irrespective, we only need to take A here
+            # if there is a mismatch,
+            # positive indicates that two is longer
+            # so scale the A to match
+            self.A = stretch(self.one.A, self.mis)
+            self.positions = stretch(self.one.positions, self.mis)
 
         elif self.one_type == Elem.T:
             # TODO Bilevel: this is only possible for multiplication of variable/function with theta
@@ -827,21 +926,25 @@ class F:
             if self.mul:
                 if self.two_type == Elem.F and self.two.case == FCase.SUM:
                     if self.two.parent is not None:
-                        self.A = [self.one._[n] * i for n, i in enumerate(self.two.A)]
+                        # a single summation (row), blocks are rows x terms
+                        self.A = (
+                            nparray(self.one._[: len(self.two.A)], dtype=float)
+                            * self.two.A
+                        ).reshape(1, -1)
+                        self.positions = nparray([self.two.P])
                     else:
-                        self.A = [
-                            [self.one._[n] * i for i in j]
-                            for n, j in enumerate(self.two.A)
-                        ]
+                        # every row is multiplied by a parameter
+                        self.A = (
+                            nparray(self.one._[: len(self.two.A)], dtype=float)[:, None]
+                            * self.two.A
+                        )
+                        self.positions = self.two.positions
                 else:
                     # so you A is a the parameter matrix
-                    # self.A = self.one.A
-                    if self.mis > 0:
-                        # if there is a mismatch,
-                        # positive indicates that two is longer
-                        self.A = [row[:] for _ in range(self.mis) for row in self.one.A]
-                    else:
-                        self.A = self.one.A
+                    # if there is a mismatch,
+                    # positive indicates that two is longer
+                    self.A = stretch(self.one.A, self.mis)
+                    self.positions = stretch(self.two.positions, -self.mis)
 
                 # at this point, it can be of the type P*(V|F)
                 # if F = V +- P, we use the operation P*V +- P*P
@@ -860,44 +963,25 @@ class F:
                     self.B = [0] * len(self._one)
 
         # update the elements in the function
-        if self.two_type == Elem.F:
+        if self.two_type in [Elem.F, Elem.V]:
             # one could have been a V, T, or F
-            self.variables.extend(self.two.variables)
-            if self.one_type in [Elem.F, Elem.V]:
-                # if V or F, A definitely exists, so update A
-                if self.mis < 0:
-                    # if there is a mismatch,
-                    # negative indicates that one is longer
-                    # scale two's A to correct mismatch
-                    _A = [row[:] for _ in range(-self.mis) for row in self.two.A]
-
-                else:
-                    _A = self.two.A
-                if self.add:
-                    self.A = [a + b for a, b in zip(self.A, _A)]
-                if self.sub:
-                    self.A = [a + [-bb for bb in b] for a, b in zip(self.A, _A)]
-
-        elif self.two_type == Elem.V:
-            # one could have been a V, T, or F
-            self.variables.append(self.two)
+            if self.two_type == Elem.F:
+                self.variables.extend(self.two.variables)
+            else:
+                self.variables.append(self.two)
 
-            if self.one_type in [Elem.F, Elem.V]:
+            if self.one_type in [Elem.F, Elem.V] and (self.add or self.sub):
                 # if V or F, A definitely exists, so update A
-                if self.mis < 0:
-                    # if there is a mismatch,
-                    # negative indicates that one is longer
-                    # scale two's A to correct mismatch
-                    _A = [row[:] for _ in range(-self.mis) for row in self.two.A]
-                else:
-                    _A = self.two.A
-
-                if self.add:
-
-                    self.A = [a + b for a, b in zip(self.A, _A)]
-
+                # if there is a mismatch,
+                # negative indicates that one is longer
+                # scale two's A to correct mismatch
+                _A = stretch(self.two.A, -self.mis)
                 if self.sub:
-                    self.A = [a + [-bb for bb in b] for a, b in zip(self.A, _A)]
+                    _A = -_A
+                self.A = nphstack([self.A, _A])
+                self.positions = nphstack(
+                    [self.positions, stretch(self.two.positions, -self.mis)]
+                )
 
         elif self.two_type == Elem.T:
             # if self.one_type == Elem.F and self.one.two_type == Elem.T:
@@ -922,7 +1006,8 @@ class F:
                     # if there is a mismatch,
                     # negative indicates that one is longer
                     # so scale the parameter to match
-                    self.B = [-b for b in self.two._] * (-self.mis)
+                    # every value is repeated, as are the elements
+                    self.B = [-b for b in self.two._ for _ in range(-self.mis)]
                 else:
                     self.B = [-b for b in self.two._]
             elif self.sub:
@@ -932,7 +1017,8 @@ class F:
                     # if there is a mismatch,
                     # negative indicates that one is longer
                     # so scale the parameter to match
-                    self.B = self.two._ * (-self.mis)
+                    # every value is repeated, as are the elements
+                    self.B = [b for b in self.two._ for _ in range(-self.mis)]
                 else:
                     self.B = self.two._
 
@@ -998,7 +1084,11 @@ class F:
             else:
                 oneissum = v.name
 
-            ltx = rf"\sum_{{i \in {over.ltx}}} {oneissum}_{{{index}}}"
+            if isinstance(over, tuple):
+                # summed over the entire set
+                ltx = rf"\sum_{{{index}}} {oneissum}_{{{index}}}"
+            else:
+                ltx = rf"\sum_{{i \in {over.ltx}}} {oneissum}_{{{index}}}"
 
             if self.case == FCase.NEGSUM:
                 # if this is a summation
@@ -1780,7 +1870,9 @@ class F:
         # create a new function set to return
         f = F(**self.args)
         f.name, f.pname, f.n = self.name, self.pname, self.n
+        f.parameter_sets = self.parameter_sets
         f.A = []
+        f.positions = []
         f.B = []
         f.P = []
         f.index = key
@@ -1866,13 +1958,72 @@ class F:
                 ]
                 f.rhs_thetas = [t(*i) for t, i in zip(self.rhs_thetas, theta_index)]
                 f.A.append(self.A[function.n])
+                f.positions.append(self.positions[function.n])
                 f.B.append(self.B[function.n])
                 f.P.append(self.P[function.n])
 
             f._.append(function)
 
+        if f.A:
+            # rows taken from the blocks
+            f.A = nparray(f.A)
+            f.positions = nparray(f.positions)
+
+        return f
+
+    def element_at(self, pos: int) -> _F:
+        """
+        Makes the function (row) at a position in a summation, see sigma
+
+        :param pos: position in the summation
+        :type pos: int
+
+        :returns: Function
+        :rtype: _F
+        """
+        variable, over, position = self.issumhow
+        f = _F()
+        f.variables = [variable._[i] for i in self._order[:, pos].tolist()]
+        f.P = self.P[pos]
+        f.A = self.A[pos]
+        index = self.map.index_at(pos)
+        f.issumhow = (variable[len(over) * pos], over, position)
+        f.parent = self
+        f.case = FCase.SUM
+        f.rhs_thetas = []
+        f.give_name()
+        f._ = [f]
+        f.map[index] = f
+        f.index = index
+        f.one = f
+        f.one_type = Elem.F
         return f
 
+    def member_at(self, pos: int) -> V:
+        """
+        Makes the variable set summed at a position of the index summed over,
+        in a summation, see sigma
+
+        Same as calling the variable set with the element of the index at pos
+
+        :param pos: position in the index summed over
+        :type pos: int
+
+        :returns: Variable set
+        :rtype: V
+        """
+        from .variable import V
+
+        variable, over, position = self.issumhow
+        at = self._order[pos]
+        v = V(**variable.args)
+        v.name, v.n = variable.name, variable.n
+        v.index = self.index[pos]
+        v._ = [variable._[i] for i in at.tolist()]
+        v.map = dict(zip([variable.map.index_at(i) for i in at.tolist()], v._))
+        v._ordinals = variable.ordinals[at]
+        return v
+
     def __getitem__(self, pos: int) -> F:
         return self._[pos]
 
@@ -1977,3 +2128,49 @@ class F:
         except AttributeError:
             # Fallback for uninitialized state during unpickling
             return id(self)
+
+
+class _F(F):
+    """
+    A function, i.e. an element of a function set.
+
+    Made when birthing functions, never declared by the user.
+    """
+
+    __slots__ = (
+        "parent",
+        "pos",
+        "n",
+        "_",
+        "map",
+        "index",
+        "case",
+        "consistent",
+        "issumhow",
+        "X",
+        "calculation",
+        "category",
+        "_matrix",
+        "mis",
+        "_one",
+        "_two",
+        "one",
+        "two",
+        "mul",
+        "add",
+        "sub",
+        "div",
+        "rel",
+        "one_type",
+        "two_type",
+        "args",
+        "name",
+        "pname",
+        "A",
+        "P",
+        "Y",
+        "Z",
+        "B",
+        "F",
+        "variables",
+    )
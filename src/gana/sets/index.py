@@ -4,8 +4,7 @@ import logging
 from operator import is_
 from typing import Self
 
-from IPython.display import Math, display
-
+from ..utils.display import Math, display
 from .cases import ICase
 
 logger = logging.getLogger("gana")
@@ -163,21 +162,12 @@ class I:
             # (once the name is set)
             # for an ordered index set
             # create new index
-            index = I()
+            # give the name, set that this is ordered
+            index = _I(rf"{self}[{self.start + n}]", ordered=True)
             # append parent
             index.parent.append(self)
             # update position in parent
             index.pos.append(n)
-            # set that this is ordered
-            index.ordered = True
-            # give the name
-            index.name = rf"{self}[{self.start + n}]"
-            index._hash = hash(index.name)
-            # the only element in element (index set of size one)
-            # is itself
-            index._ = [index]
-            index.size = 1
-            index.members = [index.name]
             self._.append(index)
             # index.ltx = r"{" + rf"{self.ltx}_{n}" + r"}"
 
@@ -542,3 +532,59 @@ class I:
     #     logger.warning(
     #         "⚠ pyomo is an optional dependency, pip install gana[all] to get optional dependencies ⚠"
     #     )
+
+
+class _I(I):
+    """
+    An index, i.e. an element of an index set.
+
+    Made by I.birth_elements and Prg.add_indices, never declared by the user.
+
+    :param name: Name of the index
+    :type name: str
+    :param ordered: True if from an ordered set, None otherwise
+    :type ordered: bool | None
+    """
+
+    __slots__ = (
+        "tag",
+        "mutable",
+        "name",
+        "n",
+        "start",
+        "parent",
+        "pos",
+        "_",
+        "slice",
+        "size",
+        "members",
+        "ordered",
+        "_ltx",
+        "case",
+        "_hash",
+    )
+
+    # indices do not keep track of these
+    parameters = variables = functions = constraints = ()
+
+    def __init__(self, name: str, ordered: bool | None):
+        self.tag = None
+        self.mutable = False
+        self.name = name
+        self._hash = hash(name)
+        self.n = None
+        self.start = 0
+        self.parent: list[I] = []
+        self.pos: list[int] = []
+        # the only element in element (index set of size one)
+        # is itself
+        self._ = [self]
+        self.slice = None
+        self.ordered = ordered
+        if ordered:
+            self.size = 1
+            self.members = [name]
+        else:
+            self.members = []
+        self._ltx = None
+        self.case = None
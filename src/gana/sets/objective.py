@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from IPython.display import Math, display
+from ..utils.display import Math, display
 
 if TYPE_CHECKING:
     from .function import F
@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import logging
+from functools import wraps
 from itertools import product
-from typing import TYPE_CHECKING, Self
+from typing import TYPE_CHECKING, Callable, Self
 from warnings import warn
 
-from IPython.display import Math, display
+from numpy import array as nparray
+from numpy import ndarray
 
+from ..utils.display import Math, display
 from ..utils.draw import draw
 from ._element import _E
 from .birth import make_T
@@ -37,6 +40,36 @@ except ImportError:
     has_sympy = False
 
 
+def derived(operation: Callable) -> Callable:
+    """
+    Parameter sets made by an operation keep the parameter sets
+    they are made from (P.sources), see F.refresh()
+
+    :param operation: operation of a parameter set
+    :type operation: Callable
+
+    :returns: operation that sets the sources of the parameter set made
+    :rtype: Callable
+    """
+
+    @wraps(operation)
+    def wrapper(self: P, *args):
+        result = operation(self, *args)
+        if not isinstance(result, P) or any(result is a for a in (self, *args)):
+            return result
+        sources = []
+        for a in (self, *args):
+            if not isinstance(a, P):
+                continue
+            for source in a.sources:
+                if all(source is not s for s in sources):
+                    sources.append(source)
+        result.sources = sources
+        return result
+
+    return wrapper
+
+
 class P(_E):
     """
     Ordered set of parameters.
@@ -68,6 +101,10 @@ class P(_E):
     :vartype map: dict[X | Idx, Var]
     :ivar case: Special case of the parameter set
     :vartype case: PCase
+    :ivar source: Parameter set this is (a subset of, or the negation of)
+    :vartype source: P
+    :ivar sources: Parameter sets the values are made from
+    :vartype sources: list[P]
 
     :raises ValueError: If `!=` operator is used with any type other than `P`
     :raises ValueError: If the parameter values and the length of indices do not match
@@ -90,6 +127,11 @@ class P(_E):
         # special case of the parameter
         self.case: PCase = PCase.SET
 
+        # the parameter set (by identity) this is, or is taken from (call, negation)
+        # and the parameter sets the values are made from (see derived)
+        self.source: P = self
+        self.sources: list[P] = [self]
+
         # No value is provided
         if _ is None:
             self._ = []
@@ -143,9 +185,9 @@ class P(_E):
     #                   Matrix
     # -----------------------------------------------------
     @property
-    def A(self) -> list[list[float]]:
-        """Generate a diagonal matrix representation of the variable set"""
-        return [[self._[i]] for i in range(len(self))]
+    def A(self) -> ndarray:
+        """Coefficient block of the parameter set (one column)"""
+        return nparray(self._, dtype=float)[:, None]
 
     # -----------------------------------------------------
     #                    Printing
@@ -199,6 +241,7 @@ class P(_E):
     #                    Value
     # -----------------------------------------------------
 
+    @derived
     def __neg__(self):
         if self.case == PCase.ZERO:
             # if zero return self
@@ -211,6 +254,7 @@ class P(_E):
 
         # else negate the number and return a new parameter set
         p = P(*self.index, _=[-i for i in self._], **self.args)
+        p.source = self.source
         if self.case == PCase.NEGSET:
             # if this is already a negated set
             # make it a normal set now
@@ -224,6 +268,7 @@ class P(_E):
         # return the new parameter set
         return p
 
+    @derived
     def __pos__(self):
 
         if self.case == PCase.NEGNUM:
@@ -234,6 +279,7 @@ class P(_E):
         if self.case == PCase.NEGSET:
             p = P(*self.index, _=[-i for i in self._], **self.args)
             p.name = self.name[1:]  # remove the negative sign
+            p.source = self.source
             return p
 
         # if self.case in [PCase.ZERO, PCase.SET, PCase.NUM]:
@@ -241,6 +287,7 @@ class P(_E):
         # return itself
         return self
 
+    @derived
     def __abs__(self):
         if self.case == PCase.ZERO:
             # if zero return self
@@ -278,6 +325,7 @@ class P(_E):
     # does not have the operation/the operation did not work
     # in this case, we just do the equivalent self
 
+    @derived
     def __add__(
         self,
         other: (
@@ -400,6 +448,7 @@ class P(_E):
         # P + E = E + P
         return F(one=other, add=True, two=self, two_type=Elem.P)
 
+    @derived
     def __radd__(
         self,
         other: (
@@ -417,6 +466,7 @@ class P(_E):
         # let __add__() handle the addition
         return self + other
 
+    @derived
     def __sub__(
         self,
         other: (
@@ -535,6 +585,7 @@ class P(_E):
         # P - E = -E + P
         return F(one=-other, add=True, two=self, two_type=Elem.P)
 
+    @derived
     def __rsub__(
         self,
         other: (
@@ -552,6 +603,7 @@ class P(_E):
         # let negation and __add__ handle the subtraction
         return -self + other
 
+    @derived
     def __mul__(
         self,
         other: (
@@ -690,6 +742,7 @@ class P(_E):
 
         # return F(one=self, mul=True, two=other, one_type=Elem.P)
 
+    @derived
     def __rmul__(
         self,
         other: (
@@ -707,6 +760,7 @@ class P(_E):
         # multiplication is commutative
         return self * other
 
+    @derived
     def __truediv__(
         self,
         other: (
@@ -822,6 +876,7 @@ class P(_E):
             # handle division by zero
             raise ZeroDivisionError(f"{self} cannot be divided by zero.") from e
 
+    @derived
     def __rtruediv__(
         self,
         other: (
@@ -839,6 +894,7 @@ class P(_E):
         # just do this operation instead
         return (1 / self) * other
 
+    @derived
     def __floordiv__(
         self,
         other: (
@@ -940,6 +996,7 @@ class P(_E):
         # else let the other handle the division
         return self // other
 
+    @derived
     def __mod__(
         self,
         other: (
@@ -1049,6 +1106,7 @@ class P(_E):
         # else let the other handle the modulus
         return self % other
 
+    @derived
     def __pow__(
         self,
         other: (
@@ -1564,6 +1622,7 @@ class P(_E):
         # create a new variable set to return
         p = P(**self.args)
         p.name, p.n = self.name, self.n
+        p.source, p.sources = self.source, self.sources
         p.index = key
 
         # should be able to map these
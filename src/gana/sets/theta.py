@@ -8,9 +8,8 @@ from math import prod
 from typing import TYPE_CHECKING, Self
 from warnings import warn
 
-from IPython.display import Math, display
-
-from ._element import _E
+from ..utils.display import Math, display
+from ._element import ElementMap, Elements, _E
 from .birth import make_P
 from .cases import Elem
 from .function import F
@@ -75,6 +74,55 @@ class T(_E):
         # flag to check if the set has been birthed
         self.birthed = False
 
+    # -----------------------------------------------------
+    #                    Elements
+    # -----------------------------------------------------
+
+    # containers that birthed thetas only get if asked for
+    _containers = {
+        "_": lambda t: [t],
+        "elements": lambda t: [t],
+        "map": lambda t: {t.index: t},
+    }
+
+    # shared by birthed thetas
+    pos = None
+    birthed = False
+    _mutating = False
+    _n_start = 0
+
+    @staticmethod
+    def element(
+        parent: T, n: int, index: tuple[I, ...], pos: int | None, name: str = ""
+    ) -> T:
+        """
+        Makes a parametric variable (element) of a theta set
+
+        :param parent: Theta set the parametric variable belongs to
+        :type parent: T
+        :param n: This is the nth parametric variable declared
+        :type n: int
+        :param index: Index of the parametric variable
+        :type index: tuple[I, ...]
+        :param pos: Position in the parent set
+        :type pos: int | None
+        :param name: Name of the parametric variable. Defaults to ''.
+        :type name: str, optional
+
+        :returns: Parametric variable
+        :rtype: T
+        """
+        theta = _T.__new__(_T)
+        theta.tag = parent.tag
+        theta._ltx = parent._ltx
+        theta.mutable = parent.mutable
+        theta.name = name or "θ"
+        theta.index = index
+        theta.n = n
+        theta.parent = parent
+        theta.pos = pos
+        return theta
+
     # -----------------------------------------------------
     #                    Helpers
     # -----------------------------------------------------
@@ -101,49 +149,73 @@ class T(_E):
     def birth_thetas(self, mutating: bool = False, n_start=0):
         """Births a parametric variable (Theta) at every index in the index set
 
+        The parametric variables are only made when asked for (see .element_at()).
+        Theta sets over more than one index set are made at once.
+
         :param mutating: If the variable set is being mutated. Defaults to False.
         :type mutating: bool, optional
         :param n_start: The starting number for positioning the variables. Defaults to 0.
         :type n_start: int, optional
         """
+        # the element set only contains tuples (bounds)
+        self._bounds = self._
+        self._mutating = mutating
+        self._n_start = n_start
+
+        if isinstance(self.index, tuple) and len(self._) == len(self.map):
+            elements = Elements(self, len(self.map))
+            _map = ElementMap(elements, self.index)
+            if _map.size == len(self.map):
+                self._ = elements
+                self.map = _map
+                # set the birthing flag
+                self.birthed = True
+                return
+
+        self._bounds = list(self._)
         for pos, idx in enumerate(self.map):
             # create a theta at every index
-
-            theta = T(**self.args)
-
-            # set parent to self
-            theta.parent = self
-
-            # this is the nth parametric variable set declared
-            theta.n = n_start + pos
-
-            if not mutating:
-                # give self + pos as name
-                theta.name = f"{self.name}[{pos}]"
-                # give position
-                theta.pos = pos
-
-            # give the index
-            theta.index = idx
-
-            # kind of recursive, but for elemental sets
-            # the element set only contains a tuple
-            theta.lb = self._[pos][0]
-            theta.ub = self._[pos][1]
-            theta._ = [theta]
-
-            # theta._ = self._[pos]
+            theta = self._element(idx, pos)
 
             # append the new parametric variable to the set
             self._[pos] = theta
 
-            # update the maps for both self and theta
+            # update the map of self
             self.map[idx] = theta
-            theta.map[idx] = theta
 
         # set the birthing flag
         self.birthed = True
 
+    def element_at(self, pos: int) -> T:
+        """
+        Makes the parametric variable at a position in the set, see .birth_thetas()
+
+        :param pos: position in the set
+        :type pos: int
+
+        :returns: Parametric variable
+        :rtype: T
+        """
+        return self._element(self.map.index_at(pos), pos)
+
+    def _element(self, index: tuple[I, ...], pos: int) -> T:
+        # this is the nth parametric variable set declared
+        if self._mutating:
+            theta = T.element(self, n=self._n_start + pos, index=index, pos=None)
+        else:
+            # give self + pos as name
+            # and the position
+            theta = T.element(
+                self,
+                n=self._n_start + pos,
+                index=index,
+                pos=pos,
+                name=f"{self.name}[{pos}]",
+            )
+        theta.lb = self._bounds[pos][0]
+        theta.ub = self._bounds[pos][1]
+        return theta
+
     # -----------------------------------------------------
     #                   Matrix
     # -----------------------------------------------------
@@ -453,3 +525,27 @@ class T(_E):
             t._.append(theta)
 
         return t
+
+
+class _T(T):
+    """
+    A parametric variable, i.e. an element of a theta set.
+
+    Made by T.birth_thetas, never declared by the user.
+    """
+
+    __slots__ = (
+        "tag",
+        "_ltx",
+        "mutable",
+        "name",
+        "index",
+        "n",
+        "parent",
+        "pos",
+        "lb",
+        "ub",
+        # made when asked for
+        "_",
+        "map",
+    )
@@ -6,10 +6,15 @@ import logging
 from itertools import product
 from typing import TYPE_CHECKING, Self
 
-from IPython.display import Math, display
+from numpy import arange as nparange
+from numpy import array as nparray
+from numpy import nan as npnan
+from numpy import ndarray
+from numpy import where as npwhere
 
+from ..utils.display import Math, display
 from ..utils.draw import draw
-from ._element import _E
+from ._element import ElementMap, Elements, _E
 from .birth import make_P, make_T
 from .cases import Elem, FCase
 from .constraint import C
@@ -67,10 +72,10 @@ class V(_E):
 
     :ivar index: Index of the variable set (product of all indices)
     :vartype index: I
-    :ivar map: Index to variable mapping
-    :vartype map: dict[I, V]
-    :ivar _: List of variables in the set
-    :vartype _: list[V]
+    :ivar map: Index to variable mapping, ElementMap once born
+    :vartype map: dict[I, V] | ElementMap
+    :ivar _: List of variables in the set, made when asked for once born
+    :vartype _: list[V] | Elements
     :ivar itg: Integer variable set flag
     :vartype itg: bool
     :ivar nn: Non-negative variable set flag
@@ -173,6 +178,137 @@ class V(_E):
         # evaluations using parametric solutions
         self.evaluation: dict[int, dict[tuple[float, ...], float]] = {}
 
+        # reduced costs and sensitivity ranges of LP solves, given by the program
+        # arrays over Prg.variables, see .reduced_cost()
+        self.sensitivity: dict[int, dict[str, ndarray]] = {}
+
+    # -----------------------------------------------------
+    #                   Elements
+    # -----------------------------------------------------
+
+    # attributes that the birthed variables (elements) share
+    # an element only gets its own value if it is set on the element
+    struct = (Elem.V, None)
+    case = FCase.VAR
+    copyof = None
+    n_splices = 1
+    make_copy = False
+    category = ""
+    pos = None
+
+    # ordinals (n) of the variables in the set, set on birth
+    _ordinals: ndarray | None = None
+    # positions of the indices of the variables, made on request
+    _codes: ndarray | None = None
+    # variables are born for a mutation, named by the existing set
+    _mutating = False
+
+    # containers that elements only get if asked for
+    # most of these stay empty for most elements
+    _containers = {
+        "cons_by": lambda v: [],
+        "min_by": lambda v: [],
+        "X": lambda v: {},
+        "eval_funcs": lambda v: {},
+        "evaluation": lambda v: {},
+        "_": lambda v: [v],
+        "variables": lambda v: [v],
+        "elements": lambda v: [v],
+        "map": lambda v: {v.index: v},
+        "P": lambda v: [v.n],
+    }
+
+    @staticmethod
+    def element(
+        parent: V, n: int, index: tuple[I, ...], pos: int | None, name: str = ""
+    ) -> V:
+        """
+        Makes a variable (element) of a variable set
+
+        Called when the variable is first asked for (see .element_at()),
+        only what is needed to identify it is set.
+        Containers (cons_by, X, etc.) are made when first accessed
+
+        :param parent: Variable set the variable belongs to
+        :type parent: V
+        :param n: This is the nth variable declared
+        :type n: int
+        :param index: Index of the variable
+        :type index: tuple[I, ...]
+        :param pos: Position in the parent set
+        :type pos: int | None
+        :param name: Name of the variable. Defaults to ''.
+        :type name: str, optional
+
+        :returns: Variable
+        :rtype: V
+        """
+        variable = _V.__new__(_V)
+        variable.tag = parent.tag
+        variable._ltx = parent._ltx
+        variable.mutable = parent.mutable
+        variable.name = name
+        variable.index = index
+        variable.n = n
+        variable.parent = parent
+        variable.itg = parent.itg
+        variable.bnr = parent.bnr
+        variable.nn = parent.nn
+        variable.pos = pos
+        variable.make_copy = False
+        return variable
+
+    @property
+    def ordinals(self) -> ndarray:
+        """Ordinals (n) of the variables in the set"""
+        if self._ordinals is None or len(self._ordinals) != len(self._):
+            # the set has been mutated or is a subset (call)
+            self._ordinals = nparray(
+                [-1 if v is None else v.n for v in self._], dtype=int
+            )
+        return self._ordinals
+
+    @property
+    def codes(self) -> ndarray:
+        """Positions of the indices of each variable in the index sets
+
+        A variable at (i[2], j[0]) has the codes [2, 0]
+
+        :returns: Array of shape (number of variables, number of indices)
+        :rtype: ndarray
+        """
+        if self._codes is not None and len(self._codes) == len(self.map):
+            return self._codes
+
+        if isinstance(self.map, ElementMap) and len(self.map) == self.map.size:
+            # born over the product of the index sets
+            self._codes = self.map.codes()
+            return self._codes
+
+        if isinstance(self.index, set):
+            # spliced variable sets are indexed over multiple index sets
+            raise ValueError(
+                f"{self}: codes are only available for variable sets over a single index"
+            )
+
+        # position of each element in the index sets
+        lookups = []
+        for index in self.index:
+            if isinstance(index, list):
+                # a variable as index
+                lookups.append({index[0]: 0})
+            else:
+                lookups.append({i: pos for pos, i in enumerate(index._)})
+
+        self._codes = nparray(
+            [
+                [lookup.get(i, -1) for lookup, i in zip(lookups, idx)]
+                for idx in self.map
+            ],
+            dtype=int,
+        ).reshape(len(self.map), len(lookups))
+        return self._codes
+
     @property
     def matrix(self) -> dict:
         """Matrix Representation"""
@@ -197,9 +333,14 @@ class V(_E):
     #                   Matrix
     # -----------------------------------------------------
     @property
-    def A(self) -> list[list[float]]:
-        """Generate a diagonal matrix representation of the variable set"""
-        return [[1] if self._[i] is not None else [] for i in range(len(self))]
+    def A(self) -> ndarray:
+        """Coefficient block of the variable set (one column), nan for skipped variables"""
+        return npwhere(self.ordinals < 0, npnan, 1.0)[:, None]
+
+    @property
+    def positions(self) -> ndarray:
+        """Position block of the variable set (one column), -1 for skipped variables"""
+        return self.ordinals[:, None]
 
     @property
     def features_in(self) -> list[C | O]:
@@ -238,7 +379,9 @@ class V(_E):
         v.index = tuple(self.index)
         v.map = self.map.copy()
         v.case = self.case
-        v._ = list(self._)
+        # variables not made yet are not made for the copy
+        v._ = self._.copy()
+        v._ordinals = self.ordinals
         v.copyof = self
         return v
 
@@ -246,45 +389,61 @@ class V(_E):
         """
         Births a variable at every index in the index set
 
+        The variables are numbered here, but made when asked for (see .element_at()).
+        Variable sets over more than one index set are made at once.
+
         :param mutating: If the variable set is being mutated. Defaults to False.
         :type mutating: bool, optional
         :param n_start: The starting number for positioning the variables. Defaults to 0.
         :type n_start: int, optional
         """
+        self._mutating = mutating
+
+        if isinstance(self.index, tuple):
+            elements = Elements(self, len(self.map))
+            _map = ElementMap(elements, self.index)
+            if _map.size == len(self.map):
+                self._ = elements
+                self.map = _map
+                # this is the nth variable declared
+                self._ordinals = nparange(n_start, n_start + len(self._))
+                return
+
+        # a variable set over several index sets (spliced)
         for pos, idx in enumerate(self.map):
             # create a variable at each index
-            variable = V(**self.args)
-
-            # set the parent to self
-            variable.parent = self
-            # for mutations variable names
-            # and positions will be set based on
-            # the existing variable.
-
-            # this is the nth variable declared
-            variable.n = n_start + pos
-
-            if not mutating:
-                # give the same name as self
-                variable.name = rf"{self}[{pos}]"
+            variable = self._element(idx, n=n_start + pos, pos=pos)
+            # append to the set of variables of self
+            self._.append(variable)
+            # update the index mapping
+            self.map[idx] = variable
 
-                # this is the position in the parent set
-                variable.pos = pos
+        # this is the nth variable declared
+        self._ordinals = nparange(n_start, n_start + len(self._))
 
-            # set the new variable's index
-            variable.index = idx
+    def element_at(self, pos: int) -> V:
+        """
+        Makes the variable at a position in the set, see .birth_variables()
 
-            # the new variable set has only
-            # one variable itself
-            # I get that this is like a recursive definition
-            variable._ = [variable]
+        :param pos: position in the set
+        :type pos: int
 
-            # append to the set of variables of self
-            self._.append(variable)
+        :returns: Variable
+        :rtype: V
+        """
+        return self._element(
+            self.map.index_at(pos), n=int(self._ordinals[pos]), pos=pos
+        )
 
-            # update the index mapping
-            self.map[idx] = variable
-            variable.map[idx] = variable
+    def _element(self, index: tuple[I, ...], n: int, pos: int) -> V:
+        if self._mutating:
+            # for mutations variable names
+            # and positions will be set based on
+            # the existing variable.
+            return V.element(self, n=n, index=index, pos=None)
+        # give the same name as self
+        # and the position in the parent set
+        return V.element(self, n=n, index=index, pos=pos, name=rf"{self}[{pos}]")
 
     # -----------------------------------------------------
     #                    Solution
@@ -366,6 +525,58 @@ class V(_E):
                 theta_vals,
             )
 
+    def _sensitivity(self, attr: str, n_sol: int | None = None) -> ndarray:
+        """
+        Values of a sensitivity attribute (RC, SAObjLow, SAObjUp) for the variables
+
+        :param attr: attribute
+        :type attr: str
+        :param n_sol: solution number. Defaults to the last LP solution.
+        :type n_sol: int | None, optional
+
+        :returns: value for each variable in the set
+        :rtype: ndarray
+
+        :raises ValueError: If there are no reduced costs for the solution
+        """
+        if n_sol is None:
+            n_sol = max(self.sensitivity, default=None)
+        if n_sol not in self.sensitivity:
+            raise ValueError(
+                f"{self}: no reduced costs for solution {n_sol}, solve as an LP"
+            )
+        ordinals = self.ordinals
+        values = self.sensitivity[n_sol][attr][ordinals]
+        # variables that are not in the set (None)
+        values[ordinals < 0] = npnan
+        return values
+
+    def reduced_cost(self, n_sol: int | None = None) -> ndarray:
+        """
+        Reduced costs of the variables
+
+        :param n_sol: solution number. Defaults to the last LP solution.
+        :type n_sol: int | None, optional
+
+        :returns: reduced cost of each variable in the set
+        :rtype: ndarray
+        """
+        return self._sensitivity("RC", n_sol)
+
+    def obj_range(self, n_sol: int | None = None) -> tuple[ndarray, ndarray]:
+        """
+        Range of the objective coefficients over which the solution stays optimal
+
+        :param n_sol: solution number. Defaults to the last LP solution.
+        :type n_sol: int | None, optional
+
+        :returns: lower and upper end for each variable in the set
+        :rtype: tuple[ndarray, ndarray]
+        """
+        return self._sensitivity("SAObjLow", n_sol), self._sensitivity(
+            "SAObjUp", n_sol
+        )
+
     # -----------------------------------------------------
     #                    Printing
     # -----------------------------------------------------
@@ -1140,3 +1351,34 @@ class V(_E):
         # For the love of god
         # Do not change this
         return len(self._)
+
+
+class _V(V):
+    """
+    A variable, i.e. an element of a variable set.
+
+    Made by V.birth_variables, never declared by the user.
+    Commonly set attributes are slotted, anything else
+    (rarely set on variables) goes into the instance dictionary.
+    """
+
+    __slots__ = (
+        "tag",
+        "_ltx",
+        "mutable",
+        "name",
+        "index",
+        "n",
+        "parent",
+        "pos",
+        "itg",
+        "bnr",
+        "nn",
+        "make_copy",
+        # made when asked for
+        "cons_by",
+        "min_by",
+        "X",
+        "_",
+        "map",
+    )
@@ -1,8 +1,10 @@
 """Decorators for functions"""
 
 import logging
-import time
 from functools import wraps
+from time import perf_counter_ns
+
+from . import tracing
 
 
 def once(func):
@@ -16,39 +18,48 @@ def once(func):
     return wrapper
 
 
+# category of the span and message logged for each kind
+KINDS: dict[str, tuple[str, str]] = {
+    "generate-mps": ("export", "📝  Generated {result}"),
+    "save": ("export", "💾  Saved {result}"),
+    "load": ("load", "📂  Loaded {result}"),
+    "generate-solution": (
+        "solution",
+        "📝  Generated Solution object for {result}. See .solution",
+    ),
+    "generate-ppopt": ("export", "📝  Generated MPLP. See .formulation"),
+    "generate-gurobi": ("export", "📝  Generated gurobipy model. See .formulation"),
+    "solve-mpqp": ("solve", "✅  Solved MPLP using PPOPT. See .solution"),
+    "optimize": (
+        "solve",
+        "✅  {result[0]} optimized using {result[1]}. Display using .output()",
+    ),
+}
+
+
 def timer(
     logger: logging.Logger, kind: str = None, with_return=True, level=logging.INFO
 ):
     """
     Logs execution time and optionally shows a full computation using function arguments and result.
+
+    Each call is also a span (see utils.tracing) named after the function,
+    in the category of the kind, if tracing.
     """
+    category, message = KINDS.get(kind, (kind or "", "{name} returned {result}"))
 
     def decorator(func):
+        name = func.__qualname__
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start = time.time()
+            start = perf_counter_ns()
             # returns the result if successful, else False
-            result = func(*args, **kwargs)
-            elapsed = time.time() - start
+            with tracing.span(name, category):
+                result = func(*args, **kwargs)
+            elapsed = (perf_counter_ns() - start) / 1e9
             if result:
-                if kind == 'generate-mps':
-                    msg = f"📝  Generated {result}.mps"
-
-                if kind == 'generate-solution':
-                    msg = f"📝  Generated Solution object for {result}. See .solution"
-
-                if kind == 'generate-ppopt':
-                    msg = "📝  Generated MPLP. See .formulation"
-
-                if kind == 'generate-gurobi':
-                    msg = "📝  Generated gurobipy model. See .formulation"
-
-                if kind == 'solve-mpqp':
-                    msg = "✅  Solved MPLP using PPOPT. See .solution"
-
-                if kind == 'optimize':
-                    msg = f"✅  {result[0]} optimized using {result[1]}. Display using .output()"
-
+                msg = message.format(name=name, result=result)
                 logger.log(
                     level,
                     f"{msg:<75} ⏱ {elapsed:.4f} s",
@@ -0,0 +1,33 @@
+"""Display in notebooks
+
+IPython is only imported when something is displayed
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from IPython.display import Markdown as IPMarkdown
+    from IPython.display import Math as IPMath
+
+
+def display(*objs: Any, **kwargs: Any):
+    """Displays objects, see IPython.display.display"""
+    from IPython.display import display as _display
+
+    return _display(*objs, **kwargs)
+
+
+def Math(data: str) -> IPMath:  # pylint: disable=invalid-name
+    """LaTeX to display, see IPython.display.Math"""
+    from IPython.display import Math as _Math
+
+    return _Math(data)
+
+
+def Markdown(data: str) -> IPMarkdown:  # pylint: disable=invalid-name
+    """Markdown to display, see IPython.display.Markdown"""
+    from IPython.display import Markdown as _Markdown
+
+    return _Markdown(data)
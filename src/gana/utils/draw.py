@@ -4,9 +4,6 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from matplotlib import pyplot as plt
-from matplotlib import rc
-
 if TYPE_CHECKING:
     from ..sets.parameter import P
     from ..sets.variable import V
@@ -45,6 +42,10 @@ def draw(
     :type str_idx_lim: int, optional
     """
 
+    # matplotlib is only imported to plot
+    from matplotlib import pyplot as plt
+    from matplotlib import rc
+
     ax = plt.subplots(figsize=fig_size)[1]
 
     # the values are the y-axis
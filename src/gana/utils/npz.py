@@ -0,0 +1,77 @@
+"""NumPy Archives"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from struct import unpack
+from zipfile import ZIP_STORED, ZipFile
+
+from numpy import load as npload
+from numpy import memmap as npmemmap
+from numpy import ndarray
+from numpy.lib import format as npformat
+
+
+def load(path: str | Path, mmap: bool = True) -> dict[str, ndarray]:
+    """
+    Loads the arrays in an .npz archive
+
+    numpy does not memory-map archives (np.load(mmap_mode=...) only maps .npy files),
+    but arrays stored without compression (np.savez) are plain .npy files within the zip,
+    so they are mapped at their offset in the archive.
+    Compressed arrays (np.savez_compressed) are read.
+
+    :param path: path to the archive
+    :type path: str | Path
+    :param mmap: memory-map (read only) the arrays that are not compressed. Defaults to True.
+    :type mmap: bool, optional
+
+    :returns: arrays by name
+    :rtype: dict[str, ndarray]
+    """
+    arrays: dict[str, ndarray] = {}
+
+    with open(path, "rb") as file, ZipFile(file) as archive:
+        read = []
+        for info in archive.infolist():
+            name = info.filename.removesuffix(".npy")
+
+            if not mmap or info.compress_type != ZIP_STORED:
+                read.append(name)
+                continue
+
+            # local file header: 30 bytes, then the file name and extra field
+            file.seek(info.header_offset + 26)
+            name_length, extra_length = unpack("<HH", file.read(4))
+            file.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = npformat.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = npformat.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = npformat.read_array_header_2_0(file)
+
+            if dtype.hasobject:
+                read.append(name)
+                continue
+
+            if not shape or 0 in shape:
+                # memmap cannot map empty arrays
+                read.append(name)
+                continue
+
+            arrays[name] = npmemmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=file.tell(),
+                shape=shape,
+                order="F" if fortran_order else "C",
+            )
+
+    if read:
+        with npload(path, allow_pickle=False) as archive:
+            for name in read:
+                arrays[name] = archive[name]
+
+    return arrays
@@ -0,0 +1,74 @@
+"""Name Registry"""
+
+from __future__ import annotations
+
+from typing import Iterable, Self
+
+
+class Names(list):
+    """
+    List of names with constant time membership checks.
+
+    Behaves exactly like the plain list of names kept by the program
+    (order of declaration is kept), but a set is maintained alongside
+    so that ``name in names`` does not scan the list.
+
+    :param names: Names to start with. Defaults to empty.
+    :type names: Iterable[str], optional
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        super().__init__(names)
+        self._set: set[str] = set(self)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._set
+
+    def append(self, name: str):
+        super().append(name)
+        self._set.add(name)
+
+    def extend(self, names: Iterable[str]):
+        names = list(names)
+        super().extend(names)
+        self._set.update(names)
+
+    def insert(self, pos: int, name: str):
+        super().insert(pos, name)
+        self._set.add(name)
+
+    def remove(self, name: str):
+        super().remove(name)
+        # names can be repeated in the list
+        if not super().__contains__(name):
+            self._set.discard(name)
+
+    def pop(self, pos: int = -1) -> str:
+        name = super().pop(pos)
+        if not super().__contains__(name):
+            self._set.discard(name)
+        return name
+
+    def clear(self):
+        super().clear()
+        self._set.clear()
+
+    def __iadd__(self, names: Iterable[str]) -> Self:
+        self.extend(names)
+        return self
+
+    def __setitem__(self, key: int | slice, value: str | Iterable[str]):
+        super().__setitem__(key, value)
+        # rare, just rebuild the set
+        self._set = set(self)
+
+    def __delitem__(self, key: int | slice):
+        super().__delitem__(key)
+        self._set = set(self)
+
+    def copy(self) -> Self:
+        return Names(self)
+
+    def __reduce__(self):
+        # the set is rebuilt from the list
+        return (Names, (list(self),))
@@ -0,0 +1,59 @@
+"""Memory held by objects"""
+
+from gc import get_referents
+from sys import getsizeof
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, Sequence
+
+# shared by everything, never counted
+SHARED = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+
+
+def footprint(
+    objects: Sequence[Any],
+    seen: set[int] | None = None,
+    sample: int | None = None,
+    stop: set[int] | None = None,
+) -> int:
+    """
+    Memory (bytes) held by objects: each object and everything it refers to
+    (attributes, containers, helper objects), found through gc.get_referents.
+    Nothing is counted twice, objects in stop are not followed.
+
+    Attributes are not read, so nothing is made on the way (see _Element.__getattr__).
+
+    :param objects: objects to size
+    :type objects: Sequence[Any]
+    :param seen: ids of what is counted already, updated. Defaults to None.
+    :type seen: set[int] | None, optional
+    :param sample: size this many objects (evenly spread) and scale up, None for all. Defaults to None.
+    :type sample: int | None, optional
+    :param stop: ids of objects (counted elsewhere) not to follow. Defaults to None.
+    :type stop: set[int] | None, optional
+
+    :returns: size
+    :rtype: int
+    """
+    if seen is None:
+        seen = set()
+    if stop is None:
+        stop = set()
+
+    scale = 1.0
+    if sample is not None and len(objects) > sample:
+        scale = len(objects) / sample
+        objects = objects[:: len(objects) // sample][:sample]
+
+    size = 0
+    for root in objects:
+        # the objects themselves can be in stop
+        pending = [root]
+        while pending:
+            obj = pending.pop()
+            if id(obj) in seen or isinstance(obj, SHARED):
+                continue
+            seen.add(id(obj))
+            size += getsizeof(obj)
+            pending.extend(o for o in get_referents(obj) if id(o) not in stop)
+
+    return round(size * scale)
@@ -0,0 +1,357 @@
+"""Tracing
+
+Nested spans (name, category, start, duration, counters) of building,
+exporting, solving and loading solutions, timed with time.perf_counter_ns.
+
+Tracing is off by default, no spans are made then:
+span() hands back one shared do-nothing span and count() returns at once.
+
+    from gana.utils.tracing import trace
+
+    with trace() as tracer:
+        p = Prg()
+        ...
+        p.opt()
+
+    print(tracer)
+    tracer.json('trace.json')
+    tracer.chrome('trace.chrome.json')  # chrome://tracing or ui.perfetto.dev
+
+Spans are kept for the thread that opens them,
+spans opened in other processes (e.g. Prg.sweep()) are not traced.
+"""
+
+from __future__ import annotations
+
+import json as _json
+import os
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter_ns
+from typing import Any, Callable, Iterator, Self
+
+# the tracer in use, None when tracing is off
+tracer: Tracer | None = None
+
+
+class Span:
+    """
+    A timed phase, spans opened within are its children
+
+    :param tracer: tracer keeping the span
+    :type tracer: Tracer
+    :param name: name of the span
+    :type name: str
+    :param category: build, export, solve, solution, ...
+    :type category: str
+    :param counters: counts attached to the span (rows, nonzeros, objects, ...)
+    :type counters: dict[str, int | float]
+    """
+
+    __slots__ = ("tracer", "name", "category", "counters", "children", "start", "end")
+
+    def __init__(
+        self,
+        tracer: Tracer,
+        name: str,
+        category: str,
+        counters: dict[str, int | float],
+    ):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.counters = counters
+        self.children: list[Span] = []
+        # ns, perf_counter_ns
+        self.start: int = 0
+        self.end: int | None = None
+
+    @property
+    def duration(self) -> int:
+        """Duration (ns), up to now if the span is open"""
+        return (self.end or perf_counter_ns()) - self.start
+
+    def count(self, **counters: int | float):
+        """Adds to the counters of the span"""
+        for name, value in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        The span and its children
+
+        :returns: name, category, start and duration (ns, from the start of tracing), counters, children
+        :rtype: dict[str, Any]
+        """
+        return {
+            "name": self.name,
+            "category": self.category,
+            "start_ns": self.start - self.tracer.origin,
+            "duration_ns": self.duration,
+            "counters": dict(self.counters),
+            "children": [child.to_dict() for child in self.children],
+        }
+
+    def __enter__(self) -> Self:
+        stack = self.tracer.stack()
+        if stack:
+            stack[-1].children.append(self)
+        else:
+            self.tracer.spans.append(self)
+        stack.append(self)
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.end = perf_counter_ns()
+        self.tracer.stack().pop()
+        return False
+
+    def __repr__(self):
+        return f"{self.name} ({self.duration / 1e6:.3f} ms)"
+
+
+class _NoSpan:
+    """Span given when tracing is off, does nothing"""
+
+    __slots__ = ()
+
+    def count(self, **counters: int | float):
+        """Does nothing"""
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+NOSPAN = _NoSpan()
+
+
+class Tracer:
+    """
+    Keeps the spans opened while it is in use (see trace(), enable())
+
+    :ivar spans: spans opened at the top level, in order
+    :vartype spans: list[Span]
+    :ivar origin: start of tracing (ns, perf_counter_ns)
+    :vartype origin: int
+    """
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self.origin: int = perf_counter_ns()
+        # open spans of each thread
+        self._local = threading.local()
+
+    def stack(self) -> list[Span]:
+        """Spans open in this thread, innermost last"""
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def span(self, name: str, category: str = "", **counters: int | float) -> Span:
+        """
+        A span to open (with ...)
+
+        :param name: name of the span
+        :type name: str
+        :param category: build, export, solve, solution, ... Defaults to ''.
+        :type category: str, optional
+
+        :returns: the span
+        :rtype: Span
+        """
+        return Span(self, name, category, counters)
+
+    def count(self, **counters: int | float):
+        """Adds to the counters of the innermost open span"""
+        stack = self.stack()
+        if stack:
+            stack[-1].count(**counters)
+
+    def walk(self) -> Iterator[tuple[int, Span]]:
+        """All spans, depth first, with their depth"""
+        pending = [(0, span) for span in reversed(self.spans)]
+        while pending:
+            depth, span = pending.pop()
+            yield depth, span
+            pending.extend((depth + 1, child) for child in reversed(span.children))
+
+    def totals(self) -> dict[str, int]:
+        """
+        Time (ns) spent in each category, less the time spent in the spans within,
+        the totals add up to the time of the top level spans
+
+        :returns: category and time
+        :rtype: dict[str, int]
+        """
+        totals: dict[str, int] = {}
+        for _, span in self.walk():
+            own = span.duration - sum(child.duration for child in span.children)
+            totals[span.category] = totals.get(span.category, 0) + own
+        return totals
+
+    def to_dict(self) -> dict[str, Any]:
+        """The spans as nested dictionaries, see Span.to_dict()"""
+        return {"spans": [span.to_dict() for span in self.spans]}
+
+    def json(self, path: str | None = None) -> str:
+        """
+        The spans as JSON (nested), see Span.to_dict()
+
+        :param path: file to write to. Defaults to None.
+        :type path: str | None, optional
+
+        :returns: JSON
+        :rtype: str
+        """
+        dump = _json.dumps(self.to_dict(), indent=2)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(dump)
+        return dump
+
+    def chrome(self, path: str | None = None) -> dict[str, Any]:
+        """
+        The spans in the Chrome trace event format,
+        complete events ('X') in microseconds, counters are given as args
+
+        :param path: file to write to. Defaults to None.
+        :type path: str | None, optional
+
+        :returns: trace with traceEvents
+        :rtype: dict[str, Any]
+        """
+        pid = os.getpid()
+        tid = threading.get_ident()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start - self.origin) / 1e3,
+                "dur": span.duration / 1e3,
+                "pid": pid,
+                "tid": tid,
+                "args": dict(span.counters),
+            }
+            for _, span in self.walk()
+        ]
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                _json.dump(trace, f)
+        return trace
+
+    def __str__(self):
+        lines = []
+        for depth, span in self.walk():
+            counters = " ".join(f"{k}={v}" for k, v in span.counters.items())
+            lines.append(
+                f"{'  ' * depth}{span.name:<{max(1, 48 - 2 * depth)}} "
+                f"{span.category:<10} {span.duration / 1e6:>10.3f} ms  {counters}".rstrip()
+            )
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"Tracer ({sum(1 for _ in self.walk())} spans)"
+
+
+def enable(using: Tracer | None = None) -> Tracer:
+    """
+    Turns tracing on
+
+    :param using: tracer to keep the spans in. Defaults to a new one.
+    :type using: Tracer | None, optional
+
+    :returns: the tracer in use
+    :rtype: Tracer
+    """
+    global tracer  # pylint: disable=global-statement
+    tracer = using or Tracer()
+    return tracer
+
+
+def disable() -> Tracer | None:
+    """
+    Turns tracing off
+
+    :returns: the tracer that was in use
+    :rtype: Tracer | None
+    """
+    global tracer  # pylint: disable=global-statement
+    _tracer, tracer = tracer, None
+    return _tracer
+
+
+@contextmanager
+def trace(using: Tracer | None = None) -> Iterator[Tracer]:
+    """
+    Traces within, the tracer in use before is restored on exit
+
+    :param using: tracer to keep the spans in. Defaults to a new one.
+    :type using: Tracer | None, optional
+
+    :returns: the tracer in use
+    :rtype: Iterator[Tracer]
+    """
+    global tracer  # pylint: disable=global-statement
+    before = tracer
+    tracer = using or Tracer()
+    try:
+        yield tracer
+    finally:
+        tracer = before
+
+
+def span(name: str, category: str = "", **counters: int | float) -> Span | _NoSpan:
+    """
+    A span to open (with ...), one that does nothing if tracing is off
+
+    :param name: name of the span
+    :type name: str
+    :param category: build, export, solve, solution, ... Defaults to ''.
+    :type category: str, optional
+
+    :returns: the span
+    :rtype: Span | _NoSpan
+    """
+    if tracer is None:
+        return NOSPAN
+    return Span(tracer, name, category, counters)
+
+
+def count(**counters: int | float):
+    """Adds to the counters of the innermost open span, if tracing"""
+    if tracer is not None:
+        tracer.count(**counters)
+
+
+def traced(category: str = "", name: str | None = None) -> Callable:
+    """
+    Traces each call of the function as a span
+
+    :param category: build, export, solve, solution, ... Defaults to ''.
+    :type category: str, optional
+    :param name: name of the span. Defaults to the qualified name of the function.
+    :type name: str | None, optional
+    """
+
+    def decorator(func: Callable) -> Callable:
+        _name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if tracer is None:
+                return func(*args, **kwargs)
+            with Span(tracer, _name, category, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -198,3 +198,12 @@ def test_idx_operations(solarsys):
         solarsys.c,
         solarsys.p,
     ]
+
+
+def test_names(repeat_elem):
+    """Names are kept in order of declaration, lookups are against a set"""
+    assert repeat_elem.names_index_sets == ['i0', 'i1']
+    assert repeat_elem.names_indices == ['a', 'b', 'd', 'c']
+    assert 'd' in repeat_elem.names_indices
+    assert 'i0' not in repeat_elem.names_indices
+    assert isinstance(repeat_elem.names_indices, list)
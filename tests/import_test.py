@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# loaded only when solving, plotting, displaying or making DataFrames
+LAZY = ['gurobipy', 'ppopt', 'pandas', 'matplotlib', 'IPython', 'scipy.optimize']
+
+
+def importtime() -> dict[str, int]:
+    """Cumulative import time (us) of each module imported by import gana"""
+    src = str(Path(__file__).parents[1] / 'src')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import gana'],
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHONPATH': src},
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_importtime():
+    times = importtime()
+    assert 'gana' in times
+    for module in LAZY:
+        assert module not in times, f'{module} is imported by import gana'
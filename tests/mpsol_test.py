@@ -4,7 +4,10 @@ from src.gana.operators.composition import inf
 from src.gana.sets.index import I
 from src.gana.sets.variable import V
 from src.gana.sets.theta import T
-from numpy import allclose, array
+from numpy import allclose, array, eye, hstack, isnan, memmap, vstack, zeros
+from numpy.random import default_rng
+from scipy.spatial import Delaunay
+from src.gana.block.regions import Regions
 
 
 @pytest.fixture
@@ -184,3 +187,104 @@ def test_mplp(mplp):
         rtol=1e-9,
         atol=1e-12,
     )
+
+
+def test_eval_batch(mplp):
+    sol = mplp.solutions[0]
+    thetas = array([[t0, t1] for t0 in range(0, 1001, 100) for t1 in range(0, 1001, 100)])
+    X, region = mplp.eval_batch(thetas)
+    assert X.shape == (len(thetas), len(mplp.variables))
+    for theta, x, r in zip(thetas, X, region):
+        cr = sol.get_region(theta.reshape(-1, 1))
+        if cr is None:
+            assert r == -1 and isnan(x).all()
+        else:
+            # on a boundary, either region gives the same values
+            assert sol.critical_regions[r].is_inside(theta.reshape(-1, 1))
+            assert allclose(x, cr.evaluate(theta.reshape(-1, 1)).ravel())
+    # nothing is kept unless asked
+    assert not mplp.evaluation
+    X, region = mplp.eval_batch(thetas[:3], roundoff=4, store=True)
+    assert mplp.evaluation[0][(0.0, 100.0)] == list(X[1])
+    assert mplp.x[0].evaluation[0][(0.0, 100.0)] == X[1][0]
+    assert mplp.eval(0.0, 100.0) == dict(zip(mplp.variables, X[1]))
+    with pytest.raises(ValueError):
+        mplp.eval_batch(array([[1.0, 2.0, 3.0]]))
+
+
+def test_regions():
+    # voronoi cells of random seeds in the unit box
+    rng = default_rng(0)
+    seeds = rng.uniform(0, 1, (200, 2))
+    indptr, indices = Delaunay(seeds).vertex_neighbor_vertices
+    A_t, b_t = vstack([eye(2), -eye(2)]), array([1.0, 1.0, 0.0, 0.0])
+    E, f = [], []
+    for r, s in enumerate(seeds):
+        nb = seeds[indices[indptr[r] : indptr[r + 1]]]
+        E.append(vstack([nb - s, A_t]))
+        f.append(hstack([((nb**2).sum(1) - (s**2).sum()) / 2, b_t]))
+    lo, hi = Regions.boxes(E, f, A_t, b_t, tol=1e-5)
+    regions = Regions(
+        E=vstack(E),
+        f=hstack(f),
+        starts=array([0] + [len(_f) for _f in f[:-1]]).cumsum(),
+        A=zeros((200, 1, 2)),
+        b=array(range(200), dtype=float).reshape(-1, 1),
+        lo=lo,
+        hi=hi,
+    )
+    assert (lo >= -1e-5).all() and (hi <= 1 + 1e-5).all()
+    thetas = rng.uniform(-0.1, 1.1, (2000, 2))
+    # the first region that has the point, by scanning all
+    scan = [
+        next((r for r in range(200) if (E[r] @ t - f[r] < 1e-5).all()), -1)
+        for t in thetas
+    ]
+    assert [regions.locate(t) for t in thetas] == scan
+    assert list(regions.locate_batch(thetas)) == scan
+    X = regions.evaluate_batch(thetas, array(scan))
+    assert all(x == r if r >= 0 else isnan(x) for x, r in zip(X[:, 0], scan))
+
+
+def test_eval_index(mplp):
+    assert len(mplp.regions[0]) == 3
+    # variables read the values kept by program.eval
+    assert mplp.x[2].eval(300.0, 600.0) is None
+    x = mplp.eval(300.0, 600.0)[mplp.x[2]]
+    assert mplp.x[2].eval(300.0, 600.0) == x
+    assert type(mplp.x[2].evaluation[0]) is dict
+    assert mplp.eval(1000.0, 1000.0) is None
+    assert mplp.x[2].eval(1000.0, 1000.0) is None
+
+
+def test_mp_solution_npz(mplp, tmp_path):
+    thetas = default_rng(0).uniform(0, 1000, (500, 2))
+    X, region = mplp.eval_batch(thetas)
+
+    path = mplp.save_mp_solution(tmp_path / 'mplp')
+    assert path.endswith('.npz')
+    # shared facets are kept once
+    facets, refs = Regions.share(mplp.regions[0].E, mplp.regions[0].f)
+    assert len(facets) < len(refs)
+
+    regions = mplp.load_mp_solution(path)
+    assert mplp.sol_types['mp'] == [0, 1] and mplp.solutions[1] is regions
+    assert isinstance(regions.A, memmap)
+    assert allclose(regions.E, mplp.regions[0].E) and allclose(regions.f, mplp.regions[0].f)
+    _X, _region = mplp.eval_batch(thetas, n_sol=1)
+    assert (_region == region).all() and allclose(_X, X, equal_nan=True)
+    assert mplp.eval(300.0, 600.0, n_sol=1) == mplp.eval(300.0, 600.0)
+
+    # float32 and compressed
+    for kwargs in [{'float32': True}, {'compress': True}]:
+        regions = Regions.load(mplp.save_mp_solution(tmp_path / 'mplp_', **kwargs))
+        assert regions.A.dtype == ('float32' if 'float32' in kwargs else 'float64')
+        _X = regions.evaluate_batch(thetas, regions.locate_batch(thetas))
+        assert allclose(_X, X, equal_nan=True, atol=1e-2)
+
+    # not the program of the solution
+    p = Prg()
+    p.i = I(size=3)
+    p.x = V(p.i)
+    with pytest.raises(ValueError):
+        p.load_mp_solution(path)
@@ -5,9 +5,11 @@ import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 from src.gana.block.program import Prg
+from src.gana.operators.composition import inf
 from src.gana.sets.cases import PCase
 from src.gana.sets.index import I
 from src.gana.sets.parameter import P
+from src.gana.sets.variable import V
 
 
 @pytest.fixture()
@@ -77,6 +79,49 @@ def test_parameter(p):
     assert p.p19.case == PCase.NEGSET
 
 
+def test_parameter_refresh():
+    p = Prg()
+    p.i = I('a', 'b', 'c')
+    p.x = V(p.i)
+    p.c = P(p.i, _=[1, 2, 3], mutable=True)
+    # a function set declared before the objective
+    p.f = sum(p.c(i) * p.x(i) for i in p.i)
+    p.c1 = p.x(p.i) >= p.c(p.i)
+    p.c2 = p.x(p.i) <= p.c(p.i) * 2
+    p.o = inf(sum(p.c(i) * p.x(i) for i in p.i))
+    f = p.function_sets[0]
+
+    with pytest.warns(UserWarning) as record:
+        p.c = P(p.i, _=[3, 2, 1])
+    assert p.c._ == [3, 2, 1]
+    assert [c.B for c in p.c1._] == [-3, -2, -1]
+    assert list(p.o.C) == [3, 2, 1]
+    assert p.function_sets[0] is f
+    assert p.objectives == [p.o]
+    # made from c and a number, not followed
+    assert [c.B for c in p.c2._] == [2, 4, 6]
+    assert any('declare' in str(w.message) for w in record)
+
+
+def test_parameter_refresh_by_identity():
+    p = Prg()
+    p.i = I('a', 'b', 'c')
+    p.x = V(p.i)
+    p.c = P(p.i, _=[1, 2, 3], mutable=True)
+    # a parameter set of the same name that is not in the program
+    d = P(p.i, _=[4, 5, 6], name='c')
+    p.c1 = p.x(p.i) >= p.c(p.i)
+    p.c2 = p.x(p.i) >= d
+    c1, c2 = p.c1, p.c2
+    assert p.c1.function.uses(p.c) and not p.c2.function.uses(p.c)
+
+    with pytest.warns(UserWarning):
+        p.c = P(p.i, _=[3, 2, 1])
+    assert p.c1 is not c1 and p.c2 is c2
+    assert [c.B for c in p.c1._] == [-3, -2, -1]
+    assert [c.B for c in p.c2._] == [-4, -5, -6]
+
+
 # this contains one list (a) that is just a general list of floats,
 # one list (b) that is a list of floats with values >= 1,
 # and one list (c) that is a list of floats with values >= 0 and <= 10.
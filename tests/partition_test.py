@@ -0,0 +1,47 @@
+import pytest
+from src.gana.block.program import Prg
+from src.gana.operators.composition import sup
+from src.gana.sets.index import I
+from src.gana.sets.variable import V
+
+
+@pytest.fixture
+def p():
+    _p = Prg()
+    _p.i = I(size=3)
+    _p.x = V(_p.i)
+    _p.y = V(_p.i)
+    _p.c1 = _p.x(_p.i) + _p.y(_p.i) <= 10
+    _p.c2 = 2 * _p.x(_p.i) - _p.y(_p.i) == 4
+    _p.o = sup(_p.x(_p.i[0]) + _p.y(_p.i[1]))
+    return _p
+
+
+def test_partitions(p):
+    p.c3 = p.x(p.i) <= 2
+    p.z = V(p.i, itg=True)
+    p.c4 = p.z(p.i) - p.x(p.i) <= 0
+    # .n is changed to the order in .cons()
+    p.renumber()
+    assert [c.n for c in p.cons()] == list(range(p.n_constraints))
+
+    def scan():
+        # partitions are the same as scanning the program
+        assert p.leqcons() == [c for c in p.constraints if c.leq and not c.nn]
+        assert p.eqcons() == [c for c in p.constraints if not c.leq]
+        assert p.nncons() == [c for c in p.constraints if c.nn]
+        assert p.itgvars() == [v for v in p.variables if v.itg]
+        assert p.cntvars() == [v for v in p.variables if not v.itg and not v.bnr]
+
+    scan()
+    # same type, replaced in place
+    p.c3 = p.x(p.i) <= 3
+    assert p.constraints[6:9] == p.c3._
+    assert p.leqcons()[3:6] == p.c3._
+    scan()
+    # different type
+    p.c3 = p.x(p.i) == 3
+    assert p.constraints[6:9] == p.c3._
+    assert p.eqcons()[3:] == p.c3._
+    scan()
+    assert sorted(c.n for c in p.constraints) == list(range(p.n_constraints))
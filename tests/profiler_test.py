@@ -0,0 +1,59 @@
+import tracemalloc
+
+import pytest
+from src.gana.block.program import Prg
+from src.gana.operators.composition import inf
+from src.gana.operators.sigma import sigma
+from src.gana.sets.index import I
+from src.gana.sets.variable import V
+
+
+def test_profile():
+    p = Prg()
+    with pytest.raises(ValueError):
+        p.build_report()
+
+    profiler = p.profile()
+    p.i = I('a', 'b', 'c')
+    p.x = V(p.i)
+    p.c1 = p.x(p.i) <= 5
+    p.c2 = p.x(p.a) + 2 * p.x(p.b) + p.x(p.c) >= 1
+    p.o = inf(sigma(p.x))
+    profiler.stop()
+    assert not tracemalloc.is_tracing()
+    # not recorded
+    p.y = V(p.i)
+
+    # elements of i are counted with it
+    assert [d.name for d in profiler.declarations] == ['i', 'x', 'c1', 'c2', 'o']
+    i, x, c1, c2, o = profiler.declarations
+    assert i.kind == 'I' and i.objects == {'I': 3}
+    assert x.objects == {'V': 3} and x.rows == 0
+    assert c1.objects == {'C': 3, 'F': 3}
+    assert (c1.rows, c1.nonzeros) == (3, 3)
+    assert (c2.rows, c2.nonzeros) == (1, 3)
+    assert o.objects == {'O': 1}
+    assert all(d.time >= d.declare > 0 for d in profiler.declarations)
+    assert all(d.memory is not None for d in profiler.declarations)
+
+    report = p.build_report(top=2, by='rows')
+    lines = report.splitlines()
+    assert len(lines) == 4
+    assert lines[1].startswith('c1') and lines[2].startswith('c2')
+    assert lines[-1].startswith('5 declarations')
+    assert [d.name for d in profiler.ranked('objects')][0] == 'c1'
+
+    with pytest.raises(ValueError):
+        p.build_report(by='colour')
+
+
+def test_profile_no_memory():
+    p = Prg()
+    with p.profile(memory=False) as profiler:
+        p.i = I(size=4)
+        p.x = V(p.i)
+    assert not profiler.on
+    assert profiler.declarations[1].memory is None
+    with pytest.raises(ValueError):
+        p.build_report(by='memory')
+    assert len(p.build_report().splitlines()) == 4
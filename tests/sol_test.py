@@ -6,10 +6,11 @@ from src.gana.sets.parameter import P
 from src.gana.sets.variable import V
 from src.gana.sets.theta import T
 from src.gana.operators.sigma import sigma
-from numpy import allclose, array
+from numpy import allclose, array, isnan
 import gurobipy as gp
 import pickle
 import json
+import gzip
 
 
 @pytest.fixture
@@ -59,6 +60,65 @@ def test_solsmall(psmall):
     assert psmall.C == [-40.0, -30.0, 1.0]
 
 
+def test_solution(psmall):
+    sol = psmall.solution
+    assert list(sol.values) == [4.0, 8.0, 10.0]
+    data = sol(psmall.x)
+    # nothing is made until read
+    assert not data._fields
+    assert data['values'] == [4.0, 8.0]
+    assert list(data._fields) == ['values']
+    assert data['latex'] == [v.latex() for v in psmall.x._]
+    assert data['n'] == [0, 1]
+    assert sol(psmall.y[0])['values'] == 10.0
+    assert sol.value(psmall.x[1]) == 8.0
+    assert sol.asdict() == {'x': [4.0, 8.0], 'y': [10.0]}
+    assert sol['y']['index'] == [{'r': {'ri': 0}}]
+
+
+def test_activity(psmall):
+    # leq (c1, c2), eq (c3)
+    assert allclose(psmall.activity(), [0.0, 0.0, 0.0])
+    assert allclose(psmall.slack(0), [0.0, 0.0, 0.0])
+    assert list(psmall.binding()) == [True, True, True]
+    assert not psmall.violation().any()
+    psmall.c1.categorize('capacity')
+    assert psmall.max_violation() == {'capacity': 0.0, 'General': 0.0}
+    # constraint functions are only evaluated on demand
+    assert not psmall.c1._[0].function.X
+    psmall.function_values()
+    assert [c.function.X[0] for c in psmall.cons()] == list(psmall.activity())
+    for c in psmall.cons():
+        assert c.function.solution(0) == c.function.X[0]
+    with pytest.raises(ValueError):
+        psmall.activity(1)
+
+
+def test_sparse(psmall):
+    for matrix in ['A', 'F', 'G', 'H', 'NN']:
+        assert allclose(
+            psmall.sparse(matrix, format='dense'),
+            array(getattr(psmall, matrix)).reshape(
+                psmall.sparse(matrix, format='dense').shape
+            ),
+        )
+    assert allclose(psmall.sparse('B', format='dense').ravel(), psmall.B)
+    assert allclose(psmall.sparse('C').toarray().ravel(), psmall.C)
+    assert psmall.sparse('A').nnz == 5
+    assert psmall.sparse('NN', format='coo').nnz == 3
+    assert allclose(psmall.make_A_df().sparse.to_dense().values, psmall.A)
+    with pytest.raises(ValueError):
+        psmall.sparse('X')
+
+    # the last objective is minimized
+    psmall.o2 = inf(psmall.x(psmall.i[1]) + 2 * psmall.y(psmall.r))
+    assert allclose(psmall.sparse('C', format='dense'), [[0, 1, 2]])
+    assert psmall.C == [0, 1, 2]
+    assert allclose(psmall.make_C_df().values, [[0, 1, 2]])
+    # the fill value is 0, not nan
+    assert psmall.make_A_df().dtypes.iloc[0].fill_value == 0
+
+
 @pytest.fixture
 def p_energy():
     p = Prg()
@@ -142,6 +202,17 @@ def test_output(p_energy):
     assert p_energy.o.output(True) == 942000.0
 
 
+def test_program_output(p_energy):
+    # objective, variables and the slack of the leq constraints
+    p_energy.output()
+    p_energy.output(compare=True)
+    p_energy.output(slack=False)
+    # activities of the constraint functions are set for the slack
+    assert [c.function.X[0] for c in p_energy.con_capmax._] == pytest.approx(
+        [v.X[0] - 200 for v in p_energy.capp._]
+    )
+
+
 @pytest.fixture
 def p1():
     p1_ = Prg()
@@ -216,24 +287,293 @@ def test_diet_problem(diet_problem):
         1.7391304347826089,
     ]
     assert diet_problem.obj_cost.output(True) == 2.869565217391304
+    x = array(diet_problem.x.output(aslist=True))
+    # protein and vitamin A bind
+    assert list(diet_problem.binding()) == [True, True, False, False]
+    assert allclose(
+        diet_problem.slack()[2:],
+        [array([20, 30, 40]) @ x - 50, array([30, 50, 60]) @ x - 30],
+    )
+
+
+def test_sensitivity(diet_problem):
+    diet_problem.opt()
+    # constraints are written as f <= 0, -(protein) <= -80
+    assert allclose(diet_problem.cons_protein.dual(), [-0.02282609])
+    assert allclose(diet_problem.cons_vitA.dual(0), [-0.0173913])
+    assert allclose(diet_problem.cons_vitB.slack(), [50.86956522])
+    low, up = diet_problem.cons_vitB.rhs_range()
+    assert allclose(low, [-100.86956522]) and up[0] == float('inf')
+    assert allclose(diet_problem.x.reduced_cost(), [0.0, 1.34782609, 0.0])
+    low, up = diet_problem.x.obj_range()
+    assert allclose(low, [0.125, 1.15217391, 0.25])
+    assert list(diet_problem.sensitivity[0]) == [
+        'Pi',
+        'Slack',
+        'SARHSLow',
+        'SARHSUp',
+        'RC',
+        'SAObjLow',
+        'SAObjUp',
+    ]
+    # same through the persistent model
+    diet_problem.opt(persistent=True)
+    assert allclose(diet_problem.cons_protein.dual(1), [-0.02282609])
+    assert allclose(diet_problem.x.reduced_cost(1), [0.0, 1.34782609, 0.0])
+
+    # no duals for MIPs
+    p = Prg()
+    p.i = I(size=2)
+    p.x = V(p.i, itg=True)
+    p.c = p.x(p.i[0]) + p.x(p.i[1]) >= 3
+    p.o = inf(p.x(p.i[0]) + 2 * p.x(p.i[1]))
+    p.opt()
+    assert not p.sensitivity
+    with pytest.raises(ValueError):
+        p.c.dual()
+    with pytest.raises(ValueError):
+        p.x.reduced_cost()
+
+
+def test_gurobi(diet_problem, tmp_path, monkeypatch):
+    # the .mps file is written to the working directory
+    monkeypatch.chdir(tmp_path)
+    m = diet_problem.gurobi()
+    _m = diet_problem.gurobi(using='mps')
+    assert [v.VarName for v in m.getVars()] == [v.VarName for v in _m.getVars()]
+    assert [c.ConstrName for c in m.getConstrs()] == [
+        c.ConstrName for c in _m.getConstrs()
+    ]
+    assert (m.getA() != _m.getA()).nnz == 0
+    m.optimize()
+    _m.optimize()
+    assert m.ObjVal == pytest.approx(_m.ObjVal)
+    with pytest.raises(ValueError):
+        diet_problem.gurobi(using='lp')
+
+
+def test_persistent(diet_problem):
+    p = diet_problem
+
+    def check():
+        # same as building the model again
+        m = p.formulation
+        X, obj = p.X[p.n_solutions - 1], m.ObjVal
+        n = p.n_formulations
+        p.opt()
+        assert p.X[p.n_solutions - 1] == pytest.approx(X)
+        assert p.formulation.ObjVal == pytest.approx(obj)
+        p.formulations.pop(n)
+        p.n_formulations = n
+
+    p.opt(persistent=True)
+    m = p.formulation
+    check()
+    # coefficients and RHS
+    p.cons_protein = sum(p.protein(i) * p.x(i) for i in p.item) >= 100
+    p.cons_vitA = sum(p.vitB(i) * p.x(i) for i in p.item) >= 60
+    p.opt(persistent=True)
+    check()
+    # sense and a new constraint
+    p.cons_vitC = sum(p.vitC(i) * p.x(i) for i in p.item) == 150
+    p.cons_milk = p.x('milk') <= 2
+    p.opt(persistent=True)
+    check()
+    # objective
+    p.lb(p.x(p.item[2]), persistent=True)
+    check()
+    assert p.formulation is m
+    assert p._persistent.n_updates == 3
+
+
+def test_persistent_parameter(diet_problem):
+    p = diet_problem
+    p.protein.mutable = True
+    p.cost.mutable = True
+    p.opt(persistent=True)
+    m = p.formulation
+    assert m.ObjVal == pytest.approx(2.869565217391304)
+
+    # constraints and the objective made with the parameters are declared again
+    with pytest.warns(UserWarning):
+        p.protein = P(p.item, _=[10, 20, 10])
+        p.cost = P(p.item, _=[3, 2.5, 3 / 4])
+    assert p.protein._ == [10, 20, 10]
+    assert list(p.cons_protein._[0].A) == [-10, -20, -10]
+    assert list(p.obj_cost.C) == [3, 2.5, 0.75]
+
+    p.opt(persistent=True)
+    assert p.formulation is m
+    assert p._persistent.n_updates == 1
+    obj = m.ObjVal
+    assert obj != pytest.approx(2.869565217391304)
+    # same as building the model again
+    p.opt()
+    assert p.formulation is not m
+    assert p.formulation.ObjVal == pytest.approx(obj)
+
+
+def test_sweep(diet_problem):
+    p = diet_problem
+    cons_protein = p.cons_protein
+
+    def declare(p, s):
+        if s < 0:
+            # infeasible, protein is nonnegative
+            p.cons_protein = sum(p.protein(i) * p.x(i) for i in p.item) == s
+        else:
+            p.cons_protein = sum(p.protein(i) * p.x(i) for i in p.item) >= s
+
+    scenarios = [80, 100, -1, 150, 'a']
+    for workers in [1, 2]:
+        sweep = p.sweep(scenarios, declare, workers=workers)
+        assert p.solution is sweep
+        assert sorted(sweep.errors) == [2, 4]
+        assert isnan(sweep.objectives[2]) and isnan(sweep.X[4]).all()
+        # the program is as declared
+        assert p.cons_protein is cons_protein
+        assert p.constraints[0] is cons_protein._[0]
+        assert p.sol_types['sweep'][-1] == p.n_solutions - 1
+
+    for n in [0, 1, 3]:
+        declare(p, scenarios[n])
+        p.opt()
+        assert sweep.objectives[n] == pytest.approx(p.obj())
+        assert sweep(p.x[0])[n] == pytest.approx(p.x[0].X[p.n_solutions - 1])
+
+
+def test_sweep_value_error(diet_problem):
+    p = diet_problem
+    p.j = I(size=2)
+    p.y = V(p.j)
+
+    def declare(p, s):
+        if s == 'mismatch':
+            # (length = 3) and (length = 2) are not compatible
+            p.cons_protein = p.x(p.item) + p.y(p.j) >= 1
+        elif s == 'raise':
+            raise ValueError('not a scenario')
+        else:
+            p.cons_protein = sum(p.protein(i) * p.x(i) for i in p.item) >= s
+
+    sweep = p.sweep([80, 'mismatch', 100, 'raise'], declare)
+    assert sorted(sweep.errors) == [1, 3]
+    assert 'not compatible' in sweep.errors[1]
+    assert 'ValueError' in sweep.errors[3]
+    assert not isnan(sweep.objectives[[0, 2]]).any()
+    assert isnan(sweep.objectives[[1, 3]]).all()
+
+    def grow(p, s):
+        # adds constraints, the program cannot change
+        p.cons_more = p.x(p.item) >= s
+
+    with pytest.raises(ValueError):
+        p.sweep([1], grow)
+
+
+def test_warm_start():
+    p = Prg(name="mip")
+    p.i = I(size=2)
+    # integer variables are written as columns after the continuous ones
+    p.z = V(p.i, itg=True)
+    p.x = V(p.i)
+    p.c1 = p.z(p.i) >= 3.5
+    p.c2 = p.x(p.i) >= 1.25
+    p.o = inf(sigma(p.z, p.i) + sigma(p.x, p.i))
+    p.opt()
+    assert p.z.output(aslist=True) == [4.0, 4.0]
+    assert p.x.output(aslist=True) == [1.25, 1.25]
+
+    p.c1 = p.z(p.i) >= 5.5
+    # new variables have no start value
+    p.y = V(p.i, itg=True)
+    p.c3 = p.y(p.i) >= 1.5
+    p.opt(warm_start='last')
+    m = p.formulation
+    assert m.getAttr("Start", m.getVars()) == [1.25, 1.25, 4.0, 4.0] + [gp.GRB.UNDEFINED] * 2
+    assert p.X[1] == [6.0, 6.0, 1.25, 1.25, 2.0, 2.0]
+
+    p.opt(warm_start=0)
+    with pytest.raises(ValueError):
+        p.opt(warm_start=5)
+
+
+def test_mps(diet_problem, tmp_path):
+    m = diet_problem.gurobi()
+    for name, kwargs in [
+        ("diet", {}),
+        ("diet_free.mps", {"free": True}),
+        ("diet.mps.gz", {"float_format": ".12g"}),
+        ("diet.mps.bz2", {"free": True}),
+    ]:
+        path = diet_problem.mps(str(tmp_path / name), **kwargs)
+        assert path.endswith((".mps", ".gz", ".bz2"))
+        _m = gp.read(path)
+        assert [v.VarName for v in m.getVars()] == [v.VarName for v in _m.getVars()]
+        assert (m.getA() != _m.getA()).nnz == 0
+        assert list(m.getAttr("RHS", m.getConstrs())) == list(
+            _m.getAttr("RHS", _m.getConstrs())
+        )
+
+    # .mps goes before the compression suffix
+    path = diet_problem.mps(str(tmp_path / "prog.gz"))
+    assert path == str(tmp_path / "prog.mps.gz")
+    with gzip.open(path, "rt") as f:
+        assert f.read() == open(diet_problem.mps(str(tmp_path / "prog"))).read()
+    assert Prg.mps_path("prog.bz2") == "prog.mps.bz2"
+    assert Prg.mps_path("prog.mps.bz2") == "prog.mps.bz2"
+
+
+def test_save_load(diet_problem, tmp_path):
+    path = diet_problem.save(tmp_path / 'diet')
+    assert path.endswith('diet.npz')
+    for mmap in [True, False]:
+        p = Prg.load(path, mmap=mmap)
+        assert p.index_members == {'item': ['milk', 'cheese', 'apples']}
+        assert p.variable_sizes == {'x': 3}
+        assert p.form['rows'] == diet_problem.matrix_form()['rows']
+        assert p.opt() is p
+        assert allclose(p.objective_values[0], 2.869565217391304)
+        assert allclose(p('x'), [1.5652173913043477, 0.0, 1.7391304347826089])
+        # written as the declared program is
+        assert open(p.mps(str(tmp_path / 'loaded'))).read() == open(
+            diet_problem.mps(str(tmp_path / 'declared'))
+        ).read()
+    assert p.mps(str(tmp_path / 'loaded.bz2')).endswith('loaded.mps.bz2')
+    with pytest.raises(ValueError):
+        p('y')
+
+    # thetas
+    p = Prg()
+    p.i = I(size=2)
+    p.x = V(p.i)
+    p.t = T(p.i, _=[(0, 10), (2, 5)])
+    p.c0 = p.x[0] + p.x[1] >= p.t[0]
+    p.c1 = p.x[0] + p.x[1] <= p.t[1]
+    p.o = inf(p.x[0] + p.x[1])
+    loaded = Prg.load(p.save(tmp_path / 'mp', compress=True))
+    assert allclose(loaded.F.toarray(), p.sparse('F', format='dense'))
+    assert allclose(loaded.theta_bounds, [[0, 10], [2, 5]])
+    assert loaded.thetas == [str(t) for t in p.thetas]
 
 
-def dump_solution(diet_problem, pickleit=False, jsonit=False):
-    gm = gp.read("diet.mps")
+def dump_solution(diet_problem, path, pickleit=False, jsonit=False):
+    # opt() builds the gurobi model in memory, write the .mps file
+    gm = gp.read(diet_problem.mps(str(path / "diet")))
     gm.optimize()
 
     if pickleit:
-        with open("sol.pkl", "wb") as f:
+        with open(path / "sol.pkl", "wb") as f:
             pickle.dump(([v.X for v in gm.getVars()], gm.ObjVal), f)
 
     if jsonit:
-        with open("sol.json", "w") as f:
+        with open(path / "sol.json", "w") as f:
             json.dump(([v.X for v in gm.getVars()], gm.ObjVal), f)
 
 
-def test_import_solution(diet_problem):
-    dump_solution(diet_problem, pickleit=True)
-    diet_problem.import_solution("sol.pkl")
+def test_import_solution_pickle(diet_problem, tmp_path):
+    dump_solution(diet_problem, tmp_path, pickleit=True)
+    diet_problem.import_solution(str(tmp_path / "sol.pkl"))
     assert diet_problem.x.output(aslist=True) == [
         1.5652173913043477,
         0.0,
@@ -242,9 +582,9 @@ def test_import_solution(diet_problem):
     assert diet_problem.obj_cost.output(True) == 2.869565217391304
 
 
-def test_import_solution(diet_problem):
-    dump_solution(diet_problem, jsonit=True)
-    diet_problem.import_solution("sol.json")
+def test_import_solution(diet_problem, tmp_path):
+    dump_solution(diet_problem, tmp_path, jsonit=True)
+    diet_problem.import_solution(str(tmp_path / "sol.json"))
     assert diet_problem.x.output(aslist=True) == [
         1.5652173913043477,
         0.0,
@@ -0,0 +1,43 @@
+from src.gana.block.program import Prg
+from src.gana.operators.composition import inf
+from src.gana.operators.sigma import sigma
+from src.gana.sets.index import I
+from src.gana.sets.theta import T
+from src.gana.sets.variable import V
+
+
+def test_stats():
+    p = Prg()
+    p.i = I(size=3)
+    p.h = I(size=1)
+    p.x = V(p.i)
+    p.y = V(p.i, bnr=True)
+    p.z = V(p.i, itg=True)
+    # not a column, features nowhere
+    p.w = V(p.h)
+    p.t = T(p.h, _=[(1, 5)])
+    p.c1 = p.x(p.i) - 10 * p.y(p.i) <= 0
+    p.c2 = p.x(p.i) + p.z(p.i) == 4
+    p.c3 = p.x[0] + p.x[1] >= p.t[0]
+    p.o = inf(sigma(p.x) + sigma(p.y))
+
+    stats = p.stats()
+    assert stats['rows'] == {'leq': 4, 'eq': 3, 'nn': 0, 'total': 7}
+    assert stats['columns'] == {'continuous': 3, 'binary': 3, 'integer': 3, 'total': 9}
+    assert stats['variables'] == 10
+    assert stats['thetas'] == 1
+
+    A = p.sparse('A')
+    assert stats['nonzeros'] == A.nnz == 14
+    assert stats['density'] == 14 / (7 * 10)
+
+    # A and NN, b, c, A_t, b_t, F, H as made by .ppopt()
+    assert stats['ppopt_bytes'] == 8 * (17 * 10 + 17 + 10 + 2 + 2 + 17 + 10)
+
+    memory = stats['memory']
+    assert set(memory) == {'I', 'V', 'P', 'T', 'F', 'C', 'O', 'total'}
+    assert memory['C'] > memory['V'] > 0
+    assert memory['total'] == sum(v for k, v in memory.items() if k != 'total')
+    assert p.stats(sample=1)['memory']['total'] > 0
+
+    assert p.stats(memory=False)['memory'] is None
@@ -128,3 +128,36 @@ def test_sigma(p):
     assert [[j[n] for j in p.f5.variables] for n in range(len(p.f5))] == [
         [p.w[0], p.w[1], p.w[2], p.w[3], p.w[4]]
     ]
+
+
+def test_sigma_split(p):
+    # the summed variable sets and rows match those made by calling the variable set
+    for f, over, position in [(p.f1, p._p, 0), (p.f2, p.q, 1), (p.f3, p.r, 2)]:
+        before, after = p.v.index[:position], p.v.index[position + 1 :]
+        for v, _index in zip(f.variables, over):
+            _v = p.v(*before, _index, *after, make_new=True)
+            assert v.map == _v.map
+            assert v._ == _v._
+            assert list(v.ordinals) == list(_v.ordinals)
+        assert [list(c.variables) for c in f._] == [
+            [v[n] for v in f.variables] for n in range(len(f))
+        ]
+        assert f.positions.tolist() == [[v.n for v in c.variables] for c in f._]
+        assert list(f.map) == list(zip(*(v.map for v in f.variables)))
+
+
+def test_sigma_made_on_request():
+    p = Prg()
+    p.i = I(size=3)
+    p.j = I(size=4)
+    p.v = V(p.i, p.j)
+    f = sigma(p.v, p.j)
+    # nothing is made by the summation
+    assert f._.made() == [] and f.variables.made() == []
+    assert p.v._.made() == []
+    assert f.positions.tolist() == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]]
+    index = list(f.map)[1]
+    assert f.map[index] is f[1]
+    assert f._.made() == [f[1]]
+    assert f[1].P == [4, 5, 6, 7]
+    assert index not in sigma(p.v, p.i).map
@@ -0,0 +1,73 @@
+import json
+
+from src.gana.block.program import Prg
+from src.gana.operators.composition import sup
+from src.gana.sets.index import I
+from src.gana.sets.variable import V
+from src.gana.utils import tracing
+from src.gana.utils.tracing import NOSPAN, trace
+
+
+def small() -> Prg:
+    p = Prg()
+    p.i = I(size=2)
+    p.x = V(p.i)
+    p.c1 = p.x(p.i[0]) + p.x(p.i[1]) <= 12
+    p.c2 = 2 * p.x(p.i[0]) + p.x(p.i[1]) <= 16
+    p.o = sup(40 * p.x(p.i[0]) + 30 * p.x(p.i[1]))
+    return p
+
+
+def test_tracing(tmp_path):
+    with trace() as tracer:
+        p = small()
+        p.opt()
+    assert tracing.tracer is None
+
+    names = [span.name for span in tracer.spans]
+    assert names[:3] == ['i (I)', 'x (V)', 'c1 (C)']
+    assert 'Prg.opt' in names
+    assert tracer.spans[1].counters == {'objects': 2}
+
+    opt = tracer.spans[names.index('Prg.opt')]
+    assert opt.category == 'solve'
+    children = {span.name: span for span in opt.children}
+    assert list(children) == [
+        'Prg.gurobi',
+        'gurobipy optimize',
+        'Prg._load_values',
+        'Prg._load_sensitivity',
+        'Prg._birth_solution',
+    ]
+    form = children['Prg.gurobi'].children[0]
+    assert form.name == 'Prg.matrix_form'
+    assert form.counters == {'rows': 2, 'columns': 2, 'nonzeros': 4}
+    assert children['gurobipy optimize'].counters['rows'] == 2
+    assert children['Prg._load_values'].category == 'solution'
+    assert all(span.end is not None for _, span in tracer.walk())
+
+    # self times add up to the top level spans
+    assert sum(tracer.totals().values()) == sum(s.duration for s in tracer.spans)
+
+    dump = json.loads(tracer.json(str(tmp_path / 'trace.json')))
+    assert dump == json.loads((tmp_path / 'trace.json').read_text())
+    assert dump['spans'][names.index('Prg.opt')]['children'][0]['name'] == 'Prg.gurobi'
+
+    chrome = tracer.chrome(str(tmp_path / 'trace.chrome.json'))
+    events = chrome['traceEvents']
+    assert len(events) == sum(1 for _ in tracer.walk())
+    assert {e['ph'] for e in events} == {'X'}
+    assert events[0]['args'] == {'objects': 2}
+    assert json.loads((tmp_path / 'trace.chrome.json').read_text()) == chrome
+
+
+def test_tracing_off():
+    assert tracing.tracer is None
+    assert tracing.span('x', 'build') is NOSPAN
+    with tracing.span('x', 'build') as span:
+        span.count(rows=1)
+    tracing.count(rows=1)
+
+    p = small()
+    p.opt()
+    assert p.obj() == -400.0
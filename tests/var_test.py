@@ -1,7 +1,9 @@
+import pickle
 from operator import is_
 
 import pytest
 from src.gana.block.program import Prg
+from src.gana.operators.sigma import sigma
 from src.gana.sets.index import I
 from src.gana.sets.parameter import P
 from src.gana.sets.variable import V
@@ -73,3 +75,102 @@ def test_add_var(p):
     assert p.f5.two._ == [1, 2, 4]
     assert p.f6.one.name == p.v1.name
     assert p.f6.two._ == [1, 2, 4]
+
+
+def test_var_elements(p):
+    # ordinals of the variables in the set
+    assert p.cap.ordinals.tolist() == [v.n for v in p.cap]
+    # positions of the indices
+    assert p.cap.codes.tolist() == [[0, 0], [0, 1], [1, 0], [1, 1]]
+    assert p.prod.codes[13].tolist() == [1, 1, 1]
+    # containers are made when asked for
+    assert 'cons_by' not in p.prod[3].__dict__
+    assert p.prod[3].cons_by == []
+    assert p.prod[3]._ == [p.prod[3]]
+    assert p.prod[3].map == {p.prod[3].index: p.prod[3]}
+    assert p.rev[2].nn is False
+    assert p.x[0].bnr
+    with pytest.raises(AttributeError):
+        _ = p.prod[3].missing
+
+
+def test_var_slots(p):
+    # elements keep everything in slots
+    assert isinstance(p.cap[0], V)
+    assert p.cap[0].cons_by == []
+    assert not p.cap[0].__dict__
+    assert not p.f1[0].__dict__
+    assert not p.y[0].__dict__
+
+
+def test_var_pickle(p):
+    p.c = p.cap(p.pv, p.y) <= 4
+    x = pickle.loads(pickle.dumps(p.cap[1]))
+    assert type(x) is type(p.cap[1])
+    assert (x.name, x.n, x.pos) == ('cap[1]', 1, 1)
+    assert str(x.index) == str(p.cap[1].index)
+    assert x.parent.name == 'cap'
+    assert [str(c) for c in x.cons_by] == [str(c) for c in p.cap[1].cons_by]
+    # containers not made before pickling are made when asked for
+    y = pickle.loads(pickle.dumps(p.prod[3]))
+    assert 'X' not in p.prod[3].__dict__
+    assert y.X == {} and y.map == {y.index: y}
+    # uninitialized elements do not make containers
+    with pytest.raises(AttributeError):
+        type(x).__new__(type(x)).cons_by
+    q = pickle.loads(pickle.dumps(p))
+    assert q.cap[1].cons_by[0] is q.c._[1]
+
+
+def test_var_blocks():
+    p = Prg()
+    p.i = I(size=2)
+    p.j = I(size=2)
+    p.x = V(p.i, p.j)
+    p.z = V(p.j)
+    p.r = P(p.i, _=[5, 7])
+    # rhs is stretched as the elements are, i.e. repeated
+    p.c1 = p.x(p.i, p.j) - p.r(p.i) <= 0
+    assert [c.B for c in p.c1._] == [5, 5, 7, 7]
+    assert p.c1.function.A.shape == (4, 1)
+    assert p.c1.function.positions.ravel().tolist() == [0, 1, 2, 3]
+    # skipped variables have nan coefficients, and are dropped for the children
+    p.c2 = p.z(p.j) - p.z(p.j - 1) <= 2
+    assert p.c2.function.positions.tolist() == [[4, -1], [5, 4]]
+    assert p.c2._[0].A.tolist() == [1.0]
+    assert p.c2._[1].A.tolist() == [1.0, -1.0]
+    assert p.c2._[1].P == [5, 4]
+    # a parameter times one summation (a child of sigma) is a block of one row
+    p.k = I(size=3)
+    p.w = V(p.i, p.k)
+    f = p.r(p.i[1]) * sigma(p.w(p.i, p.k), p.k)[1]
+    assert f.A.shape == f.positions.shape == (1, 3)
+    assert f._[0].A.tolist() == [7.0, 7.0, 7.0]
+    assert f._[0].P == [9, 10, 11]
+
+
+def test_var_made_on_request():
+    _p = Prg()
+    _p.i = I(size=100)
+    _p.j = I(size=10)
+    _p.x = V(_p.i, _p.j)
+    # numbered on birth, nothing is made
+    assert _p.x.ordinals.tolist() == list(range(1000))
+    assert len(_p.x) == len(_p.variables) == len(_p.nnvars()) == 1000
+    assert _p.x._.made() == []
+    assert _p.variables.made() == []
+    # made when asked for, once
+    x = _p.x.map[_p.i[3], _p.j[4]]
+    assert x.name == 'x[34]' and x.n == 34 and x.index == (_p.i[3], _p.j[4])
+    assert is_(_p.x[34], x)
+    assert is_(_p.variables[34], x)
+    assert _p.variables.made() == [x]
+    # only the variables in constraints are made
+    _p.c = _p.x(_p.i[0], _p.j) <= 1
+    assert len(_p.x._.made()) == 11
+    assert _p.colvars(n=True) == list(range(10))
+    assert _p.x.codes[34].tolist() == [3, 4]
+    # pickled with the elements made so far
+    _q = pickle.loads(pickle.dumps(_p))
+    assert len(_q.x._.made()) == 11
+    assert _q.x[999].n == 999